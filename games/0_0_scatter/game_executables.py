@@ -52,7 +52,7 @@ class GameExecutables(GameCalculations):
     def get_scatterpays_update_wins(self):
         """Return the board since we are assigning the 'explode' attribute."""
         self.win_data = Scatter.get_scatterpay_wins(
-            self.config, self.board, global_multiplier=self.global_multiplier
+            self.config, self.board, global_multiplier=self.global_multiplier, board_arrays=self.board_arrays
         )  # Evaluate wins, self.board is modified in-place
         Scatter.record_scatter_wins(self)
         self.win_manager.tumble_win = self.win_data["totalWin"]
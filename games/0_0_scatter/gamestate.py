@@ -6,7 +6,7 @@ class GameState(GameStateOverride):
     """Gamestate for a single spin"""
 
     def run_spin(self, sim: int, simulation_seed=None):
-        self.reset_seed(sim)
+        self.reset_seed(sim, simulation_seed=simulation_seed)
         self.repeat = True
         while self.repeat:
             self.reset_book()
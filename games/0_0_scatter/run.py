@@ -1,5 +1,6 @@
 """Main file for generating results for sample ways-pay game."""
 
+import os
 from gamestate import GameState
 from game_config import GameConfig
 from game_optimization import OptimizationSetup
@@ -7,12 +8,13 @@ from optimization_program.run_script import OptimizationExecution
 from utils.game_analytics.run_analysis import create_stat_sheet
 from utils.rgs_verification import execute_all_tests
 from src.state.run_sims import create_books
+from src.state.game_batch import apply_batch_stage
 from src.write_data.write_configs import generate_configs
 
 if __name__ == "__main__":
 
-    num_threads = 10
-    rust_threads = 20
+    num_threads = int(os.environ.get("SIM_THREADS", 10))
+    rust_threads = int(os.environ.get("SIM_RUST_THREADS", 20))
     batching_size = 10000
     compression = True
     profiling = False
@@ -29,6 +31,7 @@ if __name__ == "__main__":
         "run_format_checks": True,
     }
     target_modes = ["base", "bonus"]
+    num_sim_args, run_conditions, target_modes = apply_batch_stage(num_sim_args, run_conditions, target_modes)
 
     config = GameConfig()
     gamestate = GameState(config)
@@ -113,6 +113,12 @@ class GameConfig(Config):
             "super_scatter": [self.super_scatter_symbol],
             "bomb": ["M"],
         }
+        # Natural boards: one scatter per reel, one super scatter per board, never on a reel with a scatter
+        self.board_constraints = {
+            "max_per_reel": {"scatter": 1},
+            "max_per_board": {"super_scatter": 1},
+            "exclusive_reels": [["scatter", "super_scatter"]],
+        }
         self.bomb_settings = {
             "regular": {
                 "appearance_chance": 0.55,
@@ -4,6 +4,7 @@
 
 from game_calculations import GameCalculations
 from src.calculations.scatter import Scatter
+from src.state.phase_timers import timed_phase
 from game_events import send_mult_info_event
 from src.events.events import (
     win_info_event,
@@ -33,11 +34,13 @@ class GameExecutables(GameCalculations):
             self._handle_board_multipliers(win_event_index)
         self.evaluate_wincap()
 
+    @timed_phase("board_multipliers")
     def _handle_board_multipliers(self, win_event_index: int) -> None:
         """Emit bomb events and update spin wins for freegame tumbles."""
         board_mult, mult_info = self.get_board_multipliers()
         if not mult_info:
             return
+        self.count_phase("multiplier_tumbles")
 
         base_tumble_win = self.win_manager.tumble_win
         pre_multiplier_total = self.win_manager.spin_win - base_tumble_win
@@ -94,7 +97,7 @@ class GameExecutables(GameCalculations):
     def get_scatterpays_update_wins(self):
         """Return the board since we are assigning the 'explode' attribute."""
         self.win_data = Scatter.get_scatterpay_wins(
-            self.config, self.board, global_multiplier=self.global_multiplier
+            self.config, self.board, global_multiplier=self.global_multiplier, board_arrays=self.board_arrays
         )  # Evaluate wins, self.board is modified in-place
         if self.gametype == self.config.basegame_type:
             scale = getattr(self.config, "basegame_win_scale", 1.0)
@@ -1,5 +1,3 @@
-import random
-
 from game_executables import *
 from src.events.events import update_freespin_event, fs_trigger_event, reveal_event
 from src.calculations.statistics import get_random_outcome
@@ -31,6 +29,11 @@ class GameStateOverride(GameExecutables):
             self.gametype == self.config.freegame_type
             and not self.get_current_distribution_conditions().get("force_freegame")
         ):
+            if self.config.valid_board_sampler == "tables":
+                self.create_valid_board_reelstrips()
+                if emit_event:
+                    reveal_event(self)
+                return
             attempts = 0
             max_attempts = 1000
             while attempts < max_attempts:
@@ -96,14 +99,14 @@ class GameStateOverride(GameExecutables):
             bonus_key = getattr(self, "bonus_type", "regular")
             buy_table = self.config.buy_bomb_settings.get(bonus_key, {}).get("mult_weights")
             if buy_table:
-                multiplier_value = get_random_outcome(buy_table)
+                multiplier_value = get_random_outcome(buy_table, rng=self.rng)
             else:
                 multiplier_value = get_random_outcome(
-                    self.get_current_distribution_conditions()["mult_values"][self.gametype]
+                    self.get_current_distribution_conditions()["mult_values"][self.gametype], rng=self.rng
                 )
         else:
             multiplier_value = get_random_outcome(
-                self.get_current_distribution_conditions()["mult_values"][self.gametype]
+                self.get_current_distribution_conditions()["mult_values"][self.gametype], rng=self.rng
             )
         symbol.assign_attribute({"multiplier": multiplier_value})
 
@@ -119,7 +122,7 @@ class GameStateOverride(GameExecutables):
                 if symbol.name not in scatter_names:
                     continue
                 if reel_idx in reels_with_scatter:
-                    filler_name = random.choice(replacement_pool)
+                    filler_name = self.rng.choice(replacement_pool)
                     self.board[reel_idx][row_idx] = self.create_symbol(filler_name)
                     replaced = True
                 else:
@@ -1,7 +1,6 @@
-import random
-
 from game_override import GameStateOverride
 from src.calculations.scatter import Scatter
+from src.calculations.statistics import get_random_outcome
 from src.events.events import reveal_event
 
 
@@ -9,7 +8,7 @@ class GameState(GameStateOverride):
     """Gamestate for a single spin"""
 
     def run_spin(self, sim: int, simulation_seed=None):
-        self.reset_seed(sim)
+        self.reset_seed(sim, simulation_seed=simulation_seed)
         self.repeat = True
         while self.repeat:
             self.reset_book()
@@ -97,6 +96,14 @@ class GameState(GameStateOverride):
             return
 
         self.entry_was_buy = False
+        if self.config.valid_board_sampler == "tables":
+            if conditions.get("force_freegame"):
+                num_scatters = get_random_outcome(conditions["scatter_triggers"], rng=self.rng)
+                self.sample_special_board("scatter", num_scatters, valid_only=True)
+            else:
+                self.create_valid_board_reelstrips()
+            reveal_event(self)
+            return
         attempts = 0
         while attempts < max_attempts:
             attempts += 1
@@ -133,18 +140,18 @@ class GameState(GameStateOverride):
         if total_needed > self.config.num_reels:
             return False
         reels = list(range(self.config.num_reels))
-        random.shuffle(reels)
+        self.rng.shuffle(reels)
         scatter_reels = reels[:target_scatter]
         remaining_reels = reels[target_scatter:]
         if len(remaining_reels) < target_super:
             return False
 
         for reel in scatter_reels:
-            row = random.randrange(len(self.board[reel]))
+            row = self.rng.randrange(len(self.board[reel]))
             self.board[reel][row] = self.create_symbol(self.config.scatter_symbol)
 
         for reel in remaining_reels[:target_super]:
-            row = random.randrange(len(self.board[reel]))
+            row = self.rng.randrange(len(self.board[reel]))
             self.board[reel][row] = self.create_symbol(self.config.super_scatter_symbol)
 
         return True
@@ -154,7 +161,7 @@ class GameState(GameStateOverride):
         filler_pool = self._get_buy_filler_cycle()
         for reel in range(self.config.num_reels):
             for row in range(self.config.num_rows[reel]):
-                filler_name = random.choice(filler_pool)
+                filler_name = self.rng.choice(filler_pool)
                 self.board[reel][row] = self.create_symbol(filler_name)
         self.get_special_symbols_on_board()
 
@@ -165,7 +172,7 @@ class GameState(GameStateOverride):
         for reel in range(self.config.num_reels):
             for row in range(self.config.num_rows[reel]):
                 if self.board[reel][row].name in scatter_names:
-                    replacement = random.choice(symbol_pool)
+                    replacement = self.rng.choice(symbol_pool)
                     self.board[reel][row] = self.create_symbol(replacement)
         self.get_special_symbols_on_board()
 
@@ -1,6 +1,7 @@
 """Entry point for local math runs and config generation."""
 
 import os
+import sys
 
 from gamestate import GameState
 from game_config import GameConfig
@@ -9,6 +10,12 @@ from optimization_program.run_script import OptimizationExecution
 from utils.game_analytics.run_analysis import create_stat_sheet
 from utils.rgs_verification import execute_all_tests
 from src.state.run_sims import create_books
+from src.state.shards import run_shard, merge_shards
+from src.state.seed_mining import mine_seed_bank
+from src.state.rtp_estimate import estimate_rtp
+from src.state.calibration import calibrate
+from src.state.game_batch import apply_batch_stage
+from src.state.sim_precision import SimulationPrecision
 from src.write_data.write_configs import generate_configs
 
 
@@ -20,6 +27,14 @@ def env_int(var_name: str, default: int) -> int:
         return default
 
 
+def env_float(var_name: str, default: float) -> float:
+    """Read float environment variables with sane fallbacks."""
+    try:
+        return float(os.environ.get(var_name, default))
+    except (TypeError, ValueError):
+        return default
+
+
 def env_bool(var_name: str, default: bool) -> bool:
     """Read boolean environment variables such as BOOKS_COMPRESSION=0/1."""
     value = os.environ.get(var_name)
@@ -32,7 +47,43 @@ if __name__ == "__main__":
     num_threads = env_int("SIM_THREADS", 8)
     rust_threads = env_int("SIM_RUST_THREADS", 8)
     batching_size = env_int("SIM_BATCH_SIZE", 2500)
+    # SIM_AUTO_CALIBRATE=1 replaces SIM_THREADS/SIM_BATCH_SIZE with values measured under SIM_RAM_BUDGET_GB
+    auto_calibrate = env_bool("SIM_AUTO_CALIBRATE", False)
+    ram_budget_gb = env_float("SIM_RAM_BUDGET_GB", 0.0)
+    # SIM_PROFILING=1 for cProfile plus stack sampling, SIM_PROFILING=sample for the sampler only
     profiling = env_bool("SIM_PROFILING", False)
+    if os.environ.get("SIM_PROFILING", "").lower() == "sample":
+        profiling = "sample"
+    concurrent_modes = env_bool("SIM_CONCURRENT_MODES", False)
+    resume = env_bool("SIM_RESUME", False)
+    telemetry = env_bool("SIM_TELEMETRY", False)
+    phase_timers = env_bool("SIM_PHASE_TIMERS", False)
+    repeat_costs = env_bool("SIM_REPEAT_COSTS", False)
+    two_phase_spins = env_bool("SIM_TWO_PHASE_SPINS", False)
+    # MINE_SEEDS=super_buy:wincap:200,... grows seed banks before simulating, SIM_SEED_BANK=1 uses them
+    seed_bank = env_bool("SIM_SEED_BANK", False)
+    criteria_cache = env_bool("SIM_CRITERIA_CACHE", False)
+    mine_seeds = [entry.strip().split(":") for entry in os.environ.get("MINE_SEEDS", "").split(",") if entry.strip()]
+
+    # SIM_TARGET_PRECISION=1 ignores the SIMS_* counts (0 still skips a mode) and simulates until
+    # per-criteria mean payout and hit-rate confidence intervals meet the tolerances below.
+    precision = None
+    if env_bool("SIM_TARGET_PRECISION", False):
+        precision = SimulationPrecision(
+            mean_tolerance=env_float("SIM_MEAN_TOLERANCE", 0.02),
+            hit_rate_tolerance=env_float("SIM_HIT_RATE_TOLERANCE", 0.005),
+            min_sims=env_int("SIM_MIN_SIMS", 10000),
+            max_sims=env_int("SIM_MAX_SIMS", 1000000),
+        )
+
+    # Multi-host runs: SHARD_MODE/SHARD_START/SHARD_END simulate one sim-id range into SHARD_DIR,
+    # MERGE_SHARDS=1 combines every shard in SHARD_DIR instead of simulating locally.
+    shard_dir = os.environ.get("SHARD_DIR", "shards")
+    shard_mode = os.environ.get("SHARD_MODE", "").strip()
+    merge_shard_outputs = env_bool("MERGE_SHARDS", False)
+
+    # SIM_ESTIMATE_RTP=1 prints per-mode and per-criteria RTP estimates on every core and writes no files
+    estimate_only = env_bool("SIM_ESTIMATE_RTP", False)
 
     compression = env_bool("BOOKS_COMPRESSION", True)
 
@@ -54,12 +105,44 @@ if __name__ == "__main__":
         for mode in os.environ.get("TARGET_MODES", "").split(",")
         if mode.strip()
     ]
+    # Under utils/run_games.py each stage runs this script with only its own steps enabled
+    num_sim_args, run_conditions, target_modes = apply_batch_stage(num_sim_args, run_conditions, target_modes)
 
     config = GameConfig()
     gamestate = GameState(config)
     OptimizationSetup(config)
 
-    if run_conditions["run_sims"]:
+    if shard_mode:
+        run_shard(
+            gamestate,
+            config,
+            shard_mode,
+            num_sim_args[shard_mode],
+            env_int("SHARD_START", 0),
+            env_int("SHARD_END", num_sim_args[shard_mode]),
+            shard_dir,
+            batching_size,
+            num_threads,
+            compression,
+        )
+        sys.exit(0)
+
+    if estimate_only:
+        estimate_rtp(gamestate, config, num_sim_args, env_int("SIM_ESTIMATE_THREADS", os.cpu_count() or 1))
+        sys.exit(0)
+
+    if auto_calibrate:
+        decision = calibrate(
+            gamestate, config, num_sim_args, ram_budget=int(ram_budget_gb * 2**30) if ram_budget_gb > 0 else None
+        )
+        num_threads, batching_size = decision["threads"], decision["batch_size"]
+
+    for mine_mode, mine_criteria, mine_count in mine_seeds:
+        mine_seed_bank(gamestate, config, mine_mode, mine_criteria, int(mine_count), num_threads)
+
+    if merge_shard_outputs:
+        merge_shards(gamestate, config, shard_dir)
+    elif run_conditions["run_sims"]:
         create_books(
             gamestate,
             config,
@@ -68,6 +151,15 @@ if __name__ == "__main__":
             num_threads,
             compression,
             profiling,
+            concurrent_modes=concurrent_modes,
+            resume=resume,
+            precision=precision,
+            telemetry=telemetry,
+            phase_timers=phase_timers,
+            repeat_costs=repeat_costs,
+            two_phase_spins=two_phase_spins,
+            seed_bank=seed_bank,
+            criteria_cache=criteria_cache,
         )
 
     generate_configs(gamestate)
@@ -1,145 +1,84 @@
 """Handles generating game-boards from reelstrips"""
 
-import random
 from typing import List
 from src.state.state import GeneralGameState
 from src.calculations.statistics import get_random_outcome
 from src.events.events import reveal_event
+from src.state.phase_timers import timed_phase
 
 
 class Board(GeneralGameState):
     """Handles generation of a game board and symbols"""
 
+    @timed_phase("board_draw")
     def create_board_reelstrips(self) -> None:
         """Randomly selects stopping positions from a reelstrip."""
-        if self.config.include_padding:
-            top_symbols = []
-            bottom_symbols = []
-        self.refresh_special_syms()
         self.reelstrip_id = get_random_outcome(
-            self.get_current_distribution_conditions()["reel_weights"][self.gametype]
+            self.get_current_distribution_conditions()["reel_weights"][self.gametype], rng=self.rng
         )
         self.reelstrip = self.config.reels[self.reelstrip_id]
-        anticipation = [0] * self.config.num_reels
-        board = [[]] * self.config.num_reels
-        for i in range(self.config.num_reels):
-            board[i] = [0] * self.config.num_rows[i]
-        reel_positions = [random.randrange(0, len(self.reelstrip[reel])) for reel in range(self.config.num_reels)]
-        padding_positions = [0] * self.config.num_reels
-        first_scatter_reel = -1
-        for reel in range(self.config.num_reels):
-            reel_pos = reel_positions[reel]
-            if self.config.include_padding:
-                top_symbols.append(
-                    self.create_symbol(self.reelstrip[reel][(reel_pos - 1) % len(self.reelstrip[reel])])
-                )
-                bottom_symbols.append(
-                    self.create_symbol(
-                        self.reelstrip[reel][(reel_pos + len(board[reel])) % len(self.reelstrip[reel])]
-                    )
-                )
-            for row in range(self.config.num_rows[reel]):
-                sym_id = self.reelstrip[reel][(reel_pos + row) % len(self.reelstrip[reel])]
-                sym = self.create_symbol(sym_id)
-                board[reel][row] = sym
-                if sym.special:
-                    for special_symbol in self.special_syms_on_board:
-                        for s in self.config.special_symbols[special_symbol]:
-                            if board[reel][row].name == s:
-                                self.special_syms_on_board[special_symbol] += [{"reel": reel, "row": row}]
-                                if (
-                                    board[reel][row].check_attribute("scatter")
-                                    and len(self.special_syms_on_board[special_symbol])
-                                    >= self.config.anticipation_triggers[self.gametype]
-                                    and first_scatter_reel == -1
-                                ):
-                                    first_scatter_reel = reel + 1
-            padding_positions[reel] = (reel_positions[reel] + len(board[reel]) + 1) % len(self.reelstrip[reel])
-
-        if first_scatter_reel > -1 and first_scatter_reel != self.config.num_reels:
-            count = 1
-            for reel in range(first_scatter_reel, self.config.num_reels):
-                anticipation[reel] = count
-                count += 1
-
-        for r in range(1, self.config.num_reels):
-            if anticipation[r - 1] > anticipation[r]:
-                raise RuntimeError
-
-        self.board = board
-        self.get_special_symbols_on_board()
-        self.reel_positions = reel_positions
-        self.padding_position = padding_positions
-        self.anticipation = anticipation
-        if self.config.include_padding:
-            self.top_symbols = top_symbols
-            self.bottom_symbols = bottom_symbols
+        reel_positions = self.rng.reel_stops([len(self.reelstrip[reel]) for reel in range(self.config.num_reels)])
+        self.fill_board_from_windows(reel_positions)
 
+    @timed_phase("board_draw")
     def force_board_from_reelstrips(self, reelstrip_id: str, force_stop_positions: List[List]) -> None:
         """Creates a gameboard from specified stopping positions."""
-        if self.config.include_padding:
-            top_symbols = []
-            bottom_symbols = []
-        self.refresh_special_syms()
         self.reelstrip_id = reelstrip_id
         self.reelstrip = self.config.reels[self.reelstrip_id]
-        anticipation = [0] * self.config.num_reels
-        board = [[]] * self.config.num_reels
-        for i in range(self.config.num_reels):
-            board[i] = [0] * self.config.num_rows[i]
-
         reel_positions = [None] * self.config.num_reels
         for r, s in force_stop_positions.items():
-            reel_positions[r] = s - random.randint(0, self.config.num_rows[r] - 1)
+            reel_positions[r] = s - self.rng.randint(0, self.config.num_rows[r] - 1)
         for r, _ in enumerate(reel_positions):
             if reel_positions[r] is None:
-                reel_positions[r] = random.randrange(0, len(self.reelstrip[r]))
+                reel_positions[r] = self.rng.randrange(0, len(self.reelstrip[r]))
+        self.fill_board_from_windows(reel_positions)
 
+    def fill_board_from_windows(self, reel_positions: List[int]) -> None:
+        """
+        Set the board, padding symbols, special symbol positions and anticipation for the current reelstrip
+        stopped at reel_positions, reading each reel's window from the precomputed reel window tables.
+        """
+        windows = self.reel_windows.get_windows(self.reelstrip_id)
+        special_syms_on_board = {s: [] for s in self.config.special_symbols}
+        anticipation_trigger = self.config.anticipation_triggers[self.gametype]
+        include_padding = self.config.include_padding
+        board = [None] * self.config.num_reels
+        top_symbols = []
+        bottom_symbols = []
         padding_positions = [0] * self.config.num_reels
         first_scatter_reel = -1
         for reel in range(self.config.num_reels):
-            reel_pos = reel_positions[reel]
-            if self.config.include_padding:
-                top_symbols.append(
-                    self.create_symbol(self.reelstrip[reel][(reel_pos - 1) % len(self.reelstrip[reel])])
-                )
-                bottom_symbols.append(
-                    self.create_symbol(
-                        self.reelstrip[reel][(reel_pos + len(board[reel])) % len(self.reelstrip[reel])]
-                    )
-                )
-            for row in range(self.config.num_rows[reel]):
-                sym_id = self.reelstrip[reel][(reel_pos + row) % len(self.reelstrip[reel])]
-                sym = self.create_symbol(sym_id)
-                board[reel][row] = sym
-
-                if sym.special:
-                    for special_symbol in self.special_syms_on_board:
-                        for s in self.config.special_symbols[special_symbol]:
-                            if board[reel][row].name == s:
-                                self.special_syms_on_board[special_symbol] += [{"reel": reel, "row": row}]
-                                if (
-                                    board[reel][row].check_attribute("scatter")
-                                    and len(self.special_syms_on_board[special_symbol])
-                                    >= self.config.anticipation_triggers[self.gametype]
-                                    and first_scatter_reel == -1
-                                ):
-                                    first_scatter_reel = reel + 1
-                padding_positions[reel] = (reel_positions[reel] + len(board[reel]) + 1) % len(self.reelstrip[reel])
+            reel_length = len(self.reelstrip[reel])
+            window = windows[reel][reel_positions[reel] % reel_length]
+            if include_padding:
+                top_symbols.append(self.create_symbol(window.top))
+                bottom_symbols.append(self.create_symbol(window.bottom))
+            board[reel] = [self.create_symbol(sym_id) for sym_id in window.symbols]
+            for special_symbol, rows, scatter_reach in window.specials:
+                positions = special_syms_on_board[special_symbol]
+                if (
+                    first_scatter_reel == -1
+                    and scatter_reach > 0
+                    and len(positions) + scatter_reach >= anticipation_trigger
+                ):
+                    first_scatter_reel = reel + 1
+                positions.extend({"reel": reel, "row": row} for row in rows)
+            padding_positions[reel] = (reel_positions[reel] + len(board[reel]) + 1) % reel_length
 
-        if first_scatter_reel > -1 and first_scatter_reel <= self.config.num_reels:
-            count = 1
-            for reel in range(first_scatter_reel, self.config.num_reels):
+        anticipation = [0] * self.config.num_reels
+        if first_scatter_reel > -1:
+            for count, reel in enumerate(range(first_scatter_reel, self.config.num_reels), start=1):
                 anticipation[reel] = count
-                count += 1
 
         self.board = board
+        self.special_syms_on_board = special_syms_on_board
         self.reel_positions = reel_positions
         self.padding_position = padding_positions
         self.anticipation = anticipation
-        if self.config.include_padding:
+        if include_padding:
             self.top_symbols = top_symbols
             self.bottom_symbols = bottom_symbols
+        self.sync_board_arrays()
 
     def create_symbol(self, name: str) -> object:
         """Create a new symbol and assign relevant attributes."""
@@ -167,6 +106,13 @@ class Board(GeneralGameState):
                     for specialType in list(self.special_syms_on_board.keys()):
                         if self.board[reel][row].check_attribute(specialType):
                             self.special_syms_on_board[specialType].append({"reel": reel, "row": row})
+        self.sync_board_arrays()
+
+    def sync_board_arrays(self) -> None:
+        """Copy the board into self.board_arrays when Config.use_board_arrays is set.
+        Called after drawing, tumbling and rescanning the board with get_special_symbols_on_board()."""
+        if self.board_arrays is not None:
+            self.board_arrays.set_board(self.board)
 
     def transpose_board_string(self, board_string: List[List[str]]) -> List[List[str]]:
         """Transpose symbol names in the format displayed to the player during the game."""
@@ -199,7 +145,9 @@ class Board(GeneralGameState):
             self.get_current_distribution_conditions()["force_freegame"]
             and self.gametype == self.config.basegame_type
         ):
-            num_scatters = get_random_outcome(self.get_current_distribution_conditions()["scatter_triggers"])
+            num_scatters = get_random_outcome(
+                self.get_current_distribution_conditions()["scatter_triggers"], rng=self.rng
+            )
             self.force_special_board(trigger_symbol, num_scatters)
         elif (
             not (self.get_current_distribution_conditions()["force_freegame"])
@@ -225,12 +173,27 @@ class Board(GeneralGameState):
             force_criteria: The type of symbol to force on the board. (e.g. "scatter")
             num_force_syms: The number of symbols to force on the board.
 
-        Note: If it is possible for two target symbols to appear on one reel, this method
+        With Config.force_board_sampler = "conditional" the board is drawn in one pass by
+        sample_special_board(). Otherwise boards are drawn by _force_special_board() until the count
+        matches, drawing only from the reelstrips which allow it, so impossible requests raise a ValueError.
+
+        Note: If it is possible for two target symbols to appear on one reel, the retry sampler
         will not be able to guarantee an exact number of target symbols or actually random
-        reel positions. I.e. Ensure the reels do not have stacked scatter symbols.
+        reel positions. I.e. Ensure the reels do not have stacked scatter symbols, or use the
+        "conditional" sampler.
         """
+        if self.config.force_board_sampler == "conditional":
+            self.sample_special_board(force_criteria, num_force_syms)
+            return
+        reel_weights = self.get_current_distribution_conditions()["reel_weights"][self.gametype]
+        retry_weights = self.reel_windows.get_retry_weights(reel_weights, force_criteria, num_force_syms)
+        if len(retry_weights) == 0:
+            raise ValueError(
+                f"No reelstrip in {list(reel_weights)} can be forced to show exactly {num_force_syms} "
+                f"'{force_criteria}' symbols on distinct reels."
+            )
         while True:
-            self._force_special_board(force_criteria, num_force_syms)
+            self._force_special_board(force_criteria, num_force_syms, retry_weights)
             if (
                 force_criteria in self.config.special_symbols
                 and self.count_special_symbols(force_criteria) == num_force_syms
@@ -242,14 +205,16 @@ class Board(GeneralGameState):
             ):
                 break
 
-    def _force_special_board(self, force_criteria: str, num_force_syms: int) -> None:
+    def _force_special_board(self, force_criteria: str, num_force_syms: int, reel_weights: dict = None) -> None:
         """
-        Helper function for forcing special (or name specific) symbols
+        Helper function for forcing special (or name specific) symbols.
+        reel_weights defaults to the current distribution's; force_special_board() passes only the strips
+        which can land num_force_syms targets.
         """
-        reelstrip_id = get_random_outcome(
-            self.get_current_distribution_conditions()["reel_weights"][self.gametype]
-        )
-        reelstops = self.get_syms_on_reel(reelstrip_id, force_criteria)
+        if reel_weights is None:
+            reel_weights = self.get_current_distribution_conditions()["reel_weights"][self.gametype]
+        reelstrip_id = get_random_outcome(reel_weights, rng=self.rng)
+        reelstops = self.reel_windows.get_target_index(reelstrip_id, force_criteria).target_stops
 
         sym_prob = []
         for x in range(self.config.num_reels):
@@ -258,29 +223,48 @@ class Board(GeneralGameState):
         while len(force_stop_positions) != num_force_syms:
             possible_reels = [i for i in range(self.config.num_reels) if sym_prob[i] > 0]
             possible_probs = [p for p in sym_prob if p > 0]
-            chosen_reel = random.choices(possible_reels, possible_probs)[0]
-            chosen_stop = random.choice(reelstops[chosen_reel])
+            chosen_reel = self.rng.choices(possible_reels, possible_probs)[0]
+            chosen_stop = self.rng.choice(reelstops[chosen_reel])
             sym_prob[chosen_reel] = 0
             force_stop_positions[int(chosen_reel)] = int(chosen_stop)
 
         force_stop_positions = dict(sorted(force_stop_positions.items(), key=lambda x: x[0]))
         self.force_board_from_reelstrips(reelstrip_id, force_stop_positions)
 
+    @timed_phase("board_draw")
+    def sample_special_board(self, force_criteria: str, num_force_syms: int, valid_only: bool = False) -> None:
+        """
+        Draw a board showing exactly num_force_syms symbols of force_criteria (a special type or a symbol
+        name) in one pass, with its probability under the reel weights and uniform stops conditioned on
+        that count. Stacked target symbols are allowed. valid_only also conditions on the board meeting
+        Config.board_constraints. Raises a ValueError if no reelstrip can show it.
+        """
+        reel_weights = self.get_current_distribution_conditions()["reel_weights"][self.gametype]
+        strip_weights = self.reel_windows.get_conditional_weights(
+            reel_weights, force_criteria, num_force_syms, valid_only
+        )
+        if len(strip_weights) == 0:
+            raise ValueError(
+                f"No reelstrip in {list(reel_weights)} can show exactly {num_force_syms} '{force_criteria}' symbols"
+                + (" within the board constraints." if valid_only else ".")
+            )
+        self.reelstrip_id = get_random_outcome(strip_weights, rng=self.rng)
+        self.reelstrip = self.config.reels[self.reelstrip_id]
+        index = self.reel_windows.get_target_index(self.reelstrip_id, force_criteria, valid_only)
+        self.fill_board_from_windows(index.sample_stops(num_force_syms, self.rng))
+
+    def create_valid_board_reelstrips(self) -> None:
+        """
+        Draw a board meeting Config.board_constraints in one pass, with the distribution of redrawing
+        create_board_reelstrips() until the board is valid: each reelstrip is weighted by its share of
+        valid boards, then stops are drawn uniformly among its valid combinations.
+        """
+        self.sample_special_board(None, 0, valid_only=True)
+
     def get_syms_on_reel(self, reel_id: str, target_symbol: str) -> List[List]:
         """Return reelstop positions for a specific symbol name."""
-        reel = self.config.reels[reel_id]
-        reelstop_positions = [[] for _ in range(self.config.num_reels)]
-        for r in range(self.config.num_reels):
-            for s in range(len(reel[r])):
-                if (
-                    target_symbol in self.config.special_symbols
-                    and reel[r][s] in self.config.special_symbols[target_symbol]
-                ):
-                    reelstop_positions[r].append(s)
-                elif reel[r][s] == target_symbol:
-                    reelstop_positions[r].append(s)
-
-        return reelstop_positions
+        target_stops = self.reel_windows.get_target_index(reel_id, target_symbol).target_stops
+        return [list(stops) for stops in target_stops]
 
     def count_special_symbols(self, special_sym_criteria: str) -> int:
         "Returns integer number of active symbols of any 'special' kind."
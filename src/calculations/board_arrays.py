@@ -0,0 +1,76 @@
+"""Integer NumPy arrays mirroring gamestate.board, for evaluators working on arrays instead of Symbol objects."""
+
+from typing import List
+
+import numpy as np
+
+from src.calculations.symbol import attribute_flag
+
+EMPTY_ID = -1
+
+
+class BoardArrays:
+    """
+    Symbol ids, attribute flags and multiplier values of every board cell, as (num_reels, max_rows) arrays.
+
+    ids holds SymbolStorage symbol ids (EMPTY_ID below the last row of a shorter reel), flags holds
+    Symbol.flags and multipliers the integer value of the multiplier attribute (0 where it is unset or False).
+    integer_multipliers is False when a cell carries a non-integer multiplier, in which case evaluators
+    read multipliers from the Symbol objects. Board.sync_board_arrays() passes every new or changed board
+    to set_board(), and evaluators call update() before reading, so the copy is made once per evaluation.
+    """
+
+    def __init__(self, symbol_storage: object, num_rows: List[int], multiplier_key: str = "multiplier"):
+        self.symbol_storage = symbol_storage
+        self.num_rows = list(num_rows)
+        self.multiplier_key = multiplier_key
+        shape = (len(self.num_rows), max(self.num_rows))
+        self.valid = np.array([[row < rows for row in range(shape[1])] for rows in self.num_rows])
+        self.valid_index = np.flatnonzero(self.valid)
+        # (reel, row) of each cell of the flattened arrays, None below the last row of a shorter reel
+        self.cells = [
+            (reel, row) if row < rows else None for reel, rows in enumerate(self.num_rows) for row in range(shape[1])
+        ]
+        self.ids = np.full(shape, EMPTY_ID, dtype=np.int16)
+        self.flags = np.zeros(shape, dtype=np.int64)
+        self.multipliers = np.zeros(shape, dtype=np.int64)
+        self.integer_multipliers = True
+        self.board = None
+        self.stale = False
+
+    def set_board(self, board: List[List[object]]) -> None:
+        """Mirror a board of Symbol objects, copied into the arrays by the next update()."""
+        self.board = board
+        self.stale = True
+
+    def update(self) -> None:
+        """Copy ids, flags and multipliers from the Symbol objects of the board, if it changed since the last copy."""
+        if not self.stale:
+            return
+        self.stale = False
+        symbols = [symbol for reel in self.board for symbol in reel]
+        flags = [symbol.flags for symbol in symbols]
+        multiplier_flag = attribute_flag(self.multiplier_key)
+        multipliers = [
+            symbol.attributes[self.multiplier_key] if flag & multiplier_flag else 0
+            for symbol, flag in zip(symbols, flags)
+        ]
+        self.integer_multipliers = all(isinstance(value, int) for value in multipliers if value)
+        self.ids.put(self.valid_index, [symbol.symbol_id for symbol in symbols])
+        self.flags.put(self.valid_index, flags)
+        self.multipliers.put(self.valid_index, multipliers if self.integer_multipliers else 0)
+
+    def get_ids(self, names: List[str]) -> List[int]:
+        symbol_ids = self.symbol_storage.symbol_ids
+        return list(dict.fromkeys(symbol_ids[name] for name in names if name in symbol_ids))
+
+    def get_name(self, symbol_id: int) -> str:
+        return self.symbol_storage.symbol_names[symbol_id]
+
+    def count_symbols(self) -> np.ndarray:
+        """Number of cells showing each symbol id."""
+        return np.bincount(self.ids.ravel() + 1, minlength=len(self.symbol_storage.symbol_names) + 1)[1:]
+
+    def assign_flag(self, cell_indices: List[int], attribute: str) -> None:
+        """Set an attribute flag on cells given by their index in the flattened arrays."""
+        self.flags.put(cell_indices, self.flags.take(cell_indices) | attribute_flag(attribute))
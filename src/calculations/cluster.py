@@ -5,6 +5,7 @@ from src.calculations.board import Board
 from src.calculations.symbol import Symbol
 from src.config.config import Config
 from src.wins.multiplier_strategy import apply_mult
+from src.state.phase_timers import timed_phase
 
 
 class Cluster:
@@ -81,6 +82,7 @@ class Cluster:
                 )
 
     @staticmethod
+    @timed_phase("win_evaluation")
     def get_clusters(board: list[list[Symbol]], wild_key: str = "wild") -> dict:
         """Return all symbol clusters of size >= 1."""
         already_checked = []
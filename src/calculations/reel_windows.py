@@ -0,0 +1,295 @@
+"""Precomputed reel windows, so drawing a board from a stop is a table lookup."""
+
+import bisect
+import itertools
+from typing import List
+
+
+class ReelWindow:
+    """
+    The symbols a reel shows when stopped at one position.
+
+    symbols holds the window's symbol names from top to bottom. top and bottom are the padding symbols
+    above and below the window. specials holds (special_type, rows, scatter_reach) for every special type
+    on the window, where scatter_reach is the number of that type's symbols up to and including the last
+    scatter on the window (0 without a scatter), which is what anticipation needs.
+    """
+
+    __slots__ = ("symbols", "top", "bottom", "specials")
+
+    def __init__(self, symbols: tuple, top: str, bottom: str, specials: tuple):
+        self.symbols = symbols
+        self.top = top
+        self.bottom = bottom
+        self.specials = specials
+
+
+def build_reel_windows(reel: List[str], num_rows: int, special_symbols: dict, scatter_symbols: set) -> list:
+    """One ReelWindow per stop of a reel."""
+    reel_length = len(reel)
+    windows = []
+    for stop in range(reel_length):
+        symbols = tuple(reel[(stop + row) % reel_length] for row in range(num_rows))
+        specials = []
+        for special_type, names in special_symbols.items():
+            rows = tuple(row for row, name in enumerate(symbols) if name in names)
+            if rows:
+                scatter_reach = 0
+                for count, row in enumerate(rows, start=1):
+                    if symbols[row] in scatter_symbols:
+                        scatter_reach = count
+                specials.append((special_type, rows, scatter_reach))
+        windows.append(
+            ReelWindow(symbols, reel[(stop - 1) % reel_length], reel[(stop + num_rows) % reel_length], tuple(specials))
+        )
+    return windows
+
+
+class BoardConstraints:
+    """
+    Board validity rules declared in Config.board_constraints, compiled to symbol names.
+
+    Keys are special types or symbol names:
+        max_per_reel: {key: most symbols of key one reel may show}
+        max_per_board: {key: most symbols of key the whole board may show}
+        exclusive_reels: [[key, key, ...], ...] groups of keys which may not show on the same reel
+    The first and last are checked per reel window; board limits are counted across reels by TargetStopIndex.
+    """
+
+    def __init__(self, board_constraints: dict, get_names: callable):
+        unknown = set(board_constraints) - {"max_per_reel", "max_per_board", "exclusive_reels"}
+        assert not unknown, f"unknown board constraints {sorted(unknown)}"
+        self.reel_limits = [
+            (get_names(key), limit) for key, limit in board_constraints.get("max_per_reel", {}).items()
+        ]
+        self.board_limits = [
+            (get_names(key), limit) for key, limit in board_constraints.get("max_per_board", {}).items()
+        ]
+        self.exclusive_groups = [
+            [get_names(key) for key in group] for group in board_constraints.get("exclusive_reels", [])
+        ]
+
+    def is_valid_reel(self, symbols: tuple) -> bool:
+        """Whether one reel's symbol names meet the per reel limits and exclusive groups."""
+        for names, limit in self.reel_limits:
+            if sum(1 for name in symbols if name in names) > limit:
+                return False
+        for group in self.exclusive_groups:
+            if sum(1 for names in group if any(name in names for name in symbols)) > 1:
+                return False
+        return True
+
+    def is_valid_board(self, board_names: List[List[str]]) -> bool:
+        """Whether a board of symbol names, one list per reel, meets every constraint."""
+        if not all(self.is_valid_reel(tuple(reel)) for reel in board_names):
+            return False
+        return all(
+            sum(1 for reel in board_names for name in reel if name in names) <= limit
+            for names, limit in self.board_limits
+        )
+
+
+class TargetStopIndex:
+    """
+    Stops of one reelstrip indexed by the target symbols their windows show.
+
+    target_stops lists, per reel, the stops holding a target symbol. stops_by_count groups, per reel,
+    the stops whose window shows exactly k targets. With BoardConstraints, stop_groups keeps only the stops
+    whose window meets the per reel rules, grouped by (targets, symbols of each board limit) on the window;
+    without, the key is (targets,). board_counts[reel] maps the totals of reels reel.. to their number of
+    stop combinations within the board limits, so a board with exactly k targets can be drawn with its
+    probability under uniform stops, conditioned on meeting the constraints, in one pass.
+    """
+
+    def __init__(self, reelstrip: List[List[str]], windows: list, target_names: set, constraints: object = None):
+        self.target_stops = [[stop for stop, name in enumerate(reel) if name in target_names] for reel in reelstrip]
+        self.stops_by_count = []
+        for reel_windows in windows:
+            by_count = {}
+            for stop, window in enumerate(reel_windows):
+                count = sum(1 for name in window.symbols if name in target_names)
+                by_count.setdefault(count, []).append(stop)
+            self.stops_by_count.append(by_count)
+        self.num_boards = 1
+        for reel_windows in windows:
+            self.num_boards *= len(reel_windows)
+        if constraints is None:
+            self.limits = ()
+            self.stop_groups = [
+                {(count,): stops for count, stops in by_count.items()} for by_count in self.stops_by_count
+            ]
+        else:
+            self.limits = tuple(limit for _, limit in constraints.board_limits)
+            counted = [target_names] + [names for names, _ in constraints.board_limits]
+            self.stop_groups = []
+            for reel_windows in windows:
+                groups = {}
+                for stop, window in enumerate(reel_windows):
+                    if constraints.is_valid_reel(window.symbols):
+                        key = tuple(sum(1 for name in window.symbols if name in names) for names in counted)
+                        groups.setdefault(key, []).append(stop)
+                self.stop_groups.append(groups)
+        self.board_counts = [{(0,) * (len(self.limits) + 1): 1}]
+        for groups in reversed(self.stop_groups):
+            counts = {}
+            for key, stops in groups.items():
+                for later, ways in self.board_counts[0].items():
+                    totals = tuple(a + b for a, b in zip(key, later))
+                    if all(total <= limit for total, limit in zip(totals[1:], self.limits)):
+                        counts[totals] = counts.get(totals, 0) + len(stops) * ways
+            self.board_counts.insert(0, counts)
+        self.choices = {}
+
+    def count_boards(self, num_targets: int, reel: int = 0, used: tuple = ()) -> int:
+        """
+        Stop combinations of reels reel.. showing exactly num_targets targets, within the board limits
+        once used (symbols of each board limit already on reels before reel) is added.
+        """
+        return sum(
+            ways
+            for totals, ways in self.board_counts[reel].items()
+            if totals[0] == num_targets and all(u + t <= limit for u, t, limit in zip(used, totals[1:], self.limits))
+        )
+
+    def can_retry(self, num_targets: int) -> bool:
+        """
+        Whether Board._force_special_board() can ever land exactly num_targets targets: it forces a target
+        onto num_targets distinct reels, so each of those needs a window with one target and every other
+        reel a window without one.
+        """
+        one_target = [1 in by_count for by_count in self.stops_by_count]
+        forced = [reel for reel, by_count in enumerate(self.stops_by_count) if 0 not in by_count]
+        return all(one_target[reel] for reel in forced) and len(forced) <= num_targets <= sum(one_target)
+
+    def get_choices(self, reel: int, num_targets: int, used: tuple) -> tuple:
+        """Window keys of a reel with their cumulative weights, for the targets left and board limit counts used."""
+        state = (reel, num_targets, used)
+        if state not in self.choices:
+            keys = sorted(self.stop_groups[reel])
+            cumulative = list(
+                itertools.accumulate(
+                    len(self.stop_groups[reel][key])
+                    * self.count_boards(num_targets - key[0], reel + 1, tuple(u + k for u, k in zip(used, key[1:])))
+                    for key in keys
+                )
+            )
+            self.choices[state] = (keys, cumulative)
+        return self.choices[state]
+
+    def sample_stops(self, num_targets: int, rng: object) -> List[int]:
+        """Stops showing exactly num_targets targets, drawn with their probability under uniform stops."""
+        stops = []
+        used = (0,) * len(self.limits)
+        for reel, groups in enumerate(self.stop_groups):
+            keys, cumulative = self.get_choices(reel, num_targets, used)
+            key = keys[bisect.bisect_right(cumulative, rng.randrange(cumulative[-1]))]
+            stops.append(rng.choice(groups[key]))
+            num_targets -= key[0]
+            used = tuple(u + k for u, k in zip(used, key[1:]))
+        return stops
+
+
+class ReelWindowTables:
+    """
+    Windows of every reelstrip in config.reels, built when the gamestate is created.
+    A reelstrip replaced in config.reels after that is rebuilt on its next lookup.
+    """
+
+    def __init__(self, config: object):
+        self.config = config
+        self.special_symbols = {
+            special_type: set(names) for special_type, names in config.special_symbols.items() if names
+        }
+        self.scatter_symbols = set(config.special_symbols.get("scatter", []))
+        self.tables = {}
+        self.target_indexes = {}
+        self.conditional_weights = {}
+        self.constraints = None
+        for reelstrip_id in config.reels:
+            self.build(reelstrip_id)
+
+    def build(self, reelstrip_id: str) -> list:
+        reelstrip = self.config.reels[reelstrip_id]
+        windows = [
+            build_reel_windows(reelstrip[reel], self.config.num_rows[reel], self.special_symbols, self.scatter_symbols)
+            for reel in range(self.config.num_reels)
+        ]
+        self.tables[reelstrip_id] = (reelstrip, windows)
+        self.conditional_weights = {}
+        return windows
+
+    def get_windows(self, reelstrip_id: str) -> list:
+        """Per reel, the ReelWindow of every stop of a reelstrip."""
+        reelstrip, windows = self.tables.get(reelstrip_id, (None, None))
+        if reelstrip is not self.config.reels[reelstrip_id]:
+            windows = self.build(reelstrip_id)
+        return windows
+
+    def get_target_names(self, target: str) -> set:
+        """Symbol names of a special type, or the symbol name itself. None targets no symbol."""
+        if target is None:
+            return set()
+        if target in self.config.special_symbols:
+            return set(self.config.special_symbols[target])
+        return {target}
+
+    def get_constraints(self) -> BoardConstraints:
+        """Config.board_constraints compiled to symbol names, built on first use."""
+        if self.constraints is None:
+            self.constraints = BoardConstraints(self.config.board_constraints, self.get_target_names)
+        return self.constraints
+
+    def get_target_index(self, reelstrip_id: str, target: str, valid_only: bool = False) -> TargetStopIndex:
+        """
+        TargetStopIndex of a reelstrip for a special type or symbol name (None counts nothing), built on
+        first use. valid_only restricts it to boards meeting Config.board_constraints.
+        """
+        windows = self.get_windows(reelstrip_id)
+        key = (reelstrip_id, target, valid_only)
+        if key not in self.target_indexes or self.target_indexes[key][0] is not windows:
+            index = TargetStopIndex(
+                self.config.reels[reelstrip_id],
+                windows,
+                self.get_target_names(target),
+                self.get_constraints() if valid_only else None,
+            )
+            self.target_indexes[key] = (windows, index)
+        return self.target_indexes[key][1]
+
+    def get_conditional_weights(
+        self, reel_weights: dict, target: str, num_targets: int, valid_only: bool = False
+    ) -> dict:
+        """
+        Reelstrip weights conditioned on the board showing exactly num_targets targets (and meeting
+        Config.board_constraints with valid_only): each weight is multiplied by the probability of that
+        under uniform stops. Strips which cannot show it are left out. Cached, and kept alive with the
+        reel_weights dict, so get_random_outcome() reuses its sampler.
+        """
+        key = (id(reel_weights), target, num_targets, valid_only)
+        if key not in self.conditional_weights:
+            weights = {}
+            for reelstrip_id, weight in reel_weights.items():
+                index = self.get_target_index(reelstrip_id, target, valid_only)
+                boards = index.count_boards(num_targets)
+                if weight > 0 and boards > 0:
+                    weights[reelstrip_id] = weight * (boards / index.num_boards)
+            self.conditional_weights[key] = (reel_weights, weights)
+        return self.conditional_weights[key][1]
+
+    def get_retry_weights(self, reel_weights: dict, target: str, num_targets: int) -> dict:
+        """
+        The reel_weights of reelstrips on which Board._force_special_board() can land exactly num_targets
+        targets (see TargetStopIndex.can_retry()), or reel_weights itself when every strip can. Cached like
+        get_conditional_weights().
+        """
+        key = ("retry", id(reel_weights), target, num_targets)
+        if key not in self.conditional_weights:
+            weights = {
+                reelstrip_id: weight
+                for reelstrip_id, weight in reel_weights.items()
+                if weight > 0 and self.get_target_index(reelstrip_id, target).can_retry(num_targets)
+            }
+            if weights == reel_weights:
+                weights = reel_weights
+            self.conditional_weights[key] = (reel_weights, weights)
+        return self.conditional_weights[key][1]
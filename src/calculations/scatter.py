@@ -3,7 +3,9 @@
 from typing import List, Dict
 from collections import defaultdict
 from src.calculations.symbol import Symbol
+from src.calculations.board_arrays import BoardArrays
 from src.config.config import Config
+from src.state.phase_timers import timed_phase
 
 
 class Scatter:
@@ -32,14 +34,24 @@ class Scatter:
         return (reel_to_overlay, row_to_overlay)
 
     @staticmethod
+    @timed_phase("win_evaluation")
     def get_scatterpay_wins(
         config: Config,
         board: list[list[Symbol]],
         wild_key: str = "wild",
         multiplier_key: str = "multiplier",
         global_multiplier: int = 1,
+        board_arrays: BoardArrays = None,
     ) -> dict:
-        """Return win data for all paying symbols"""
+        """Return win data for all paying symbols, counted on board_arrays when they are given."""
+        if board_arrays is not None:
+            board_arrays.update()
+        if (
+            board_arrays is not None
+            and board_arrays.multiplier_key == multiplier_key
+            and board_arrays.integer_multipliers
+        ):
+            return Scatter.get_scatterpay_wins_from_arrays(config, board, board_arrays, wild_key, global_multiplier)
         return_data = {
             "totalWin": 0,
             "wins": [],
@@ -94,6 +106,83 @@ class Scatter:
 
         return return_data
 
+    @staticmethod
+    def get_scatterpay_wins_from_arrays(
+        config: Config,
+        board: list[list[Symbol]],
+        board_arrays: BoardArrays,
+        wild_key: str = "wild",
+        global_multiplier: int = 1,
+    ) -> dict:
+        """
+        Same win data as get_scatterpay_wins(), with symbols counted by id on board_arrays.
+        Positions are only listed when a symbol pays, and are marked to explode on the board and the arrays.
+        """
+        return_data = {
+            "totalWin": 0,
+            "wins": [],
+        }
+        rows_for_overlay = []
+        total_win = 0.0
+        wild_ids = board_arrays.get_ids(config.special_symbols[wild_key])
+        counts = board_arrays.count_symbols().tolist()
+        num_wilds = sum(counts[symbol_id] for symbol_id in wild_ids)
+        paying_ids = []
+        for symbol_id, count in enumerate(counts):
+            if (
+                count > 0
+                and symbol_id not in wild_ids
+                and (count + num_wilds, board_arrays.get_name(symbol_id)) in config.paytable
+            ):
+                paying_ids.append(symbol_id)
+
+        cell_indices = {}
+        if len(paying_ids) > 0:
+            flat_ids = board_arrays.ids.ravel().tolist()
+            multipliers = board_arrays.multipliers.ravel().tolist()
+            cell_indices = {symbol_id: [] for symbol_id in wild_ids}
+            for index, symbol_id in enumerate(flat_ids):
+                if symbol_id in paying_ids or symbol_id in cell_indices:
+                    cell_indices.setdefault(symbol_id, []).append(index)
+            wild_indices = [index for symbol_id in wild_ids for index in cell_indices.pop(symbol_id)]
+            wild_indices.sort()
+
+        # Paying symbols in order of first appearance on the board, as get_scatterpay_wins() lists them
+        for symbol_id, indices in cell_indices.items():
+            sym = board_arrays.get_name(symbol_id)
+            indices = indices + wild_indices
+            positions = [{"reel": board_arrays.cells[i][0], "row": board_arrays.cells[i][1]} for i in indices]
+            win_size = len(positions)
+            symbol_mult = max(sum(multipliers[i] for i in indices), 1)
+            for i in indices:
+                board[board_arrays.cells[i][0]][board_arrays.cells[i][1]].explode = True
+            board_arrays.assign_flag(indices, "explode")
+
+            overlay_position = Scatter.get_central_scatter_position(
+                rows_for_overlay, positions, len(board), len(board[0])
+            )
+            rows_for_overlay.append(overlay_position[1])
+            symbol_win_data = {
+                "symbol": sym,
+                "win": config.paytable[(win_size, sym)] * global_multiplier * symbol_mult,
+                "positions": positions,
+                "meta": {
+                    "globalMult": global_multiplier,
+                    "clusterMult": symbol_mult,
+                    "winWithoutMult": config.paytable[(win_size, sym)],
+                    "overlay": {
+                        "reel": overlay_position[0],
+                        "row": overlay_position[1],
+                    },
+                },
+            }
+            total_win += symbol_win_data["win"]
+            return_data["wins"].append(symbol_win_data)
+
+        return_data["totalWin"] = total_win
+
+        return return_data
+
     @staticmethod
     def record_scatter_wins(gamestate) -> None:
         """Force-file description key generator."""
@@ -1,20 +1,107 @@
 import random
+from bisect import bisect_left
 from typing import Union
 
+OUTCOME_SAMPLERS = ("exact", "alias")
 
-def get_random_outcome(distribution: dict, totalWeight: float = None) -> Union[float, int]:
-    """Returns a value from a distibution passed as a dictionary: {value : weight, ...}"""
-    assert isinstance(distribution, dict), "distribution must be of type: dict "
-    if totalWeight is None:
-        totalWeight = sum(distribution.values())
-    roll = random.uniform(0, totalWeight)
-    cumulative = 0.0
-    for value, weight in distribution.items():
-        cumulative += weight
-        if cumulative >= roll:
-            return value
+# Compiled samplers by id() of their distribution, each entry holds the distribution so its id is not reused
+_sampler_cache = {}
+_sampler_mode = "exact"
 
-    return Exception("error drawing item from distribution")
+
+class CumulativeSampler:
+    """
+    Running weight sums of a distribution, searched with bisect.
+    Uses the same random.uniform() roll and cumulative sums as the linear scan it replaces,
+    so every draw (and the random state afterwards) is identical to it.
+    """
+
+    def __init__(self, distribution: dict):
+        self.values = list(distribution.keys())
+        self.total_weight = sum(distribution.values())
+        self.cumulative = []
+        cumulative = 0.0
+        for weight in distribution.values():
+            cumulative += weight
+            self.cumulative.append(cumulative)
+
+    def draw(self, total_weight: float = None, rng: object = random) -> Union[float, int]:
+        roll = rng.uniform(0, self.total_weight if total_weight is None else total_weight)
+        idx = bisect_left(self.cumulative, roll)
+        if idx < len(self.values):
+            return self.values[idx]
+        return Exception("error drawing item from distribution")
+
+
+class AliasSampler:
+    """
+    Walker/Vose alias table, drawing any distribution with one random.random() call in constant time.
+    Outcome probabilities match the distribution but the draw sequence differs from CumulativeSampler,
+    and a totalWeight passed to get_random_outcome() is ignored.
+    """
+
+    def __init__(self, distribution: dict):
+        self.values = list(distribution.keys())
+        num_values = len(self.values)
+        total_weight = sum(distribution.values())
+        scaled = [weight * num_values / total_weight for weight in distribution.values()]
+        self.probability = [1.0] * num_values
+        self.alias = list(range(num_values))
+        small = [idx for idx, p in enumerate(scaled) if p < 1.0]
+        large = [idx for idx, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+
+    def draw(self, total_weight: float = None, rng: object = random) -> Union[float, int]:
+        roll = rng.random() * len(self.values)
+        idx = int(roll)
+        if roll - idx < self.probability[idx]:
+            return self.values[idx]
+        return self.values[self.alias[idx]]
+
+
+def set_outcome_sampler(mode: str) -> None:
+    """
+    Select how get_random_outcome() draws: "exact" (default) reproduces the original linear scan
+    draw for draw, "alias" uses O(1) alias tables and gives different (equally distributed) books.
+    """
+    global _sampler_mode
+    assert mode in OUTCOME_SAMPLERS, f"outcome sampler must be one of {OUTCOME_SAMPLERS}"
+    if mode != _sampler_mode:
+        _sampler_mode = mode
+        clear_sampler_cache()
+
+
+def clear_sampler_cache() -> None:
+    """Drop compiled samplers, required if a distribution dict is modified after it has been drawn from."""
+    _sampler_cache.clear()
+
+
+def get_sampler(distribution: dict) -> object:
+    """Compiled sampler of a distribution, built on its first draw."""
+    entry = _sampler_cache.get(id(distribution))
+    if entry is None or entry[0] is not distribution:
+        assert isinstance(distribution, dict), "distribution must be of type: dict "
+        sampler = AliasSampler(distribution) if _sampler_mode == "alias" else CumulativeSampler(distribution)
+        entry = _sampler_cache[id(distribution)] = (distribution, sampler)
+    return entry[1]
+
+
+def get_random_outcome(distribution: dict, totalWeight: float = None, rng: object = random) -> Union[float, int]:
+    """
+    Returns a value from a distibution passed as a dictionary: {value : weight, ...}
+    Gamestate code passes rng=self.rng, the random module is used otherwise.
+    Samplers are cached per distribution object, so distributions must not be modified in place between draws
+    (see clear_sampler_cache()).
+    """
+    entry = _sampler_cache.get(id(distribution))
+    if entry is not None and entry[0] is distribution:
+        return entry[1].draw(totalWeight, rng)
+    return get_sampler(distribution).draw(totalWeight, rng)
 
 
 def get_mean_std_median(dist: dict) -> tuple[float, float, float]:
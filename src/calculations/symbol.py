@@ -2,6 +2,30 @@
 
 from typing import Dict
 
+# Bit flag per symbol attribute name, assigned the first time an attribute is set on any symbol
+ATTRIBUTE_FLAGS: Dict[str, int] = {}
+SYMBOL_SLOTS = (
+    "name",
+    "symbol_id",
+    "special",
+    "is_paying",
+    "paytable",
+    "special_functions",
+    "attributes",
+    "flags",
+    "prototype",
+)
+
+
+def attribute_flag(*attributes: str) -> int:
+    """Combined bit flag of the given attribute names, for Symbol.check_flags()."""
+    mask = 0
+    for attribute in attributes:
+        if attribute not in ATTRIBUTE_FLAGS:
+            ATTRIBUTE_FLAGS[attribute] = 1 << len(ATTRIBUTE_FLAGS)
+        mask |= ATTRIBUTE_FLAGS[attribute]
+    return mask
+
 
 class SymbolStorage:
     """Initial symbol generation from configuration file."""
@@ -11,25 +35,50 @@ class SymbolStorage:
         self.symbols: Dict[str, Symbol] = {}
         for symbol in all_symbols:
             self.symbols[symbol] = Symbol(self.config, symbol)
+        self.assign_symbol_ids()
+
+    def assign_symbol_ids(self) -> None:
+        """Integer id per stored symbol, used by the integer board arrays."""
+        self.symbol_names = list(self.symbols)
+        self.symbol_ids = {name: idx for idx, name in enumerate(self.symbol_names)}
+        for name, symbol in self.symbols.items():
+            symbol.symbol_id = self.symbol_ids[name]
 
     def create_symbol_state(self, symbol_name: str) -> object:
-        """Create new symbol class instance."""
-        return Symbol(self.config, symbol_name)
+        """Create new symbol class instance, copied from the stored prototype of that name."""
+        prototype = self.symbols.get(symbol_name)
+        if prototype is None:
+            return Symbol(self.config, symbol_name)
+        return prototype.new_instance()
 
     def get_symbol(self, name: str) -> object:
         """Retrieve symbol class from name."""
         if name not in self.symbols:
             self.symbols[name] = Symbol(self.config, name)
+            self.assign_symbol_ids()
         return self.symbols[name]
 
 
 class Symbol:
-    """Create symbol from name (string) and assign relevant attributes and special functions."""
+    """
+    Create symbol from name (string) and assign relevant attributes and special functions.
+
+    Special properties and assigned attributes (multiplier, explode, ...) are held in the attributes
+    dict, readable as regular attributes, with one bit per attribute in flags so check_attribute()
+    is a mask test. SymbolStorage builds one prototype per name; board symbols are instances from
+    new_instance(), sharing the prototype's attributes until an attribute is assigned.
+    """
+
+    __slots__ = SYMBOL_SLOTS
 
     def __init__(self, config: object, name: str) -> None:
         self.name = name
+        self.symbol_id = -1
         self.special_functions = []
         self.special = False
+        self.attributes = {}
+        self.flags = 0
+        self.prototype = None
         is_special = False
         for special_property in config.special_symbols.keys():
             if name in config.special_symbols[special_property]:
@@ -41,6 +90,49 @@ class Symbol:
 
         self.assign_paying_bool(config)
 
+    def new_instance(self) -> object:
+        """Board instance of this symbol, copying the attributes without rebuilding them from the config."""
+        symbol = Symbol.__new__(Symbol)
+        set_slot = object.__setattr__
+        set_slot(symbol, "name", self.name)
+        set_slot(symbol, "symbol_id", self.symbol_id)
+        set_slot(symbol, "special", self.special)
+        set_slot(symbol, "is_paying", self.is_paying)
+        set_slot(symbol, "paytable", self.paytable)
+        set_slot(symbol, "special_functions", [])
+        set_slot(symbol, "attributes", self.attributes)
+        set_slot(symbol, "flags", self.flags)
+        set_slot(symbol, "prototype", self)
+        return symbol
+
+    def __getattr__(self, attribute: str):
+        if attribute.startswith("__"):
+            raise AttributeError(attribute)
+        try:
+            return object.__getattribute__(self, "attributes")[attribute]
+        except (KeyError, AttributeError):
+            raise AttributeError(f"'Symbol' object has no attribute '{attribute}'") from None
+
+    def __setattr__(self, attribute: str, value) -> None:
+        if attribute in SYMBOL_SLOTS:
+            object.__setattr__(self, attribute, value)
+            return
+        if self.prototype is not None and self.attributes is self.prototype.attributes:
+            object.__setattr__(self, "attributes", dict(self.attributes))
+        self.attributes[attribute] = value
+        flag = attribute_flag(attribute)
+        if value is False:
+            self.flags &= ~flag
+        else:
+            self.flags |= flag
+
+    def __getstate__(self) -> dict:
+        return {slot: getattr(self, slot) for slot in SYMBOL_SLOTS}
+
+    def __setstate__(self, state: dict) -> None:
+        for slot, value in state.items():
+            object.__setattr__(self, slot, value)
+
     def register_special_function(self, special_function: callable) -> None:
         """Assign special symbol function."""
         self.special_functions.append(special_function)
@@ -73,10 +165,18 @@ class Symbol:
     def check_attribute(self, *args) -> bool:
         """Check if an attribute exists in a given list."""
         for arg in args:
-            if hasattr(self, arg) and (not (isinstance(getattr(self, arg), bool)) or getattr(self, arg) is True):
+            flag = ATTRIBUTE_FLAGS.get(arg)
+            if flag is not None:
+                if self.flags & flag:
+                    return True
+            elif arg in SYMBOL_SLOTS and getattr(self, arg) is not False:
                 return True
         return False
 
+    def check_flags(self, mask: int) -> bool:
+        """Check if any attribute in a mask from attribute_flag() is set."""
+        return self.flags & mask != 0
+
     def get_attribute(self, attribute) -> type:
         """Return existing attribute value."""
         return getattr(self, attribute)
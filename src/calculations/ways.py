@@ -4,6 +4,7 @@ from collections import defaultdict
 from src.calculations.symbol import Symbol
 from src.config.config import Config
 from src.wins.multiplier_strategy import apply_mult
+from src.state.phase_timers import timed_phase
 from src.events.events import (
     win_info_event,
     set_win_event,
@@ -15,6 +16,7 @@ class Ways:
     """Collection of Ways-wins functions"""
 
     @staticmethod
+    @timed_phase("win_evaluation")
     def get_ways_data(
         config: Config,
         board: list[list[Symbol]],
@@ -49,6 +49,18 @@ class Config:
         self.padding_reels = {}  # symbol configuration displayed before the board reveal
 
         self.write_event_list = True
+        # get_random_outcome() sampler: "exact" reproduces existing books, "alias" draws in O(1) with different books
+        self.outcome_sampler = "exact"
+        # gamestate.rng: "mersenne" reproduces existing books, "philox" gives an independent stream per spin attempt
+        self.rng_mode = "mersenne"
+        # force_special_board(): "retry" reproduces existing books, "conditional" draws exact counts in one pass
+        self.force_board_sampler = "retry"
+        # Board validity rules (max_per_reel, max_per_board, exclusive_reels), see reel_windows.BoardConstraints
+        self.board_constraints = {}
+        # Boards meeting board_constraints: "retry" reproduces existing books, "tables" draws valid boards in one pass
+        self.valid_board_sampler = "retry"
+        # Mirror the board into integer NumPy arrays (gamestate.board_arrays) for array-based evaluators
+        self.use_board_arrays = False
 
         self.bet_modes = []
         self.opt_params = {None: None}
@@ -0,0 +1,102 @@
+"""Stable fingerprints of game configuration, used to detect when simulation outputs are stale."""
+
+import os
+import json
+import hashlib
+
+from src.config.paths import PATH_TO_ENGINE, PATH_TO_GAMES
+
+# Attributes which change during a run or do not affect simulation output
+EXCLUDED_ATTRIBUTES = {"_force_keys", "opt_params"}
+# Launcher and tooling scripts in a game directory, which do not affect simulation output
+GAME_TOOLING_SCRIPTS = {"run.py", "check_fence_rtps.py", "verify_config.py"}
+
+
+def canonicalize(obj: object) -> object:
+    """Convert config values (including tuple-keyed dicts and config objects) into JSON-ready structures."""
+    if isinstance(obj, dict):
+        return sorted([[repr(k), canonicalize(v)] for k, v in obj.items()], key=lambda item: item[0])
+    if isinstance(obj, (list, tuple)):
+        return [canonicalize(v) for v in obj]
+    if isinstance(obj, (set, frozenset)):
+        return sorted(repr(v) for v in obj)
+    if isinstance(obj, float):
+        return repr(obj)
+    if obj is None or isinstance(obj, (str, int, bool)):
+        return obj
+    if hasattr(obj, "__dict__"):
+        return [
+            type(obj).__name__,
+            canonicalize(
+                {
+                    k: v
+                    for k, v in vars(obj).items()
+                    if k not in EXCLUDED_ATTRIBUTES and "path" not in k and not callable(v)
+                }
+            ),
+        ]
+    return repr(obj)
+
+
+def stable_hash(obj: object) -> str:
+    """sha256 of the canonical JSON representation of an object."""
+    return hashlib.sha256(json.dumps(canonicalize(obj), separators=(",", ":")).encode("UTF-8")).hexdigest()
+
+
+def get_fingerprint_attributes(obj: object, excluded: tuple = ()) -> dict:
+    """Attributes of a config object included in fingerprints."""
+    return {
+        k: v
+        for k, v in vars(obj).items()
+        if k not in EXCLUDED_ATTRIBUTES and k not in excluded and "path" not in k and not callable(v)
+    }
+
+
+def get_source_hash(root: str, excluded: set = frozenset()) -> str:
+    """Hash every python file below root in sorted relative-path order, skipping top-level files named in excluded."""
+    sha = hashlib.sha256()
+    sources = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d != "__pycache__"]
+        for filename in filenames:
+            if filename.endswith(".py") and not (dirpath == root and filename in excluded):
+                sources.append(os.path.relpath(os.path.join(dirpath, filename), root))
+    for source in sorted(sources):
+        sha.update(source.replace(os.sep, "/").encode("UTF-8"))
+        with open(os.path.join(root, source), "rb") as f:
+            sha.update(f.read())
+    return sha.hexdigest()
+
+
+def get_game_code_hash(game_id: str) -> str:
+    """
+    Hash the engine sources under src/ and the python sources of the game directory, including
+    subpackages. Launcher and tooling scripts (GAME_TOOLING_SCRIPTS) are left out, so editing a
+    run.py default does not invalidate caches, seed banks or shards.
+    """
+    game_dir = os.path.join(PATH_TO_GAMES, game_id)
+    game_hash = get_source_hash(game_dir, GAME_TOOLING_SCRIPTS) if os.path.isdir(game_dir) else ""
+    return stable_hash({"engine": get_source_hash(os.path.join(PATH_TO_ENGINE, "src")), "game": game_hash})
+
+
+def get_config_fingerprint(config: object) -> str:
+    """Fingerprint of every config attribute (reels, paytable, betmodes, distributions, ...) and the game code."""
+    return stable_hash({"config": config, "game_code": get_game_code_hash(config.game_id)})
+
+
+def get_criteria_fingerprint(config: object, betmode_name: str, criteria: str) -> str:
+    """
+    Fingerprint of everything deciding whether a spin is accepted for one criteria: the game config
+    without bet modes, the bet mode without its distributions and RTP, the criteria's distribution
+    without its quota, and the game code. Changing other criteria or quotas leaves it unchanged.
+    """
+    betmode = next(bm for bm in config.bet_modes if bm.get_name() == betmode_name)
+    distribution = next(d for d in betmode.get_distributions() if d.get_criteria() == criteria)
+    return stable_hash(
+        {
+            "config": get_fingerprint_attributes(config, ("bet_modes",)),
+            "betmode": get_fingerprint_attributes(betmode, ("_distributions", "_rtp")),
+            "distribution": get_fingerprint_attributes(distribution, ("_quota", "_fixed_amt")),
+            "game_code": get_game_code_hash(config.game_id),
+        }
+    )
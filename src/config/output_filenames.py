@@ -119,30 +119,87 @@ class OutputFiles:
                 },
             }
 
-    def get_temp_multi_thread_name(self, betmode: str, thread_index: int, repeat_count: int, compress: bool):
+    def get_temp_multi_thread_name(self, betmode: str, chunk_index: int, compress: bool):
         """Naming convention for temp book files."""
         if compress:
-            filename = f"books_{betmode}_{thread_index}_{repeat_count}.jsonl.zst"
+            filename = f"books_{betmode}_{chunk_index}.jsonl.zst"
         elif not (compress) and self.game_config.output_regular_json:
-            filename = f"books_{betmode}_{thread_index}_{repeat_count}.json"
+            filename = f"books_{betmode}_{chunk_index}.json"
         elif not (compress) and not (self.game_config.output_regular_json):
-            filename = f"books_{betmode}_{thread_index}_{repeat_count}.jsonl"
+            filename = f"books_{betmode}_{chunk_index}.jsonl"
         else:
             raise RuntimeError("Error in logic generating book name")
 
         return os.path.join(self.temp_path, filename)
 
-    def get_temp_lookup_name(self, betmode: str, thread_index: int, repeat_count: int):
+    def get_temp_lookup_name(self, betmode: str, chunk_index: int):
         """Naming convention for temp lookup files."""
-        return os.path.join(self.temp_path, f"lookUpTable_{betmode}_{thread_index}_{repeat_count}")
+        return os.path.join(self.temp_path, f"lookUpTable_{betmode}_{chunk_index}")
 
-    def get_temp_segmented_name(self, betmode: str, thread_index: int, repeat_count: int):
+    def get_temp_segmented_name(self, betmode: str, chunk_index: int):
         """Naming convention for temp segmented lookup files."""
-        return os.path.join(self.temp_path, f"lookUpTableSegmented_{betmode}_{thread_index}_{repeat_count}")
+        return os.path.join(self.temp_path, f"lookUpTableSegmented_{betmode}_{chunk_index}")
 
-    def get_temp_force_name(self, betmode: str, thread_index: int, repeat_count: int):
+    def get_temp_force_name(self, betmode: str, chunk_index: int):
         """Naming convention for temp force files."""
-        return os.path.join(self.temp_path, f"force_{betmode}_{thread_index}_{repeat_count}.json")
+        return os.path.join(self.temp_path, f"force_{betmode}_{chunk_index}.json")
+
+    def get_temp_chunk_files(self, betmode: str, chunk_index: int, compress: bool):
+        """All temporary files written by a single simulation chunk."""
+        return [
+            self.get_temp_multi_thread_name(betmode, chunk_index, compress),
+            self.get_temp_force_name(betmode, chunk_index),
+            self.get_temp_lookup_name(betmode, chunk_index),
+            self.get_temp_segmented_name(betmode, chunk_index),
+        ]
+
+    def get_run_manifest_name(self):
+        """Record of completed simulation chunks, used to resume interrupted runs."""
+        return os.path.join(self.temp_path, "run_manifest.json")
+
+    def get_metrics_name(self, extension: str):
+        """Simulation progress metrics (jsonl history or prom textfile)."""
+        return os.path.join(self.library_path, "metrics", f"sim_metrics.{extension}")
+
+    def get_temp_profile_name(self, betmode: str, chunk_index, extension: str):
+        """Per-chunk worker profile (raw cProfile stats or collapsed stacks)."""
+        return os.path.join(self.temp_path, "profiles", betmode, f"{chunk_index}.{extension}")
+
+    def get_profile_name(self, betmode: str, extension: str):
+        """Merged betmode profile: .prof (pstats), .collapsed (flamegraph stacks) or .txt (top functions)."""
+        return os.path.join(self.library_path, "profiles", f"simulationProfile_{betmode}.{extension}")
+
+    def get_temp_phase_timer_name(self, betmode: str, chunk_index):
+        """Per-chunk phase timings and counters."""
+        return os.path.join(self.temp_path, "phase_timers", betmode, f"{chunk_index}.json")
+
+    def get_phase_timer_name(self, betmode: str):
+        """Merged per-criteria phase timings, written next to the lookup tables."""
+        return os.path.join(self.lookup_path, f"phase_timers_{betmode}.json")
+
+    def get_temp_repeat_cost_name(self, betmode: str, chunk_index):
+        """Per-chunk attempts and simulation times by criteria."""
+        return os.path.join(self.temp_path, "repeat_costs", betmode, f"{chunk_index}.json")
+
+    def get_repeat_cost_name(self, betmode: str, extension: str):
+        """Repeat cost report (.json) and its readable summary (.txt), written next to the lookup tables."""
+        return os.path.join(self.lookup_path, f"repeat_costs_{betmode}.{extension}")
+
+    def get_seed_bank_name(self, betmode: str, criteria: str):
+        """Accepting attempt seeds mined for a betmode criteria, kept between runs."""
+        return os.path.join(self.library_path, "seed_bank", f"{betmode}_{criteria}.json")
+
+    def get_temp_criteria_cache_name(self, betmode: str, chunk_index: int, sim_start: int, sim_end: int):
+        """Per-chunk criteria cache records, named by the sim range they cover."""
+        return os.path.join(self.temp_path, "criteria_cache", betmode, f"{chunk_index}_{sim_start}_{sim_end}.jsonl.zst")
+
+    def get_criteria_cache_dir(self, betmode: str):
+        """Cached per-simulation outputs of a betmode, reused for criteria whose fingerprint is unchanged."""
+        return os.path.join(self.library_path, "criteria_cache", betmode)
+
+    def get_temp_plan_name(self, betmode: str, array_name: str):
+        """Naming convention for memory-mapped simulation plan arrays."""
+        return os.path.join(self.temp_path, f"sim_plan_{betmode}_{array_name}.npy")
 
     def get_final_book_name(self, betmode: str, compress: bool):
         """Returns final simulation books output name."""
@@ -156,10 +213,23 @@ class OutputFiles:
             raise RuntimeError("Logic error in name generation.")
         return os.path.join(self.compressed_path if compress else self.book_path, filename)
 
+    def get_final_output_files(self, betmode: str, compress: bool):
+        """All files produced by merging a betmode's temporary chunk files."""
+        return [
+            self.get_final_book_name(betmode, compress),
+            self.get_final_lookup_name(betmode),
+            self.get_final_segmented_name(betmode),
+            os.path.join(self.force_path, f"force_record_{betmode}.json"),
+        ]
+
     def get_final_lookup_name(self, betmode: str):
         """Final csv lookup table name."""
         return os.path.join(self.lookup_path, f"lookUpTable_{betmode}.csv")
 
+    def get_precision_report_name(self, betmode: str):
+        """Achieved per-criteria precision of an adaptive simulation run."""
+        return os.path.join(self.lookup_path, f"simulation_precision_{betmode}.json")
+
     def get_optimized_lookup_name(self, betmode: str):
         """Optimized lookup table"""
         return os.path.join(self.publish_path, f"lookUpTable_{betmode}_0.csv")
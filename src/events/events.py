@@ -1,15 +1,28 @@
 """Defines reusable events"""
 
+import functools
 from copy import deepcopy
 from src.events.event_constants import EventConstants
+from src.state.phase_timers import timed_phase
+
+
+def book_event(func):
+    """Skip building and adding an event while the gamestate has event emission turned off."""
+
+    @functools.wraps(func)
+    def wrapper(gamestate, *args, **kwargs):
+        if gamestate.emit_events:
+            return func(gamestate, *args, **kwargs)
+        return None
+
+    return wrapper
 
 
 def json_ready_sym(symbol: object, special_attributes: list = None):
     """Converts a symbol to dictionary/JSON format."""
     assert special_attributes is not None
     print_sym = {"name": symbol.name}
-    attrs = vars(symbol)
-    for key, val in attrs.items():
+    for key, val in symbol.attributes.items():
         if key in special_attributes and symbol.get_attribute(key) != False:
             print_sym[key] = val
     if hasattr(symbol, "multiplier"):
@@ -17,6 +30,8 @@ def json_ready_sym(symbol: object, special_attributes: list = None):
     return print_sym
 
 
+@book_event
+@timed_phase("events")
 def reveal_event(gamestate):
     """Display the initial board drawn from reelstrips."""
     board_client = []
@@ -44,6 +59,7 @@ def reveal_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@book_event
 def fs_trigger_event(
     gamestate,
     include_padding_index=True,
@@ -78,6 +94,7 @@ def fs_trigger_event(
     gamestate.book.add_event(event)
 
 
+@book_event
 def set_win_event(gamestate, winlevel_key: str = "standard"):
     """Used for updating cumulative win ticker (for a single outcome)."""
     if not gamestate.wincap_triggered:
@@ -95,6 +112,7 @@ def set_win_event(gamestate, winlevel_key: str = "standard"):
         gamestate.book.add_event(event)
 
 
+@book_event
 def set_total_event(gamestate):
     """Updates win amount for a betting round (including cumulative wins across multiple freespin wins)."""
     event = {
@@ -110,6 +128,7 @@ def set_total_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@book_event
 def set_tumble_event(gamestate):
     """Update banner indicating wins from successive tumbles."""
     event = {
@@ -120,6 +139,7 @@ def set_tumble_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@book_event
 def wincap_event(gamestate):
     """Emit to indicate end of spin actions."""
     event = {
@@ -135,6 +155,8 @@ def wincap_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@book_event
+@timed_phase("events")
 def win_info_event(gamestate, include_padding_index=True):
     """
     include_padding_index: starts winning-symbol positions at row=1, to account for top/bottom symbol inclusion in board
@@ -174,6 +196,7 @@ def win_info_event(gamestate, include_padding_index=True):
     gamestate.book.add_event(event)
 
 
+@book_event
 def update_tumble_win_event(gamestate):
     """Update a banner to record successive tumble wins."""
     event = {
@@ -184,6 +207,7 @@ def update_tumble_win_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@book_event
 def update_freespin_event(gamestate):
     """Update the current spin number and total freegame"""
     event = {
@@ -195,6 +219,7 @@ def update_freespin_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@book_event
 def freespin_end_event(gamestate, winlevel_key="endFeature"):
     """End of feature trigger."""
     event = {
@@ -206,6 +231,7 @@ def freespin_end_event(gamestate, winlevel_key="endFeature"):
     gamestate.book.add_event(event)
 
 
+@book_event
 def final_win_event(gamestate):
     """Assigns final payout multiplier for a simulation."""
     event = {
@@ -216,6 +242,7 @@ def final_win_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@book_event
 def update_global_mult_event(gamestate):
     """Increment global multiplier value."""
     event = {
@@ -227,6 +254,7 @@ def update_global_mult_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@book_event
 def tumble_board_event(gamestate):
     """States the symbol positions removed from a board during tumble, and which new symbols should take their place."""
     special_attributes = list(gamestate.config.special_symbols.keys())
@@ -255,6 +283,7 @@ def tumble_board_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@book_event
 def enter_bonus_event(gamestate) -> None:
     "Indicate feature game entry explicitly."
     event = {
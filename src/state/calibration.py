@@ -0,0 +1,159 @@
+"""Short calibration run choosing worker count and batch size from measured simulation cost and book memory."""
+
+import os
+import math
+import time
+import tracemalloc
+
+from src.wins.win_manager import WinManager
+from src.state.run_sims import get_betmode_num_sims
+from src.state.sim_plan import build_simulation_plan
+
+CALIBRATION_SIMS = 200
+# Chunks should run for at least this long so temp file writes and result transfer stay a small overhead
+TARGET_CHUNK_SECONDS = 5.0
+MIN_BATCH_SIZE = 100
+# Books are held as dicts in the library and serialized once more when a chunk is written
+LIBRARY_MEMORY_FACTOR = 2.0
+DEFAULT_RAM_FRACTION = 0.75
+DEFAULT_WORKER_BYTES = 256 * 2**20
+
+
+def get_total_ram() -> int:
+    """Physical memory in bytes, None where the platform does not report it."""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def get_process_bytes() -> int:
+    """Peak resident memory of this process, used as the baseline cost of one worker holding a gamestate."""
+    try:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except ImportError:
+        return DEFAULT_WORKER_BYTES
+
+
+def measure_betmode(gamestate: object, config: object, betmode: str, num_sims: int, calibration_sims: int) -> dict:
+    """
+    Run calibration_sims simulations spread evenly over the betmode's simulation plan, so the criteria mix
+    matches the full run, keeping books in the library as run_sims() does. The first half is timed, the
+    library growth of the second half is measured with tracemalloc. Nothing is written to disk.
+    """
+    num_sims, set_sim_amount = get_betmode_num_sims(config, betmode, num_sims)
+    plan = build_simulation_plan(gamestate, betmode, num_sims, set_sim_amount)
+    stride = max(1, num_sims // max(calibration_sims, 2))
+    sims = list(range(0, num_sims, stride))[:calibration_sims]
+    half = max(1, len(sims) // 2)
+
+    force_keys = {bm.get_name(): list(bm.get_force_keys()) for bm in config.bet_modes}
+    gamestate.win_manager = WinManager(
+        config.basegame_type, config.freegame_type, gamestate.get_betmode(betmode).get_wincap()
+    )
+    gamestate.library = {}
+    gamestate.recorded_events = {}
+    gamestate.betmode = betmode
+
+    def run(sim_ids):
+        for sim in sim_ids:
+            gamestate.criteria = plan.get_criteria(sim)
+            gamestate.run_spin(sim, plan.get_seed(sim))
+
+    start = time.perf_counter()
+    run(sims[:half])
+    seconds_per_sim = (time.perf_counter() - start) / half
+
+    traced_sims = sims[half:] or sims[:half]
+    gamestate.library = {}
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        run(traced_sims)
+        book_bytes = max(tracemalloc.get_traced_memory()[0] - before, 0) / len(traced_sims)
+    finally:
+        tracemalloc.stop()
+
+    gamestate.library = {}
+    gamestate.recorded_events = {}
+    for bm in config.bet_modes:
+        bm._force_keys = force_keys[bm.get_name()]
+    return {"sims": len(sims), "seconds_per_sim": seconds_per_sim, "book_bytes": book_bytes}
+
+
+def choose_threads_and_batch(
+    measurements: dict,
+    ram_budget: int,
+    max_threads: int,
+    worker_bytes: int,
+    target_chunk_seconds: float = TARGET_CHUNK_SECONDS,
+    min_batch_size: int = MIN_BATCH_SIZE,
+) -> dict:
+    """
+    Pick the largest worker count (up to max_threads) whose workers fit in ram_budget with a batch of
+    min_batch_size books each, then the batch size that makes the cheapest betmode's chunks last
+    target_chunk_seconds, capped by the memory left per worker for the largest books.
+    """
+    book_bytes = max(m["book_bytes"] for m in measurements.values()) * LIBRARY_MEMORY_FACTOR
+    seconds_per_sim = min(m["seconds_per_sim"] for m in measurements.values())
+    min_worker_bytes = worker_bytes + min_batch_size * book_bytes
+
+    threads = max(1, min(max_threads, int(ram_budget // min_worker_bytes)))
+    memory_batch = int((ram_budget / threads - worker_bytes) // max(book_bytes, 1))
+    time_batch = math.ceil(target_chunk_seconds / max(seconds_per_sim, 1e-9))
+    batch_size = max(min_batch_size, min(memory_batch, time_batch))
+    return {
+        "threads": threads,
+        "batch_size": batch_size,
+        "threads_limited_by": "cpu" if threads == max_threads else "memory",
+        "batch_limited_by": "memory" if memory_batch < time_batch else "chunk_time",
+        "ram_budget": ram_budget,
+        "worker_bytes": worker_bytes,
+        "peak_bytes": threads * (worker_bytes + batch_size * book_bytes),
+    }
+
+
+def calibrate(
+    gamestate: object,
+    config: object,
+    num_sim_args: dict,
+    ram_budget: int = None,
+    max_threads: int = None,
+    calibration_sims: int = CALIBRATION_SIMS,
+    target_chunk_seconds: float = TARGET_CHUNK_SECONDS,
+) -> dict:
+    """
+    Measure the per-simulation time and per-book memory of every betmode with simulations requested,
+    and choose the threads and batch_size to pass to create_books(). ram_budget defaults to
+    DEFAULT_RAM_FRACTION of physical memory, max_threads to every core. Prints and returns the decision.
+    """
+    max_threads = max_threads or os.cpu_count() or 1
+    if ram_budget is None:
+        total_ram = get_total_ram()
+        ram_budget = int(total_ram * DEFAULT_RAM_FRACTION) if total_ram else max_threads * 4 * DEFAULT_WORKER_BYTES
+    worker_bytes = get_process_bytes()
+
+    print("\nCalibrating threads and batch size...")
+    measurements = {}
+    for betmode, num_sims in num_sim_args.items():
+        if int(num_sims) > 0:
+            measurements[betmode] = measure_betmode(gamestate, config, betmode, int(num_sims), calibration_sims)
+            print(
+                f"  {betmode}: {round(1e3 * measurements[betmode]['seconds_per_sim'], 3)} ms/sim, "
+                f"{round(measurements[betmode]['book_bytes'] / 1024, 1)} KiB/book "
+                f"({measurements[betmode]['sims']} calibration sims)"
+            )
+    if not measurements:
+        return {"threads": max_threads, "batch_size": MIN_BATCH_SIZE, "measurements": measurements}
+
+    decision = choose_threads_and_batch(measurements, ram_budget, max_threads, worker_bytes, target_chunk_seconds)
+    decision["measurements"] = measurements
+    print(
+        f"  Using {decision['threads']} threads (limited by {decision['threads_limited_by']}) and batch size "
+        f"{decision['batch_size']} (limited by {decision['batch_limited_by']}), estimated peak "
+        f"{round(decision['peak_bytes'] / 2**30, 2)} GiB of a {round(ram_budget / 2**30, 2)} GiB budget",
+        flush=True,
+    )
+    return decision
@@ -0,0 +1,93 @@
+"""Per-criteria cache of simulation outputs, so only criteria whose configuration changed are simulated again."""
+
+import os
+import json
+import shutil
+import zstandard as zstd
+
+from src.config.fingerprint import get_criteria_fingerprint
+
+CACHE_INDEX_NAME = "index.json"
+
+
+def write_cache_records(records: list, path: str) -> None:
+    """Write the per-simulation cache records of one chunk as compressed JSON lines."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = "".join(json.dumps(record) + "\n" for record in records)
+    with open(path, "wb") as f:
+        f.write(zstd.ZstdCompressor().compress(data.encode("UTF-8")))
+
+
+def read_cache_records(path: str) -> list:
+    with open(path, "rb") as f:
+        data = zstd.ZstdDecompressor().decompress(f.read()).decode("UTF-8")
+    return [json.loads(line) for line in data.splitlines() if line]
+
+
+def get_cached_records(betmode_cache: dict, sim_start: int, sim_end: int) -> dict:
+    """Cache records of criteria with an unchanged fingerprint for simulations in [sim_start, sim_end), by sim."""
+    records = {}
+    valid_criteria = set(betmode_cache["criteria"])
+    for segment in betmode_cache["segments"]:
+        if segment["sim_end"] <= sim_start or segment["sim_start"] >= sim_end:
+            continue
+        for record in read_cache_records(os.path.join(betmode_cache["dir"], segment["file"])):
+            if sim_start <= record["sim"] < sim_end and record["criteria"] in valid_criteria:
+                records[record["sim"]] = record
+    return records
+
+
+def get_criteria_fingerprints(config: object, betmode: str) -> dict:
+    betmode_config = next(bm for bm in config.bet_modes if bm.get_name() == betmode)
+    return {
+        d.get_criteria(): get_criteria_fingerprint(config, betmode, d.get_criteria())
+        for d in betmode_config.get_distributions()
+    }
+
+
+def load_criteria_caches(gamestate: object, config: object, betmodes: list) -> dict:
+    """
+    Cached criteria usable by this run, as {betmode: {"dir", "criteria", "segments"}}.
+    A criteria is reused only if its fingerprint matches the one it was cached with and it is not
+    drawn from a seed bank (whose seed assignment depends on the simulation plan).
+    """
+    caches = {}
+    for betmode in betmodes:
+        cache_dir = gamestate.output_files.get_criteria_cache_dir(betmode)
+        index_path = os.path.join(cache_dir, CACHE_INDEX_NAME)
+        caches[betmode] = {"dir": cache_dir, "criteria": [], "segments": []}
+        if not os.path.isfile(index_path):
+            continue
+        with open(index_path, "r", encoding="UTF-8") as f:
+            index = json.load(f)
+        banked = gamestate.seed_banks.get(betmode, {})
+        fingerprints = get_criteria_fingerprints(config, betmode)
+        reused, changed = [], []
+        for criteria, fingerprint in fingerprints.items():
+            if index["fingerprints"].get(criteria) == fingerprint and criteria not in banked:
+                reused.append(criteria)
+            elif criteria in index["fingerprints"]:
+                changed.append(criteria)
+        caches[betmode].update({"criteria": reused, "segments": index["segments"]})
+        print(f"Criteria cache for {betmode}: reusing {reused}, re-simulating {changed}")
+    return caches
+
+
+def update_criteria_cache(gamestate: object, config: object, betmode: str) -> None:
+    """Replace a betmode's criteria cache with the per-chunk cache records written by this run."""
+    temp_dir = os.path.dirname(gamestate.output_files.get_temp_criteria_cache_name(betmode, 0, 0, 0))
+    if not os.path.isdir(temp_dir):
+        return
+    segments = []
+    for filename in os.listdir(temp_dir):
+        _, sim_start, sim_end = filename.split(".")[0].split("_")
+        segments.append({"file": filename, "sim_start": int(sim_start), "sim_end": int(sim_end)})
+    segments.sort(key=lambda segment: segment["sim_start"])
+
+    cache_dir = gamestate.output_files.get_criteria_cache_dir(betmode)
+    if os.path.isdir(cache_dir):
+        shutil.rmtree(cache_dir)
+    shutil.move(temp_dir, cache_dir)
+    index = {"betmode": betmode, "fingerprints": get_criteria_fingerprints(config, betmode), "segments": segments}
+    with open(os.path.join(cache_dir, CACHE_INDEX_NAME), "w", encoding="UTF-8") as f:
+        f.write(json.dumps(index, indent=4))
@@ -0,0 +1,243 @@
+"""Run several games concurrently, scheduling their simulation and post-processing stages on one worker budget."""
+
+import os
+import sys
+import math
+import time
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+POLL_SECONDS = 0.2
+POOL_STAGES = ("sims",)
+# run_conditions of a game's run.py turned off by the batch post_options
+POST_CONDITIONS = {
+    "optimization": "run_optimization",
+    "analysis": "run_analysis",
+    "format_checks": "run_format_checks",
+}
+
+
+class GameStage:
+    """
+    One stage of a game in a batch run, executed as its own games/<id>/run.py process.
+
+    "sims" runs the game's simulations on a pool sized by the scheduler, "post" its config generation,
+    optimization, analysis and format checks, each as set up in run.py (see apply_batch_stage()).
+    Each game needs a separate interpreter since every game directory provides top-level
+    modules with the same names (gamestate, game_config, ...).
+    """
+
+    def __init__(self, game_id: str, kind: str, modes: list = None):
+        self.game_id = game_id
+        self.kind = kind
+        self.modes = modes
+        self.threads = 0
+        self.process = None
+        self.log_path = None
+        self.start_time = None
+        self.end_time = None
+        self.returncode = None
+        self.result = {}
+
+    def uses_pool(self, optimization: bool = False) -> bool:
+        return self.kind in POOL_STAGES or (self.kind == "post" and optimization)
+
+    def get_seconds(self) -> float:
+        if self.start_time is None or self.end_time is None:
+            return 0.0
+        return self.end_time - self.start_time
+
+
+def pick_stages(
+    pending: list, free_workers: int, running: int, min_workers: int, max_workers: int, optimization: bool = False
+) -> list:
+    """
+    Stages to start now as (stage, workers), in pending order.
+    Stages that run a worker pool split the free workers evenly between the pool stages waiting, between
+    min_workers and max_workers each, and wait for min_workers to be free while other stages are running.
+    Other stages take a single worker.
+    """
+    starts = []
+    waiting_pool_stages = sum(stage.uses_pool(optimization) for stage in pending)
+    for stage in pending:
+        if free_workers <= 0:
+            break
+        if not stage.uses_pool(optimization):
+            starts.append((stage, 1))
+            free_workers -= 1
+            continue
+        workers = min(max_workers, math.ceil(free_workers / waiting_pool_stages))
+        if workers < min_workers and (running > 0 or starts):
+            break
+        starts.append((stage, workers))
+        free_workers -= workers
+        waiting_pool_stages -= 1
+    return starts
+
+
+def apply_batch_stage(num_sim_args: dict, run_conditions: dict, target_modes: list) -> tuple:
+    """
+    Restrict the settings of a game's run.py to the batch stage run_game_batch() started it for.
+    BATCH_STAGE=sims keeps only run_sims and BATCH_STAGE=post everything else, BATCH_SKIP turns off the
+    listed run conditions, and BATCH_MODES gives unlisted modes 0 simulations and drops them from target_modes.
+    Outside a batch run (no BATCH_STAGE) the settings are returned unchanged.
+    """
+    stage = os.environ.get("BATCH_STAGE")
+    if not stage:
+        return num_sim_args, run_conditions, target_modes
+    skipped = set(filter(None, os.environ.get("BATCH_SKIP", "").split(",")))
+    run_conditions = {
+        condition: enabled and (condition == "run_sims") == (stage == "sims") and condition not in skipped
+        for condition, enabled in run_conditions.items()
+    }
+    modes = set(filter(None, os.environ.get("BATCH_MODES", "").split(",")))
+    if modes:
+        num_sim_args = {mode: sims if mode in modes else 0 for mode, sims in num_sim_args.items()}
+        target_modes = [mode for mode in target_modes if mode in modes]
+    return num_sim_args, run_conditions, target_modes
+
+
+def get_stage_env(stage: GameStage, post_options: dict) -> dict:
+    """Environment of a stage's run.py: its thread count, the stage switch and the batch options."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT_DIR, env.get("PYTHONPATH")]))
+    env["SIM_THREADS"] = str(stage.threads)
+    env["SIM_RUST_THREADS"] = str(stage.threads)
+    env["BATCH_STAGE"] = stage.kind
+    env["BATCH_MODES"] = ",".join(stage.modes or [])
+    env["BATCH_SKIP"] = ",".join(
+        condition for option, condition in POST_CONDITIONS.items() if not post_options.get(option, True)
+    )
+    return env
+
+
+def start_stage(stage: GameStage, workers: int, post_options: dict):
+    """Launch a stage's run.py with its stdout and stderr in games/<id>/library/logs/<stage>.log."""
+    stage.threads = workers
+    game_dir = os.path.join(ROOT_DIR, "games", stage.game_id)
+    stage.log_path = os.path.join(game_dir, "library", "logs", f"{stage.kind}.log")
+    os.makedirs(os.path.dirname(stage.log_path), exist_ok=True)
+    with open(stage.log_path, "w", encoding="UTF-8") as log:
+        stage.process = subprocess.Popen(
+            [sys.executable, os.path.join(game_dir, "run.py")],
+            cwd=ROOT_DIR,
+            env=get_stage_env(stage, post_options),
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+    stage.start_time = time.time()
+    print(f"Started {stage.game_id} {stage.kind} on {workers} worker(s)", flush=True)
+
+
+def count_stage_sims(stage: GameStage) -> int:
+    """Simulations in the lookup tables a sims stage wrote (those modified since it started)."""
+    lookup_dir = os.path.join(ROOT_DIR, "games", stage.game_id, "library", "lookup_tables")
+    if not os.path.isdir(lookup_dir):
+        return 0
+    sims = 0
+    for filename in os.listdir(lookup_dir):
+        path = os.path.join(lookup_dir, filename)
+        if filename.startswith("lookUpTable_") and os.path.getmtime(path) >= stage.start_time:
+            with open(path, "r", encoding="UTF-8") as f:
+                sims += sum(1 for line in f if line.strip())
+    return sims
+
+
+def run_game_batch(
+    games: dict,
+    workers: int = None,
+    max_game_workers: int = None,
+    optimization: bool = True,
+    analysis: bool = True,
+    format_checks: bool = True,
+) -> dict:
+    """
+    Simulate and post-process every game in games ({game_id: bet modes, or None for all modes}) as its
+    run.py sets up (simulation counts, compression, post-processing), keeping at most workers processes
+    busy across all games. optimization, analysis and format_checks set to False skip those steps.
+    A game's post-processing is scheduled as soon as its simulations finish, and the workers its
+    pool releases go to the simulations of games still waiting. Returns the per-game report.
+    """
+    workers = workers or os.cpu_count() or 1
+    min_workers = max(1, workers // max(len(games), 1))
+    max_workers = max_game_workers or workers
+    post_options = {"optimization": optimization, "analysis": analysis, "format_checks": format_checks}
+    pending = [GameStage(game_id, "sims", modes) for game_id, modes in games.items()]
+    running, finished = [], []
+    free_workers = workers
+    batch_start = time.time()
+    while pending or running:
+        for stage, stage_workers in pick_stages(
+            pending, free_workers, len(running), min_workers, max_workers, optimization
+        ):
+            start_stage(stage, stage_workers, post_options)
+            pending.remove(stage)
+            running.append(stage)
+            free_workers -= stage_workers
+        time.sleep(POLL_SECONDS)
+        for stage in [s for s in running if s.process.poll() is not None]:
+            stage.end_time = time.time()
+            stage.returncode = stage.process.returncode
+            if stage.kind == "sims":
+                stage.result = {"sims": count_stage_sims(stage)}
+            running.remove(stage)
+            finished.append(stage)
+            free_workers += stage.threads
+            if stage.returncode != 0:
+                print(f"{stage.game_id} {stage.kind} failed, see {stage.log_path}", flush=True)
+            else:
+                print(f"Finished {stage.game_id} {stage.kind} in {round(stage.get_seconds(), 1)}s", flush=True)
+                if stage.kind == "sims":
+                    pending.insert(0, GameStage(stage.game_id, "post", stage.modes))
+
+    report = get_batch_report(finished, time.time() - batch_start, workers)
+    print(format_batch_report(report))
+    return report
+
+
+def get_batch_report(stages: list, wall_seconds: float, workers: int) -> dict:
+    """Per-game stage times, wall time and simulation throughput of a finished batch."""
+    games = {}
+    for stage in stages:
+        game = games.setdefault(
+            stage.game_id, {"ok": True, "sims": 0, "stages": {}, "start_time": stage.start_time, "end_time": 0.0}
+        )
+        game["ok"] = game["ok"] and stage.returncode == 0
+        game["stages"][stage.kind] = {
+            "workers": stage.threads,
+            "seconds": stage.get_seconds(),
+            "returncode": stage.returncode,
+            "log": stage.log_path,
+        }
+        if stage.kind == "sims":
+            game["sims"] = stage.result.get("sims", 0)
+            game["sims_per_second"] = game["sims"] / stage.get_seconds() if stage.get_seconds() > 0 else 0.0
+        game["start_time"] = min(game["start_time"], stage.start_time)
+        game["end_time"] = max(game["end_time"], stage.end_time)
+    for game in games.values():
+        game["wall_seconds"] = game.pop("end_time") - game.pop("start_time")
+    total_sims = sum(game["sims"] for game in games.values())
+    return {
+        "workers": workers,
+        "wall_seconds": wall_seconds,
+        "sims": total_sims,
+        "sims_per_second": total_sims / wall_seconds if wall_seconds > 0 else 0.0,
+        "games": games,
+    }
+
+
+def format_batch_report(report: dict) -> str:
+    lines = [
+        f"\nBatch of {len(report['games'])} games on {report['workers']} workers: "
+        f"{round(report['wall_seconds'], 1)}s, {report['sims']} sims, {round(report['sims_per_second'], 1)} sims/s"
+    ]
+    for game_id, game in report["games"].items():
+        stages = ", ".join(
+            f"{kind} {round(s['seconds'], 1)}s on {s['workers']} worker(s)" for kind, s in game["stages"].items()
+        )
+        status = "" if game["ok"] else "  FAILED"
+        lines.append(
+            f"  {game_id}: {round(game['wall_seconds'], 1)}s wall, {game['sims']} sims "
+            f"({round(game.get('sims_per_second', 0.0), 1)} sims/s); {stages}{status}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,161 @@
+"""Opt-in timers and counters for named phases of a spin, broken down by criteria."""
+
+import os
+import json
+import functools
+from time import perf_counter
+
+# Timers of the simulation chunk currently running in this process, None when instrumentation is off
+_active_timers = None
+
+
+class PhaseTimers:
+    """
+    Accumulate [calls, seconds] per phase and counter totals per criteria.
+
+    Framework calls decorated with timed_phase() add their time to the active timers, and
+    reset_book() marks the start of each spin attempt so time spent on attempts rejected by
+    check_repeat() is reported as the "rejected_repeats" phase.
+    """
+
+    def __init__(self):
+        self.criteria = {}
+        self.current = None
+        self.attempt_start = None
+
+    def set_criteria(self, criteria: str) -> None:
+        """Direct subsequent timings to a criteria."""
+        self.current = self.criteria.setdefault(criteria, {"sims": 0, "phases": {}, "counters": {}})
+        self.attempt_start = None
+
+    def add(self, phase: str, seconds: float, calls: int = 1) -> None:
+        """Add time spent in a phase."""
+        entry = self.current["phases"].get(phase)
+        if entry is None:
+            entry = self.current["phases"][phase] = [0, 0.0]
+        entry[0] += calls
+        entry[1] += seconds
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        """Increment a named counter."""
+        counters = self.current["counters"]
+        counters[counter] = counters.get(counter, 0) + amount
+
+    def start_attempt(self) -> None:
+        """Mark a new spin attempt, charging the previous attempt of the same sim as rejected."""
+        now = perf_counter()
+        if self.attempt_start is not None:
+            self.add("rejected_repeats", now - self.attempt_start)
+        self.attempt_start = now
+
+    def end_attempt(self, phase: str) -> None:
+        """Charge the running attempt to a phase and stop timing it."""
+        if self.attempt_start is not None:
+            self.add(phase, perf_counter() - self.attempt_start)
+            self.attempt_start = None
+
+    def finish_sim(self) -> None:
+        """Charge the final attempt of a sim as accepted."""
+        self.end_attempt("accepted_attempt")
+        self.current["sims"] += 1
+
+    def drain(self) -> dict:
+        """Return and clear the accumulated per-criteria timings."""
+        data, self.criteria, self.current = self.criteria, {}, None
+        return data
+
+
+def activate(timers: PhaseTimers) -> None:
+    """Route timed_phase() measurements in this process to timers (None disables them)."""
+    global _active_timers
+    _active_timers = timers
+
+
+def timed_phase(phase: str):
+    """
+    Decorator adding the run time of a function to the named phase while timers are active.
+    When disabled the wrapper only reads one module variable before calling the function.
+    Game code can decorate its own methods to register custom phases.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            timers = _active_timers
+            if timers is None:
+                return func(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timers.add(phase, perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def write_phase_timers(criteria_timers: dict, path: str) -> None:
+    """Write the timings of one chunk."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="UTF-8") as f:
+        f.write(json.dumps(criteria_timers))
+
+
+def merge_phase_timers(total: dict, chunk: dict) -> dict:
+    """Add the per-criteria timings of one chunk to a running total."""
+    for criteria, values in chunk.items():
+        entry = total.setdefault(criteria, {"sims": 0, "phases": {}, "counters": {}})
+        entry["sims"] += values["sims"]
+        for phase, (calls, seconds) in values["phases"].items():
+            phase_entry = entry["phases"].setdefault(phase, [0, 0.0])
+            phase_entry[0] += calls
+            phase_entry[1] += seconds
+        for counter, amount in values["counters"].items():
+            entry["counters"][counter] = entry["counters"].get(counter, 0) + amount
+    return total
+
+
+def format_phase_breakdown(betmode: str, criteria_timers: dict) -> dict:
+    """Per-criteria and betmode-total breakdown with calls, seconds, share of spin time and time per sim."""
+
+    def describe(values):
+        spin_seconds = sum(values["phases"].get(p, [0, 0.0])[1] for p in ("accepted_attempt", "rejected_repeats"))
+        return {
+            "sims": values["sims"],
+            "spin_seconds": spin_seconds,
+            "phases": {
+                phase: {
+                    "calls": calls,
+                    "seconds": seconds,
+                    "share_of_spin_time": seconds / spin_seconds if spin_seconds > 0 else None,
+                    "seconds_per_sim": seconds / values["sims"] if values["sims"] > 0 else None,
+                }
+                for phase, (calls, seconds) in sorted(values["phases"].items(), key=lambda item: -item[1][1])
+            },
+            "counters": values["counters"],
+        }
+
+    total = {}
+    for values in criteria_timers.values():
+        merge_phase_timers(total, {"total": values})
+    return {
+        "betmode": betmode,
+        "total": describe(total.get("total", {"sims": 0, "phases": {}, "counters": {}})),
+        "criteria": {criteria: describe(values) for criteria, values in criteria_timers.items()},
+    }
+
+
+def write_phase_breakdowns(output_files: object, betmodes: list) -> None:
+    """Combine the per-chunk phase timer files of each betmode into phase_timers_<betmode>.json."""
+    for betmode in betmodes:
+        chunk_dir = os.path.dirname(output_files.get_temp_phase_timer_name(betmode, 0))
+        if not os.path.isdir(chunk_dir):
+            continue
+        criteria_timers = {}
+        for filename in sorted(os.listdir(chunk_dir)):
+            with open(os.path.join(chunk_dir, filename), "r", encoding="UTF-8") as f:
+                merge_phase_timers(criteria_timers, json.load(f))
+        with open(output_files.get_phase_timer_name(betmode), "w", encoding="UTF-8") as f:
+            f.write(json.dumps(format_phase_breakdown(betmode, criteria_timers), indent=4))
+        print("Phase timings for", betmode, "written to", output_files.get_phase_timer_name(betmode))
@@ -0,0 +1,155 @@
+"""Per-worker simulation profiling with merged pstats, collapsed stacks and hot-function reports."""
+
+import io
+import os
+import sys
+import glob
+import pstats
+import cProfile
+import threading
+from collections import Counter
+
+SAMPLE_INTERVAL = 0.005
+PROFILE_TOP_N = 40
+
+
+class StackSampler:
+    """
+    Low-overhead sampling of the calling thread's Python stack from a background thread.
+    Samples are counted per collapsed stack ("outer;inner;leaf") for flamegraph tooling.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.counts = Counter()
+        self.stopped = threading.Event()
+        self.target_thread = None
+        self.root_frame = None
+        self.thread = None
+
+    def start(self) -> None:
+        """Sample the calling thread, recording only frames below the caller of start()."""
+        self.target_thread = threading.get_ident()
+        self.root_frame = sys._getframe(1)
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.target_thread)
+            stack = []
+            while frame is not None and frame is not self.root_frame:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+
+def run_profiled(func, kwargs: dict, profile_path: str, stacks_path: str, use_cprofile: bool = True):
+    """
+    Call func(**kwargs) under the stack sampler, and cProfile if use_cprofile,
+    writing raw cProfile stats and collapsed stacks.
+    """
+    profiler, sampler = cProfile.Profile() if use_cprofile else None, StackSampler()
+    os.makedirs(os.path.dirname(stacks_path), exist_ok=True)
+    sampler.start()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        return func(**kwargs)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+        sampler.stop()
+        write_collapsed_stacks(sampler.counts, stacks_path)
+
+
+def write_collapsed_stacks(counts: Counter, path: str) -> None:
+    """Write one "stack count" line per unique stack, most frequent first."""
+    with open(path, "w", encoding="UTF-8") as f:
+        for stack, count in counts.most_common():
+            f.write(f"{stack} {count}\n")
+
+
+def read_collapsed_stacks(path: str) -> Counter:
+    """Read a collapsed-stack file back into counts."""
+    counts = Counter()
+    with open(path, "r", encoding="UTF-8") as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if stack:
+                counts[stack] += int(count)
+    return counts
+
+
+def get_sampled_function_counts(stacks: Counter) -> tuple:
+    """Self (leaf) and inclusive sample counts per function from collapsed stacks."""
+    self_counts, inclusive_counts = Counter(), Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(";")
+        self_counts[frames[-1]] += count
+        for frame in set(frames):
+            inclusive_counts[frame] += count
+    return self_counts, inclusive_counts
+
+
+def merge_betmode_profiles(
+    profile_files: list,
+    stack_files: list,
+    prof_path: str,
+    stacks_path: str,
+    report_path: str,
+    top_n: int = PROFILE_TOP_N,
+) -> None:
+    """
+    Merge per-chunk profiles of one betmode into collapsed stacks, a top-N report and,
+    when cProfile was used, a single pstats file.
+    """
+    os.makedirs(os.path.dirname(stacks_path), exist_ok=True)
+    merged_stacks = Counter()
+    for path in stack_files:
+        merged_stacks.update(read_collapsed_stacks(path))
+    write_collapsed_stacks(merged_stacks, stacks_path)
+
+    total_samples = sum(merged_stacks.values())
+    report = io.StringIO()
+    report.write(f"Merged {len(stack_files)} chunk profiles, {total_samples} stack samples\n")
+    self_counts, inclusive_counts = get_sampled_function_counts(merged_stacks)
+    for title, counts in (("self", self_counts), ("inclusive", inclusive_counts)):
+        report.write(f"\nTop {top_n} functions by sampled {title} time\n")
+        for function, count in counts.most_common(top_n):
+            report.write(f"{100 * count / max(total_samples, 1):8.2f}%  {count:8d}  {function}\n")
+
+    if profile_files:
+        stats = pstats.Stats(*profile_files)
+        stats.dump_stats(prof_path)
+        stats.files = []  # Do not list every chunk file in the report header
+        stats.stream = report
+        for sort_key in ("tottime", "cumulative"):
+            report.write(f"\nTop {top_n} functions by cProfile {sort_key}\n")
+            stats.sort_stats(sort_key).print_stats(top_n)
+    with open(report_path, "w", encoding="UTF-8") as f:
+        f.write(report.getvalue())
+
+
+def merge_profiles(output_files: object, betmodes: list, top_n: int = PROFILE_TOP_N) -> None:
+    """Merge the chunk profiles of every profiled betmode and print where the outputs were written."""
+    for betmode in betmodes:
+        stack_files = sorted(glob.glob(output_files.get_temp_profile_name(betmode, "*", "stacks")))
+        if not stack_files:
+            continue
+        merge_betmode_profiles(
+            sorted(glob.glob(output_files.get_temp_profile_name(betmode, "*", "prof"))),
+            stack_files,
+            output_files.get_profile_name(betmode, "prof"),
+            output_files.get_profile_name(betmode, "collapsed"),
+            output_files.get_profile_name(betmode, "txt"),
+            top_n,
+        )
+        print("Profile for", betmode, "written to", output_files.get_profile_name(betmode, "*"))
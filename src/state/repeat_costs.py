@@ -0,0 +1,178 @@
+"""Attempts and time spent per accepted simulation, used to find criteria dominated by rejected repeats."""
+
+import os
+import json
+import math
+
+PERCENTILES = (50, 90, 99)
+DOMINANT_TIME_SHARE = 0.1
+HISTOGRAM_WIDTH = 40
+
+
+class RepeatCostRecorder:
+    """
+    Per-criteria counts of spin attempts and seconds for each accepted simulation.
+
+    Attempts are kept as an exact {attempts: sims} histogram, simulation times in power-of-two
+    microsecond buckets, so chunk results stay small and merge by addition.
+    """
+
+    def __init__(self):
+        self.criteria = {}
+
+    def record(self, criteria: str, attempts: int, seconds: float) -> None:
+        """Count one accepted simulation that took attempts spins and seconds of wall time."""
+        entry = self.criteria.get(criteria)
+        if entry is None:
+            entry = self.criteria[criteria] = new_repeat_cost_entry()
+        attempts = max(attempts, 1)
+        entry["sims"] += 1
+        entry["attempts"] += attempts
+        entry["seconds"] += seconds
+        attempt_key = str(attempts)
+        entry["attempt_histogram"][attempt_key] = entry["attempt_histogram"].get(attempt_key, 0) + 1
+        time_key = str(get_time_bucket(seconds))
+        entry["time_histogram"][time_key] = entry["time_histogram"].get(time_key, 0) + 1
+
+    def drain(self) -> dict:
+        """Return and clear the accumulated per-criteria costs."""
+        data, self.criteria = self.criteria, {}
+        return data
+
+
+def new_repeat_cost_entry() -> dict:
+    return {"sims": 0, "attempts": 0, "seconds": 0.0, "attempt_histogram": {}, "time_histogram": {}}
+
+
+def get_time_bucket(seconds: float) -> int:
+    """Power-of-two microsecond bucket, bucket b holds times in [2^(b-1), 2^b) microseconds."""
+    return max(int(seconds * 1e6), 0).bit_length()
+
+
+def merge_repeat_costs(total: dict, chunk: dict) -> dict:
+    """Add the per-criteria costs of one chunk to a running total."""
+    for criteria, values in chunk.items():
+        entry = total.setdefault(criteria, new_repeat_cost_entry())
+        for key in ("sims", "attempts", "seconds"):
+            entry[key] += values[key]
+        for histogram in ("attempt_histogram", "time_histogram"):
+            for bucket, count in values[histogram].items():
+                entry[histogram][bucket] = entry[histogram].get(bucket, 0) + count
+    return total
+
+
+def get_histogram_percentile(histogram: dict, percentile: float) -> int:
+    """Smallest bucket key at or below which the given percentage of the counts fall."""
+    buckets = sorted((int(bucket), count) for bucket, count in histogram.items())
+    target = math.ceil(sum(count for _, count in buckets) * percentile / 100)
+    seen = 0
+    for bucket, count in buckets:
+        seen += count
+        if seen >= max(target, 1):
+            return bucket
+    return buckets[-1][0] if buckets else 0
+
+
+def get_attempt_buckets(attempt_histogram: dict) -> dict:
+    """Group an exact attempt histogram into 1, 2, 3-4, 5-8, ... ranges for display."""
+    grouped = {}
+    for attempts, count in attempt_histogram.items():
+        upper = 1 << (int(attempts) - 1).bit_length()
+        grouped[upper] = grouped.get(upper, 0) + count
+    return {(str(upper) if upper <= 2 else f"{upper // 2 + 1}-{upper}"): grouped[upper] for upper in sorted(grouped)}
+
+
+def get_repeat_cost_report(betmode: str, criteria_costs: dict, dominant_share: float = DOMINANT_TIME_SHARE) -> dict:
+    """
+    Attempts-per-sim percentiles, time per attempt and share of betmode time for each criteria.
+    A criteria is flagged when the time its rejected attempts take is at least dominant_share of
+    all simulation time in the betmode, i.e. where constructive sampling would save the most.
+    """
+    total_seconds = sum(values["seconds"] for values in criteria_costs.values())
+    total_sims = sum(values["sims"] for values in criteria_costs.values())
+    criteria_report = {}
+    for criteria, values in criteria_costs.items():
+        sims, attempts, seconds = values["sims"], values["attempts"], values["seconds"]
+        seconds_per_attempt = seconds / attempts if attempts > 0 else 0.0
+        rejected_seconds = seconds_per_attempt * (attempts - sims)
+        criteria_report[criteria] = {
+            "sims": sims,
+            "attempts": attempts,
+            "mean_attempts": attempts / sims if sims > 0 else 0.0,
+            "attempt_percentiles": {
+                f"p{p}": get_histogram_percentile(values["attempt_histogram"], p) for p in PERCENTILES
+            },
+            "max_attempts": max((int(a) for a in values["attempt_histogram"]), default=0),
+            "seconds": seconds,
+            "seconds_per_sim": seconds / sims if sims > 0 else 0.0,
+            "seconds_per_attempt": seconds_per_attempt,
+            "sim_time_percentiles": {
+                f"p{p}": 2 ** get_histogram_percentile(values["time_histogram"], p) / 1e6 for p in PERCENTILES
+            },
+            "rejected_seconds": rejected_seconds,
+            "share_of_sims": sims / total_sims if total_sims > 0 else 0.0,
+            "share_of_time": seconds / total_seconds if total_seconds > 0 else 0.0,
+            "rejected_share_of_time": rejected_seconds / total_seconds if total_seconds > 0 else 0.0,
+            "attempt_histogram": get_attempt_buckets(values["attempt_histogram"]),
+        }
+    dominant = sorted(
+        (c for c, r in criteria_report.items() if r["rejected_share_of_time"] >= dominant_share),
+        key=lambda c: -criteria_report[c]["rejected_seconds"],
+    )
+    return {
+        "betmode": betmode,
+        "sims": total_sims,
+        "seconds": total_seconds,
+        "dominant_criteria": dominant,
+        "criteria": dict(sorted(criteria_report.items(), key=lambda item: -item[1]["seconds"])),
+    }
+
+
+def format_repeat_cost_report(report: dict, width: int = HISTOGRAM_WIDTH) -> str:
+    """Readable summary of a repeat cost report with an attempts histogram per criteria."""
+    lines = [f"Repeat costs for {report['betmode']}: {report['sims']} sims, {round(report['seconds'], 3)}s"]
+    for criteria, r in report["criteria"].items():
+        flag = "  <-- dominated by rejected repeats" if criteria in report["dominant_criteria"] else ""
+        percentiles = ", ".join(f"{key} {value}" for key, value in r["attempt_percentiles"].items())
+        lines.append(
+            f"\n{criteria}: {r['sims']} sims ({round(100 * r['share_of_sims'], 1)}% of sims, "
+            f"{round(100 * r['share_of_time'], 1)}% of time){flag}"
+        )
+        lines.append(
+            f"  attempts/sim mean {round(r['mean_attempts'], 2)}, {percentiles}, max {r['max_attempts']}; "
+            f"{round(1e3 * r['seconds_per_attempt'], 3)} ms/attempt, "
+            f"{round(r['rejected_seconds'], 3)}s in rejected attempts"
+        )
+        largest = max(r["attempt_histogram"].values(), default=1)
+        for bucket, count in r["attempt_histogram"].items():
+            bar = "#" * max(1, round(width * count / largest))
+            lines.append(f"  {bucket:>11} | {bar} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def write_repeat_costs(criteria_costs: dict, path: str) -> None:
+    """Write the costs of one chunk."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="UTF-8") as f:
+        f.write(json.dumps(criteria_costs))
+
+
+def write_repeat_cost_reports(output_files: object, betmodes: list) -> None:
+    """Combine the per-chunk repeat costs of each betmode into repeat_costs_<betmode>.json and .txt."""
+    for betmode in betmodes:
+        chunk_dir = os.path.dirname(output_files.get_temp_repeat_cost_name(betmode, 0))
+        if not os.path.isdir(chunk_dir):
+            continue
+        criteria_costs = {}
+        for filename in sorted(os.listdir(chunk_dir)):
+            with open(os.path.join(chunk_dir, filename), "r", encoding="UTF-8") as f:
+                merge_repeat_costs(criteria_costs, json.load(f))
+        report = get_repeat_cost_report(betmode, criteria_costs)
+        with open(output_files.get_repeat_cost_name(betmode, "json"), "w", encoding="UTF-8") as f:
+            f.write(json.dumps(report, indent=4))
+        summary = format_repeat_cost_report(report)
+        with open(output_files.get_repeat_cost_name(betmode, "txt"), "w", encoding="UTF-8") as f:
+            f.write(summary)
+        if report["dominant_criteria"]:
+            print(f"Criteria dominated by rejected repeats in {betmode}: {report['dominant_criteria']}")
+        print("Repeat costs for", betmode, "written to", output_files.get_repeat_cost_name(betmode, "*"))
@@ -0,0 +1,134 @@
+"""Random number generators owned by the gamestate, which framework and game code draw from through gamestate.rng."""
+
+import random
+
+import numpy as np
+
+RNG_MODES = ("mersenne", "philox")
+# Doubles and 64-bit words drawn from NumPy per refill, so single draws avoid a NumPy call each
+PHILOX_BUFFER_SIZE = 256
+WORD_MASK = 2**64 - 1
+
+
+class MersenneTwisterRNG:
+    """
+    The process-wide Mersenne Twister of the random module, reseeded by reset_seed() with sim + 1.
+    Reproduces the draw sequence of books produced before gamestate-owned generators, including draws
+    made directly through the random module by game code. Holds no state itself, so it pickles to workers.
+    """
+
+    seed = staticmethod(random.seed)
+    getstate = staticmethod(random.getstate)
+    setstate = staticmethod(random.setstate)
+    uniform = staticmethod(random.uniform)
+    randrange = staticmethod(random.randrange)
+    randint = staticmethod(random.randint)
+    choice = staticmethod(random.choice)
+    choices = staticmethod(random.choices)
+    shuffle = staticmethod(random.shuffle)
+    sample = staticmethod(random.sample)
+    getrandbits = staticmethod(random.getrandbits)
+    random = staticmethod(random.random)
+
+    def seed_attempt(self, sim: int, simulation_seed: int, attempt: int) -> None:
+        """Attempts continue the sequence seeded by reset_seed()."""
+
+    @staticmethod
+    def reel_stops(reel_lengths: list) -> list:
+        """One stop per reel, drawn with randrange() in reel order as boards have always been drawn."""
+        return [random.randrange(0, length) for length in reel_lengths]
+
+
+class PhiloxRNG(random.Random):
+    """
+    Counter-based Philox stream per (sim, criteria seed, attempt), exposing the random.Random interface.
+
+    Every spin attempt gets an independent stream keyed by its sim id, criteria seed and attempt number,
+    so any attempt can be replayed without the draws before it, and gamestates in different threads do
+    not share state. Draws are served from buffered NumPy blocks.
+    """
+
+    def __init__(self, seed: int = 0):
+        self.generator = None
+        self.doubles = []
+        self.words = []
+        super().__init__(seed)
+
+    def seed(self, a=None, version: int = 2) -> None:
+        """Start the stream keyed by an integer or a tuple of non-negative integers."""
+        entropy = list(a) if isinstance(a, (tuple, list)) else [0 if a is None else int(a)]
+        self.generator = np.random.Generator(np.random.Philox(np.random.SeedSequence([abs(int(x)) for x in entropy])))
+        self.doubles = []
+        self.words = []
+
+    def seed_attempt(self, sim: int, simulation_seed: int, attempt: int) -> None:
+        self.seed((sim, 0 if simulation_seed is None else simulation_seed, attempt))
+
+    def getstate(self) -> tuple:
+        return (self.generator.bit_generator.state, list(self.doubles), list(self.words))
+
+    def setstate(self, state: tuple) -> None:
+        bit_generator_state, doubles, words = state
+        self.generator = np.random.Generator(np.random.Philox())
+        self.generator.bit_generator.state = bit_generator_state
+        self.doubles = list(doubles)
+        self.words = list(words)
+
+    def random(self) -> float:
+        if not self.doubles:
+            self.doubles = self.generator.random(PHILOX_BUFFER_SIZE).tolist()
+            self.doubles.reverse()
+        return self.doubles.pop()
+
+    def next_word(self) -> int:
+        """Next 64-bit word from the buffered block, refilled with one NumPy call."""
+        if not self.words:
+            self.words = self.generator.integers(0, 2**64, PHILOX_BUFFER_SIZE, dtype=np.uint64).tolist()
+        return self.words.pop()
+
+    def getrandbits(self, k: int) -> int:
+        bits = 0
+        for shift in range(0, k, 64):
+            bits |= self.next_word() << shift
+        return bits & ((1 << k) - 1)
+
+    def _randbelow(self, n: int) -> int:
+        """
+        Unbiased integer in [0, n) from one buffered word (Lemire's multiply-shift with rejection),
+        used by randrange(), randint(), choice() and shuffle().
+        """
+        if n > WORD_MASK:
+            return super()._randbelow_with_getrandbits(n)
+        product = self.next_word() * n
+        if product & WORD_MASK < n:
+            product = self.reject_low_product(product, n)
+        return product >> 64
+
+    def reject_low_product(self, product: int, n: int) -> int:
+        """Redraw while the low word falls in the biased range, only reachable with probability below n / 2**64."""
+        threshold = (WORD_MASK + 1 - n) % n
+        while product & WORD_MASK < threshold:
+            product = self.next_word() * n
+        return product
+
+    def reel_stops(self, reel_lengths: list) -> list:
+        """One stop per reel from the buffered block, without a randrange() call per reel."""
+        if len(self.words) < len(reel_lengths):
+            self.words = self.generator.integers(0, 2**64, PHILOX_BUFFER_SIZE, dtype=np.uint64).tolist() + self.words
+        words = self.words
+        stops = []
+        for length in reel_lengths:
+            product = words.pop() * length
+            if product & WORD_MASK < length:
+                product = self.reject_low_product(product, length)
+                words = self.words
+            stops.append(product >> 64)
+        return stops
+
+
+def create_rng(mode: str) -> object:
+    """Generator for Config.rng_mode: "mersenne" (default, reproduces existing books) or "philox"."""
+    assert mode in RNG_MODES, f"rng_mode must be one of {RNG_MODES}"
+    if mode == "philox":
+        return PhiloxRNG()
+    return MersenneTwisterRNG()
@@ -0,0 +1,155 @@
+"""Estimate betmode RTP from run_spin() directly, without books, events, force records or output files."""
+
+import os
+import time
+from bisect import bisect_right
+
+from src.state import run_sims
+from src.state.run_sims import create_worker_pool, get_betmode_num_sims
+from src.state.sim_plan import build_simulation_plan, get_sim_chunks
+
+# Upper edges (in bet multiples) of the payout histogram buckets, zero payouts have their own bucket
+PAYOUT_BUCKET_EDGES = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+ESTIMATE_BATCH_SIZE = 10000
+
+
+def get_payout_bucket(payout: float) -> int:
+    """Histogram bucket of a payout: 0 for no win, then one bucket per [edge, next edge) range."""
+    if payout <= 0:
+        return 0
+    return bisect_right(PAYOUT_BUCKET_EDGES, payout) + 1
+
+
+def get_payout_bucket_label(bucket: int) -> str:
+    if bucket == 0:
+        return "0"
+    lower = PAYOUT_BUCKET_EDGES[bucket - 2] if bucket > 1 else 0
+    if bucket - 1 >= len(PAYOUT_BUCKET_EDGES):
+        return f"{lower}+"
+    return f"{lower}-{PAYOUT_BUCKET_EDGES[bucket - 1]}"
+
+
+def new_rtp_entry() -> dict:
+    return {"sims": 0, "payout": 0.0, "base": 0.0, "free": 0.0, "hits": 0, "histogram": {}}
+
+
+def record_payout(stats: dict, criteria: str, payout: float, base_payout: float, free_payout: float) -> None:
+    """Count one simulation's final, basegame and freegame payouts (in bet multiples) for a criteria."""
+    entry = stats.get(criteria)
+    if entry is None:
+        entry = stats[criteria] = new_rtp_entry()
+    entry["sims"] += 1
+    entry["payout"] += payout
+    entry["base"] += base_payout
+    entry["free"] += free_payout
+    entry["hits"] += payout > 0
+    bucket = get_payout_bucket(payout)
+    entry["histogram"][bucket] = entry["histogram"].get(bucket, 0) + 1
+
+
+def merge_rtp_stats(total: dict, chunk: dict) -> dict:
+    """Add the per-criteria payout sums of one chunk to a running total."""
+    for criteria, values in chunk.items():
+        entry = total.setdefault(criteria, new_rtp_entry())
+        for key in ("sims", "payout", "base", "free", "hits"):
+            entry[key] += values[key]
+        for bucket, count in values["histogram"].items():
+            entry["histogram"][bucket] = entry["histogram"].get(bucket, 0) + count
+    return total
+
+
+def get_rtp_report(betmode: str, cost: float, criteria_stats: dict) -> dict:
+    """
+    RTP, basegame/freegame RTP split, hit rate and payout histogram of a betmode and each of its criteria.
+    The betmode figures are over the simulated criteria mix, i.e. before optimization reweights the books.
+    """
+
+    def describe(values):
+        sims = max(values["sims"], 1)
+        return {
+            "sims": values["sims"],
+            "rtp": values["payout"] / (sims * cost),
+            "base_rtp": values["base"] / (sims * cost),
+            "free_rtp": values["free"] / (sims * cost),
+            "hit_rate": values["hits"] / sims,
+            "histogram": {
+                get_payout_bucket_label(bucket): values["histogram"][bucket] for bucket in sorted(values["histogram"])
+            },
+        }
+
+    total = {}
+    for values in criteria_stats.values():
+        merge_rtp_stats(total, {"total": values})
+    report = {"betmode": betmode, "cost": cost}
+    report.update(describe(total.get("total", new_rtp_entry())))
+    report["criteria"] = {criteria: describe(values) for criteria, values in sorted(criteria_stats.items())}
+    return report
+
+
+def format_rtp_report(report: dict) -> str:
+    """Readable summary of an RTP estimate report."""
+    lines = [
+        f"{report['betmode']}: {report['sims']} sims, RTP {round(report['rtp'], 4)} "
+        f"[baseGame: {round(report['base_rtp'], 4)}, freeGame: {round(report['free_rtp'], 4)}], "
+        f"hit rate {round(report['hit_rate'], 4)}"
+    ]
+    for criteria, r in report["criteria"].items():
+        lines.append(
+            f"  {criteria}: {r['sims']} sims, RTP {round(r['rtp'], 4)} "
+            f"[baseGame: {round(r['base_rtp'], 4)}, freeGame: {round(r['free_rtp'], 4)}], "
+            f"hit rate {round(r['hit_rate'], 4)}"
+        )
+    lines.append("  payouts: " + ", ".join(f"{bucket}: {count}" for bucket, count in report["histogram"].items()))
+    return "\n".join(lines)
+
+
+def _run_estimate_batch(task: dict) -> dict:
+    """Pool entry point: estimate payouts for one range of simulations on the worker's gamestate."""
+    return run_sims._worker_gamestate.estimate_sims(**task)
+
+
+def estimate_rtp(
+    gamestate: object,
+    config: object,
+    num_sim_args: dict,
+    threads: int = None,
+    batch_size: int = ESTIMATE_BATCH_SIZE,
+    verbose: bool = True,
+) -> dict:
+    """
+    Run the simulations create_books() would run for each betmode, returning {betmode: report} (see
+    get_rtp_report()) instead of writing any files. Simulation numbers, criteria and seeds follow the
+    same simulation plan, so payouts match the books of a full run, but spins run with events,
+    force records and the library turned off (see GeneralGameState.estimate_sims).
+    threads defaults to every available core.
+    """
+    threads = threads or os.cpu_count() or 1
+    reports = {}
+    pool = create_worker_pool(gamestate, threads) if threads > 1 else None
+    try:
+        for betmode, requested_sims in num_sim_args.items():
+            if int(requested_sims) <= 0:
+                continue
+            start_time = time.time()
+            num_sims, set_sim_amount = get_betmode_num_sims(config, betmode, int(requested_sims))
+            plan = build_simulation_plan(gamestate, betmode, num_sims, set_sim_amount)
+            tasks = [
+                {"betmode": betmode, "sims": list(plan.iter_sims(sim_start, sim_end))}
+                for sim_start, sim_end in get_sim_chunks(num_sims, threads, batch_size)
+            ]
+            criteria_stats = {}
+            if pool is not None:
+                results = pool.imap_unordered(_run_estimate_batch, tasks)
+            else:
+                results = (gamestate.estimate_sims(**task) for task in tasks)
+            for chunk_stats in results:
+                merge_rtp_stats(criteria_stats, chunk_stats)
+            reports[betmode] = get_rtp_report(betmode, gamestate.get_betmode(betmode).get_cost(), criteria_stats)
+            if verbose:
+                print(format_rtp_report(reports[betmode]))
+                print(f"Estimated {betmode} in {round(time.time() - start_time, 2)}s", flush=True)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return reports
@@ -0,0 +1,111 @@
+"""Track completed simulation chunks so interrupted runs can be resumed."""
+
+import os
+import json
+
+from src.write_data.write_data import get_sha_256
+
+
+class RunManifest:
+    """
+    Append-only JSONL record of simulation progress, stored alongside the temporary chunk files.
+
+    The first line holds the config fingerprint, every following line records a betmode layout,
+    a completed chunk (sha256 of its temporary files and its batch summary) or a finished output merge.
+    A manifest is only reused when the config fingerprint matches, and a betmode's chunks are only
+    reused when its number of simulations and chunk layout are unchanged.
+    """
+
+    def __init__(self, path: str, fingerprint: str):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.betmodes = {}
+
+    @classmethod
+    def load_or_create(cls, path: str, fingerprint: str, resume: bool = False) -> "RunManifest":
+        """Load an existing manifest when resuming with a matching fingerprint, else start a new one."""
+        manifest = cls(path, fingerprint)
+        if resume and os.path.isfile(path):
+            with open(path, "r", encoding="UTF-8") as f:
+                records = []
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        break  # Partially written final line from an interrupted run
+            if records and records[0].get("fingerprint") == fingerprint:
+                for record in records[1:]:
+                    manifest.apply(record)
+                print("Resuming from run manifest:", manifest.summary())
+                return manifest
+            if records:
+                print("Config fingerprint changed since the previous run, starting a new run.")
+
+        parent_dir = os.path.dirname(path)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        with open(path, "w", encoding="UTF-8") as f:
+            f.write(json.dumps({"fingerprint": fingerprint}) + "\n")
+        return manifest
+
+    def apply(self, record: dict) -> None:
+        """Update in-memory progress from a single manifest record."""
+        betmode = record["betmode"]
+        if record["event"] == "layout":
+            self.betmodes[betmode] = {"layout": record["layout"], "chunks": {}, "merged": None}
+        elif record["event"] == "chunk":
+            self.betmodes[betmode]["chunks"][record["chunk_index"]] = record
+            self.betmodes[betmode]["merged"] = None
+        elif record["event"] == "merged":
+            self.betmodes[betmode]["merged"] = record["files"]
+
+    def append(self, record: dict) -> None:
+        """Apply a record and append it to the manifest file."""
+        self.apply(record)
+        with open(self.path, "a", encoding="UTF-8") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+
+    def summary(self) -> dict:
+        """Number of completed chunks per betmode."""
+        return {betmode: len(entry["chunks"]) for betmode, entry in self.betmodes.items()}
+
+    def start_betmode(self, betmode: str, num_sims: int, sim_chunks: list) -> None:
+        """Register a betmode, discarding previous progress if the chunk layout has changed."""
+        layout = {"num_sims": num_sims, "sim_chunks": [list(chunk) for chunk in sim_chunks]}
+        entry = self.betmodes.get(betmode)
+        if entry is None or entry["layout"] != layout:
+            self.append({"event": "layout", "betmode": betmode, "layout": layout})
+
+    def get_completed_chunks(self, betmode: str) -> dict:
+        """Return {chunk_index: result} for recorded chunks whose files are still present and unchanged."""
+        completed = {}
+        for chunk_index, record in self.betmodes.get(betmode, {}).get("chunks", {}).items():
+            if all(os.path.isfile(path) and get_sha_256(path) == sha for path, sha in record["files"].items()):
+                completed[chunk_index] = record["result"]
+        return completed
+
+    def record_chunk(self, betmode: str, chunk_index: int, result: dict, file_paths: list) -> None:
+        """Store a finished chunk with its file hashes."""
+        self.append(
+            {
+                "event": "chunk",
+                "betmode": betmode,
+                "chunk_index": chunk_index,
+                "files": {path: get_sha_256(path) for path in file_paths},
+                "result": result,
+            }
+        )
+
+    def mark_merged(self, betmode: str, file_paths: list) -> None:
+        """Record that the betmode output files were written, with their hashes."""
+        self.append(
+            {"event": "merged", "betmode": betmode, "files": {path: get_sha_256(path) for path in file_paths}}
+        )
+
+    def is_merged(self, betmode: str) -> bool:
+        """True if the betmode output merge finished and its files are unchanged."""
+        merged = self.betmodes.get(betmode, {}).get("merged")
+        if not merged:
+            return False
+        return all(os.path.isfile(path) and get_sha_256(path) == sha for path, sha in merged.items())
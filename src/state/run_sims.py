@@ -1,16 +1,41 @@
 import time
+import json
+from typing import Union
 import math
-import random
-import hashlib
-from multiprocessing import Process, Manager
-import cProfile
+from multiprocessing import Pool, Queue
 from warnings import warn
 import shutil
-import asyncio
-from typing import Dict
 
+from src.state.sim_plan import (
+    SimulationPlan,
+    build_simulation_plan,
+    get_sim_chunks,
+    get_sim_splits,
+    assign_sim_criteria,
+    string_to_int,
+)
+from src.state.run_manifest import RunManifest
+from src.state.telemetry import WorkerTelemetry, TelemetryCollector
+from src.state.profiling import run_profiled, merge_profiles
+from src.state.phase_timers import write_phase_breakdowns
+from src.state.repeat_costs import write_repeat_cost_reports
+from src.state.seed_bank import load_seed_banks
+from src.state.criteria_cache import load_criteria_caches, update_criteria_cache
+from src.state.sim_precision import (
+    SimulationPrecision,
+    merge_criteria_stats,
+    get_criteria_precision,
+    print_precision_report,
+)
+from src.config.fingerprint import get_config_fingerprint
+from src.calculations.statistics import set_outcome_sampler
 from src.write_data.write_data import output_lookup_and_force_files
 
+# Relative per-simulation cost of a criteria, used to order concurrent betmode scheduling
+FORCE_FREEGAME_COST_FACTOR = 10.0
+WIN_CRITERIA_COST_FACTOR = 5.0
+FORCE_WINCAP_COST_FACTOR = 50.0
+
 
 def create_books(
     gamestate: object,
@@ -19,39 +44,197 @@ def create_books(
     batch_size: int,
     threads: int,
     compress: bool,
-    profiling: bool,
+    profiling: Union[bool, str],
+    concurrent_modes: bool = False,
+    resume: bool = False,
+    precision: SimulationPrecision = None,
+    telemetry: bool = False,
+    phase_timers: bool = False,
+    repeat_costs: bool = False,
+    two_phase_spins: bool = False,
+    seed_bank: bool = False,
+    criteria_cache: bool = False,
 ):
-    """Main run-function for simulating game outcomes and outputting all files."""
+    """
+    Main run-function for simulating game outcomes and outputting all files.
+    With concurrent_modes, all betmodes share the worker pool at once and each betmode's
+    output merge runs while the other betmodes are still simulating.
+    With resume, chunks recorded in the run manifest of an interrupted run (with an unchanged
+    config fingerprint) are not simulated again.
+    With precision (a SimulationPrecision, or a dict of them by betmode name), each betmode with a
+    non-zero num_sim_args entry runs until its per-criteria confidence intervals meet the tolerances,
+    instead of a fixed number of simulations.
+    With profiling, every chunk runs under cProfile and a stack sampler on whichever worker picks it up,
+    per-betmode merged pstats, collapsed stacks and a top-N report are written to library/profiles.
+    profiling="sample" uses only the low-overhead sampler (no pstats file).
+    With telemetry, workers publish throughput, attempt and phase metrics which are aggregated into
+    library/metrics/sim_metrics.jsonl and a Prometheus textfile (sim_metrics.prom) with a run ETA.
+    With phase_timers (or after gamestate.enable_phase_timers()), time spent in board draws, win evaluation,
+    events, imprint_wins, rejected repeats and any game-registered phases is written per criteria to
+    library/lookup_tables/phase_timers_<betmode>.json.
+    With repeat_costs, spin attempts and wall time of every accepted simulation are summarised per criteria
+    (percentiles, histograms, time per attempt) in library/lookup_tables/repeat_costs_<betmode>.json and .txt,
+    flagging criteria whose rejected attempts dominate simulation time.
+    With two_phase_spins, rejected attempts run without building events and only the accepted attempt
+    is replayed with events on (see GeneralGameState.run_two_phase_spin), producing identical books.
+    With seed_bank, the first attempt of each simulation of a criteria with a mined seed bank
+    (see src/state/seed_mining.py) is seeded from the bank instead of searching, banks mined with a
+    different criteria config are discarded.
+    With criteria_cache, every simulation's book, force records and wins are cached per betmode in
+    library/criteria_cache, and simulations of criteria whose fingerprint (conditions, reels, paytable,
+    game code) is unchanged are read from the cache instead of simulated, keeping their book ids.
+    """
     for key, ns in num_sim_args.items():
-        if all([ns > 0, ns > batch_size * batch_size]):
-            assert (
-                ns % (threads * batch_size) == 0
-            ), "mode-sims/(batch * threads) must be divisible with no remainder"
         num_sim_args[key] = int(ns)
 
     if not compress and sum(num_sim_args.values()) > 1e4:
         warn("Generating large number of uncompressed books!")
 
-    if profiling and threads > 1:
-        raise RuntimeError("Multithread profiling not supported, threads must = 1 with profiling enabled")
+    if precision is not None and concurrent_modes:
+        warn("Adaptive simulation counts run betmodes one at a time, ignoring concurrent_modes.")
+        concurrent_modes = False
+    if precision is not None and resume:
+        warn("Adaptive simulation runs cannot be resumed, simulating from scratch.")
 
     startTime = time.time()
     print("\nCreating books...")
-    for betmode_name in num_sim_args:
-        sim_counter = 0
-        for bm in config.bet_modes:
-            if bm.get_name() == betmode_name:
-                for d in bm.get_distributions():
-                    if d.get_fixed_amt() is not None:
-                        sim_counter += d.get_fixed_amt()
-        set_sim_amount = False
-        if sim_counter > 0:
-            set_sim_amount = True
+    manifest = RunManifest.load_or_create(
+        gamestate.output_files.get_run_manifest_name(), get_config_fingerprint(config), resume
+    )
+    if phase_timers:
+        gamestate.enable_phase_timers()
+    if repeat_costs:
+        gamestate.enable_repeat_costs()
+    if two_phase_spins:
+        gamestate.two_phase_spins = True
+    if seed_bank:
+        gamestate.seed_banks = load_seed_banks(gamestate, config, [m for m, ns in num_sim_args.items() if ns > 0])
+    if criteria_cache:
+        gamestate.criteria_cache = load_criteria_caches(
+            gamestate, config, [m for m, ns in num_sim_args.items() if ns > 0]
+        )
+    use_pool = threads > 1
+    collector = None
+    if telemetry:
+        collector = start_telemetry(gamestate, config, num_sim_args, precision, use_pool)
+    telemetry_queue = collector.queue if collector else None
+    pool = create_worker_pool(gamestate, threads, telemetry_queue, profiling) if use_pool else None
+    if pool is None:
+        _init_worker(gamestate, None, profiling)
+        if collector is not None:
+            gamestate.telemetry = WorkerTelemetry(collector.update)
+    try:
+        if concurrent_modes and pool is not None:
+            run_concurrent_betmodes(gamestate, config, num_sim_args, batch_size, threads, compress, pool, manifest)
+        else:
+            run_all_betmodes(
+                gamestate, config, num_sim_args, batch_size, threads, compress, profiling, pool, manifest, precision
+            )
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        if pool is None:
+            _init_worker(None)
+        if collector is not None:
+            gamestate.telemetry = None
+            collector.stop()
+    if profiling:
+        merge_profiles(gamestate.output_files, list(num_sim_args))
+    if gamestate.phase_timers is not None:
+        write_phase_breakdowns(gamestate.output_files, list(num_sim_args))
+    if gamestate.repeat_costs is not None:
+        write_repeat_cost_reports(gamestate.output_files, list(num_sim_args))
+    shutil.rmtree(gamestate.output_files.temp_path)
+    print("\nFinished creating books in", time.time() - startTime, "seconds.\n")
+
+
+def start_telemetry(
+    gamestate: object, config: object, num_sim_args: dict, precision: SimulationPrecision, use_pool: bool
+) -> TelemetryCollector:
+    """Start the metrics collector, registering the simulations each betmode will run (max_sims for adaptive runs)."""
+    collector = TelemetryCollector(
+        config.game_id,
+        gamestate.output_files.get_metrics_name("jsonl"),
+        gamestate.output_files.get_metrics_name("prom"),
+        queue=Queue() if use_pool else None,
+    )
+    for betmode_name, requested_sims in num_sim_args.items():
+        if requested_sims > 0:
+            if precision is not None:
+                betmode_precision = precision[betmode_name] if isinstance(precision, dict) else precision
+                requested_sims = betmode_precision.max_sims
+            collector.add_planned(betmode_name, get_betmode_num_sims(config, betmode_name, requested_sims)[0])
+    return collector.start()
+
+
+def get_betmode_num_sims(config: object, betmode_name: str, requested_sims: int) -> tuple:
+    """Return the number of simulations to run and whether any distribution sets a fixed amount."""
+    sim_counter = 0
+    for bm in config.bet_modes:
+        if bm.get_name() == betmode_name:
+            for d in bm.get_distributions():
+                if d.get_fixed_amt() is not None:
+                    sim_counter += d.get_fixed_amt()
+    return max(requested_sims, sim_counter), sim_counter > 0
 
+
+def estimate_betmode_cost(betmode: object, num_sims: int) -> float:
+    """
+    Relative cost estimate for simulating a betmode, from its criteria mix and bet cost.
+    Forced freegames, exact-win criteria and forced wincaps are weighted as more expensive per simulation,
+    and more expensive bets (buy-bonus modes) are assumed to produce longer feature rounds.
+    """
+    distributions = betmode.get_distributions()
+    fixed_sims = sum(d.get_fixed_amt() for d in distributions if d.get_fixed_amt() is not None)
+    total_quota = sum(d.get_quota() for d in distributions if d.get_quota() is not None)
+    quota_sims = max(num_sims - fixed_sims, 0)
+    criteria_cost = 0.0
+    for d in distributions:
+        if d.get_fixed_amt() is not None:
+            share = d.get_fixed_amt()
+        else:
+            share = quota_sims * d.get_quota() / total_quota
+        weight = 1.0
+        if d._conditions.get("force_freegame"):
+            weight *= FORCE_FREEGAME_COST_FACTOR
+        if d._conditions.get("force_wincap"):
+            weight *= FORCE_WINCAP_COST_FACTOR
+        elif d.get_win_criteria() is not None:
+            weight *= WIN_CRITERIA_COST_FACTOR
+        criteria_cost += share * weight
+
+    return criteria_cost * (1.0 + math.log10(max(betmode.get_cost(), 1.0)))
+
+
+def run_all_betmodes(
+    gamestate: object,
+    config: object,
+    num_sim_args: dict,
+    batch_size: int,
+    threads: int,
+    compress: bool,
+    profiling: bool,
+    pool: object = None,
+    manifest: RunManifest = None,
+    precision: SimulationPrecision = None,
+):
+    """Simulate and merge output files for every betmode, reusing a single worker pool."""
+    for betmode_name in num_sim_args:
         if num_sim_args[betmode_name] > 0:
             gamestate.betmode = betmode_name
-            nsims = max(num_sim_args[betmode_name], sim_counter)
-            run_multi_process_sims(
+            if precision is not None:
+                betmode_precision = precision[betmode_name] if isinstance(precision, dict) else precision
+                nsims, num_chunks, force_keys = run_adaptive_sims(
+                    threads, batch_size, config, betmode_name, gamestate, betmode_precision, compress, pool
+                )
+                finish_betmode(
+                    gamestate, config, betmode_name, force_keys, threads, batch_size, nsims, compress, None, num_chunks
+                )
+                continue
+
+            nsims, set_sim_amount = get_betmode_num_sims(config, betmode_name, num_sim_args[betmode_name])
+            force_keys = run_multi_process_sims(
                 threads,
                 batch_size,
                 config.game_id,
@@ -62,76 +245,213 @@ def create_books(
                 write_event_list=config.write_event_list,
                 profiling=profiling,
                 set_sim_amount=set_sim_amount,
+                pool=pool,
+                manifest=manifest,
             )
+            finish_betmode(gamestate, config, betmode_name, force_keys, threads, batch_size, nsims, compress, manifest)
 
-            output_lookup_and_force_files(
-                threads,
-                batch_size,
-                config.game_id,
-                betmode_name,
-                gamestate,
-                num_sims=nsims,
-                compress=compress,
-            )
-    shutil.rmtree(gamestate.output_files.temp_path)
-    print("\nFinished creating books in", time.time() - startTime, "seconds.\n")
+
+def finish_betmode(
+    gamestate: object,
+    config: object,
+    betmode_name: str,
+    force_keys: list,
+    threads: int,
+    batch_size: int,
+    num_sims: int,
+    compress: bool,
+    manifest: RunManifest = None,
+    num_chunks: int = None,
+):
+    """Merge worker force keys and write the final betmode output files, unless a resumed run already did."""
+    gamestate.betmode = betmode_name
+    gamestate.combine(force_keys, betmode_name)
+    gamestate.get_betmode(betmode_name).lock_force_keys()
+    if gamestate.criteria_cache is not None:
+        update_criteria_cache(gamestate, config, betmode_name)
+    if manifest is not None and manifest.is_merged(betmode_name):
+        print("Output files for", betmode_name, "were already merged, skipping.")
+        return
+
+    output_lookup_and_force_files(
+        threads,
+        batch_size,
+        config.game_id,
+        betmode_name,
+        gamestate,
+        num_sims=num_sims,
+        compress=compress,
+        num_chunks=num_chunks,
+    )
+    if manifest is not None:
+        manifest.mark_merged(betmode_name, gamestate.output_files.get_final_output_files(betmode_name, compress))
 
 
-def get_sim_splits(gamestate: object, num_sims: int, betmode_name: str) -> Dict[str, int]:
-    """Ensure assignment of criteria to all simulations numbers."""
-    betmode_distributions = gamestate.get_betmode(betmode_name).get_distributions()
-    num_sims_criteria = {d._criteria: max(int(num_sims * d._quota), 1) for d in betmode_distributions}
-    total_sims = sum(num_sims_criteria.values())
-    reduce_sims = total_sims > num_sims
-    listedCriteria = [d._criteria for d in betmode_distributions]
-    criteria_weights = [d._quota for d in betmode_distributions]
-    random.seed(0)
-    while sum(num_sims_criteria.values()) != num_sims:
-        c = random.choices(listedCriteria, criteria_weights)[0]
-        if reduce_sims and num_sims_criteria[c] > 1:
-            num_sims_criteria[c] -= 1
-        elif not reduce_sims:
-            num_sims_criteria[c] += 1
-
-    return num_sims_criteria
-
-
-def assign_sim_criteria(num_sims_criteria: Dict[str, int], sims: int) -> Dict[int, str]:
-    """Assign criteria randomly to simulations based on quota defined in config."""
-    sim_allocation = [criteria for criteria, count in num_sims_criteria.items() for _ in range(count)]
-    random.shuffle(sim_allocation)
-    return {i: sim_allocation[i] for i in range(min(sims, len(sim_allocation)))}
-
-
-def string_to_int(s: str) -> int:
-    "Convert criteria name to large integer value"
-    h = hashlib.sha256(s.encode()).hexdigest()
-    return int(h[:12], 16)
-
-
-async def profile_and_visualize(
-    game_id,
-    gamestate,
-    all_betmode_configs,
-    betmode,
-    sim_allocation,
-    threads,
-    num_repeats,
-    sims_per_thread,
-    repeat,
-    compress,
-    write_event_list,
-    simulation_seeds,
+def run_concurrent_betmodes(
+    gamestate: object,
+    config: object,
+    num_sim_args: dict,
+    batch_size: int,
+    threads: int,
+    compress: bool,
+    pool: Pool,
+    manifest: RunManifest = None,
 ):
-    """Create flame-graph, automatically opens output on localhost."""
-    output_string = f"games/{game_id}/simulationProfile_{betmode}.prof"
-    cProfile.runctx(
-        "gamestate.run_sims(all_betmode_configs, betmode, sim_allocation, threads, num_repeats, sims_per_thread, 0, repeat, compress, write_event_list, simulation_seeds)",
-        globals(),
-        locals(),
-        output_string,
+    """
+    Queue the simulation chunks of every betmode on the shared pool, most expensive betmode first.
+    When the last chunk of a betmode returns, its output files are merged in this process while
+    the pool keeps working through the chunks of the remaining betmodes.
+    """
+    betmode_sims = {}
+    for betmode_name, requested_sims in num_sim_args.items():
+        if requested_sims > 0:
+            betmode_sims[betmode_name] = get_betmode_num_sims(config, betmode_name, requested_sims)
+
+    estimates = {
+        name: estimate_betmode_cost(gamestate.get_betmode(name), nsims) for name, (nsims, _) in betmode_sims.items()
+    }
+    schedule = sorted(betmode_sims, key=lambda name: estimates[name], reverse=True)
+    print("Betmode schedule (estimated relative cost):")
+    for name in schedule:
+        print(f"  {name}: {round(estimates[name], 1)}")
+
+    all_tasks = []
+    remaining_chunks, force_keys = {}, {}
+    for betmode_name in schedule:
+        nsims, set_sim_amount = betmode_sims[betmode_name]
+        print("\nQueueing books for", config.game_id, "in", betmode_name)
+        tasks = prepare_betmode_tasks(
+            threads,
+            batch_size,
+            betmode_name,
+            gamestate,
+            nsims,
+            compress,
+            config.write_event_list,
+            set_sim_amount,
+        )
+        pending_tasks, force_keys[betmode_name] = split_completed_tasks(manifest, betmode_name, nsims, tasks)
+        all_tasks.extend(pending_tasks)
+        remaining_chunks[betmode_name] = len(pending_tasks)
+
+    def finish(betmode_name):
+        nsims = betmode_sims[betmode_name][0]
+        finish_betmode(
+            gamestate, config, betmode_name, force_keys[betmode_name], threads, batch_size, nsims, compress, manifest
+        )
+
+    for betmode_name in schedule:
+        if remaining_chunks[betmode_name] == 0:
+            finish(betmode_name)
+
+    for finished, result in enumerate(pool.imap_unordered(_run_sim_batch, all_tasks)):
+        betmode_name = result["betmode"]
+        record_finished_chunk(gamestate, manifest, result)
+        force_keys[betmode_name].append(result["force_keys"])
+        remaining_chunks[betmode_name] -= 1
+        print("Finished batch", finished + 1, "of", len(all_tasks), f"({betmode_name})", flush=True)
+        if remaining_chunks[betmode_name] == 0:
+            finish(betmode_name)
+
+
+_worker_gamestate = None
+_worker_profiling = False
+
+
+def _init_worker(gamestate: object, telemetry_queue: Queue = None, profiling=False) -> None:
+    """Hold one gamestate copy per pool worker (or the main process when threads=1) for the whole run."""
+    global _worker_gamestate, _worker_profiling
+    _worker_gamestate = gamestate
+    _worker_profiling = profiling
+    if gamestate is not None:
+        set_outcome_sampler(gamestate.config.outcome_sampler)
+    if telemetry_queue is not None:
+        _worker_gamestate.telemetry = WorkerTelemetry(telemetry_queue.put)
+
+
+def _run_sim_batch(task: dict) -> dict:
+    """Run a single (betmode, sim range) work item inside a pool worker."""
+    if _worker_profiling:
+        output_files = _worker_gamestate.output_files
+        return run_profiled(
+            _worker_gamestate.run_sims,
+            task,
+            output_files.get_temp_profile_name(task["betmode"], task["chunk_index"], "prof"),
+            output_files.get_temp_profile_name(task["betmode"], task["chunk_index"], "stacks"),
+            use_cprofile=_worker_profiling != "sample",
+        )
+    return _worker_gamestate.run_sims(**task)
+
+
+def create_worker_pool(
+    gamestate: object, threads: int, telemetry_queue: Queue = None, profiling=False
+) -> Pool:
+    """Start a long-lived pool, sending the gamestate (and optional metrics queue) to each worker once."""
+    return Pool(processes=threads, initializer=_init_worker, initargs=(gamestate, telemetry_queue, profiling))
+
+
+def make_batch_tasks(
+    betmode: str,
+    sim_chunks: list,
+    plan: SimulationPlan,
+    compress: bool,
+    write_event_list: bool,
+    first_chunk_index: int = 0,
+) -> list:
+    """Build one work item per sim-id chunk, each referencing a range of the shared plan."""
+    return [
+        {
+            "betmode": betmode,
+            "sim_start": sim_start,
+            "sim_end": sim_end,
+            "plan": plan,
+            "chunk_index": chunk_index,
+            "compress": compress,
+            "write_event_list": write_event_list,
+        }
+        for chunk_index, (sim_start, sim_end) in enumerate(sim_chunks, start=first_chunk_index)
+    ]
+
+
+def split_completed_tasks(manifest: RunManifest, betmode: str, num_sims: int, tasks: list) -> tuple:
+    """Separate chunks already completed by a previous (resumed) run from the remaining work.
+    Returns the pending tasks and the force keys reported by the completed chunks."""
+    if manifest is None:
+        return tasks, []
+    manifest.start_betmode(betmode, num_sims, [(task["sim_start"], task["sim_end"]) for task in tasks])
+    completed = manifest.get_completed_chunks(betmode)
+    if len(completed) > 0:
+        print(f"Skipping {len(completed)} of {len(tasks)} completed chunks for", betmode)
+    pending_tasks = [task for task in tasks if task["chunk_index"] not in completed]
+    return pending_tasks, [result["force_keys"] for result in completed.values()]
+
+
+def record_finished_chunk(gamestate: object, manifest: RunManifest, result: dict) -> None:
+    """Add a finished chunk and the hashes of its temporary files to the run manifest."""
+    if manifest is not None:
+        betmode, chunk_index = result["betmode"], result["chunk_index"]
+        chunk_files = gamestate.output_files.get_temp_chunk_files(betmode, chunk_index, result["compress"])
+        manifest.record_chunk(betmode, chunk_index, result, chunk_files)
+
+
+def prepare_betmode_tasks(
+    threads: int,
+    batching_size: int,
+    betmode: str,
+    gamestate: object,
+    num_sims: int,
+    compress: bool,
+    write_event_list: bool,
+    set_sim_amount: bool,
+) -> list:
+    """Build and save the betmode simulation plan, returning one work item per sim-id chunk."""
+    sim_chunks = get_sim_chunks(num_sims, threads, batching_size)
+    plan = build_simulation_plan(gamestate, betmode, num_sims, set_sim_amount)
+    plan.save(
+        gamestate.output_files.get_temp_plan_name(betmode, "criteria"),
+        gamestate.output_files.get_temp_plan_name(betmode, "seeds"),
     )
-    await asyncio.create_subprocess_exec("snakeviz", output_string)
+    return make_batch_tasks(betmode, sim_chunks, plan, compress, write_event_list)
 
 
 def run_multi_process_sims(
@@ -145,124 +465,87 @@ def run_multi_process_sims(
     write_event_list: bool = False,
     profiling: bool = False,
     set_sim_amount=False,
-):
-    """Setup multiprocessing manager for running all game-mode simulations."""
+    pool: Pool = None,
+    manifest: RunManifest = None,
+) -> list:
+    """
+    Dispatch all betmode simulation chunks to the worker pool and collect per-chunk results.
+    Chunks are queued in sim-id order and handed to whichever worker is idle, output files are
+    named by chunk index so the merged output ordering does not depend on which worker ran them.
+    Returns the force keys reported by every chunk.
+    """
     print("\nCreating books for", game_id, "in", betmode)
-    num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
-    sims_per_thread = int(num_sims / threads / num_repeats)
-    if not set_sim_amount:
-        num_sims_criteria = get_sim_splits(gamestate, num_sims, betmode)
-        sim_criteria = assign_sim_criteria(num_sims_criteria, num_sims)
-        simulation_seeds = [i for i in range(len(sim_criteria))]
-        criteria_assignment = list(sim_criteria.values())
+    tasks = prepare_betmode_tasks(
+        threads, batching_size, betmode, gamestate, num_sims, compress, write_event_list, set_sim_amount
+    )
+    pending_tasks, force_keys = split_completed_tasks(manifest, betmode, num_sims, tasks)
+    if pool is None:
+        for task in pending_tasks:
+            print("Batch", task["chunk_index"] + 1, "of", len(tasks))
+            result = _run_sim_batch(task)
+            record_finished_chunk(gamestate, manifest, result)
+            force_keys.append(result["force_keys"])
     else:
-        for bm in gamestate.config.bet_modes:
-            if bm.get_name() == betmode:
-                dists = bm.get_distributions()
-                criteria_assignment, simulation_seeds = [], []
-                total_quota = 0.0
-                # populate fixed amount first
-                for d in dists:
-                    dist_criteria = d.get_criteria()
-                    if d.get_fixed_amt() is not None:
-                        criteria_assignment.extend([str(dist_criteria) for _ in range(d.get_fixed_amt())])
-                    else:
-                        total_quota += d.get_quota()
-                # populate remaining with quota
-                if len(criteria_assignment) < num_sims:
-                    quota_assignment = []
-                    quota_probs = []
-                    for d in dists:
-                        dist_criteria = d.get_criteria()
-                        if d.get_quota() is not None:
-                            quota_assignment.append(dist_criteria)
-                            quota_probs.append(d.get_quota())
-                            ncriteria = math.floor(
-                                max(1, (d.get_quota() / total_quota) * (num_sims - len(criteria_assignment)))
-                            )
-                            counter = 0
-                            while (len(criteria_assignment) < num_sims) and (counter < ncriteria):
-                                criteria_assignment.append(dist_criteria)
-                                counter += 1
-                    while len(criteria_assignment) < num_sims:
-                        criteria_assignment.append(random.choices(quota_assignment, quota_probs, k=1)[0])
-
-                    random.shuffle(criteria_assignment)
-                break
-
-        unique_criteria = set(criteria_assignment)
-        criteria_offset = {}
-        criteria_counter = {}
-        for c in unique_criteria:
-            criteria_offset[c] = string_to_int(c)
-            criteria_counter[c] = 0
-        simulation_seeds = []
-        for c in criteria_assignment:
-            offset_val = criteria_offset[c] + criteria_counter[c]
-            criteria_counter[c] += 1
-            simulation_seeds.append(offset_val)
-
-    for repeat in range(num_repeats):
-        print("Batch", repeat + 1, "of", num_repeats)
-        processes = []
-        manager = Manager()
-        all_betmode_configs = manager.list()
-        if profiling:
-            asyncio.run(
-                profile_and_visualize(
-                    game_id=game_id,
-                    gamestate=gamestate,
-                    all_betmode_configs=all_betmode_configs,
-                    betmode=betmode,
-                    sim_allocation=criteria_assignment,
-                    threads=threads,
-                    num_repeats=num_repeats,
-                    sims_per_thread=sims_per_thread,
-                    repeat=repeat,
-                    compress=compress,
-                    write_event_list=write_event_list,
-                    simulation_seeds=simulation_seeds,
-                )
-            )
-        elif threads == 1:
-            gamestate.run_sims(
-                betmode_copy_list=all_betmode_configs,
-                betmode=betmode,
-                sim_to_criteria=criteria_assignment,
-                total_threads=threads,
-                total_repeats=num_repeats,
-                num_sims=sims_per_thread,
-                thread_index=0,
-                repeat_count=repeat,
-                compress=compress,
-                write_event_list=write_event_list,
-                simulation_seeds=simulation_seeds,
-            )
+        for finished, result in enumerate(pool.imap_unordered(_run_sim_batch, pending_tasks)):
+            record_finished_chunk(gamestate, manifest, result)
+            force_keys.append(result["force_keys"])
+            print("Finished batch", finished + 1, "of", len(pending_tasks), flush=True)
+    return force_keys
+
+
+def run_adaptive_sims(
+    threads: int,
+    batching_size: int,
+    config: object,
+    betmode: str,
+    gamestate: object,
+    precision: SimulationPrecision,
+    compress: bool = True,
+    pool: Pool = None,
+) -> tuple:
+    """
+    Simulate a betmode in rounds until every criteria meets the precision tolerances or max_sims is reached.
+    A plan for max_sims is built once and rounds extend a prefix of it in sim-id order, so no simulation is
+    repeated. Criteria are shuffled across the plan, so every prefix keeps the quota mix. Fixed-amount
+    distributions are only exact if the run reaches max_sims.
+    Returns the number of simulations run, the number of chunks written and the chunk force keys.
+    """
+    print("\nCreating books for", config.game_id, "in", betmode, "until the target precision is reached")
+    max_sims, set_sim_amount = get_betmode_num_sims(config, betmode, precision.max_sims)
+    plan = build_simulation_plan(gamestate, betmode, max_sims, set_sim_amount)
+    plan.save(
+        gamestate.output_files.get_temp_plan_name(betmode, "criteria"),
+        gamestate.output_files.get_temp_plan_name(betmode, "seeds"),
+    )
+
+    fixed_criteria = {
+        d.get_criteria() for d in gamestate.get_betmode(betmode).get_distributions() if d.get_win_criteria() is not None
+    }
+    sims_done, num_chunks = 0, 0
+    criteria_stats = {criteria: [0, 0.0, 0.0, 0] for criteria in plan.criteria_table}
+    force_keys, precision_report = [], {}
+    while sims_done < max_sims:
+        target = min(precision.get_next_target(sims_done, precision_report), max_sims)
+        sim_chunks = [
+            (sims_done + start, sims_done + end)
+            for start, end in get_sim_chunks(target - sims_done, threads, batching_size)
+        ]
+        tasks = make_batch_tasks(betmode, sim_chunks, plan, compress, config.write_event_list, num_chunks)
+        if pool is not None:
+            results = pool.imap_unordered(_run_sim_batch, tasks)
         else:
-            for thread in range(threads):
-                process = Process(
-                    target=gamestate.run_sims,
-                    args=(
-                        all_betmode_configs,
-                        betmode,
-                        criteria_assignment,
-                        threads,
-                        num_repeats,
-                        sims_per_thread,
-                        thread,
-                        repeat,
-                        compress,
-                        write_event_list,
-                        simulation_seeds,
-                    ),
-                )
-                print("Started thread", thread)
-                process.start()
-                processes += [process]
-            print("All threads are online.")
-            for process in processes:
-                process.join()
-            print("Finished joining threads.")
-            gamestate.combine(all_betmode_configs, betmode)
-            gamestate.get_betmode(betmode).lock_force_keys()
-            manager.shutdown()
+            results = map(_run_sim_batch, tasks)
+        for result in results:
+            force_keys.append(result["force_keys"])
+            merge_criteria_stats(criteria_stats, result["criteria_stats"])
+        sims_done, num_chunks = target, num_chunks + len(tasks)
+        precision_report = get_criteria_precision(criteria_stats, precision.z_score, fixed_criteria)
+        print(f"Finished {sims_done} simulations for {betmode}", flush=True)
+        if precision.is_reached(precision_report):
+            break
+
+    print_precision_report(betmode, precision_report, precision)
+    report = {"num_sims": sims_done, "reached": precision.is_reached(precision_report), "criteria": precision_report}
+    with open(gamestate.output_files.get_precision_report_name(betmode), "w", encoding="UTF-8") as f:
+        f.write(json.dumps(report, indent=4))
+    return sims_done, num_chunks, force_keys
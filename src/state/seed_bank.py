@@ -0,0 +1,78 @@
+"""Banks of attempt seeds known to be accepted by rare criteria, invalidated when the criteria config changes."""
+
+import os
+import json
+
+from src.config.fingerprint import get_criteria_fingerprint
+
+# Candidate attempt seeds start far above the sim-number seeds used by reset_seed()
+SEED_BANK_START = 2**40
+
+
+class AttemptSeedsExhausted(Exception):
+    """Raised by reset_book() when a seed mining batch has screened all of its candidate seeds."""
+
+
+class SeedBank:
+    """
+    Accepting attempt seeds for one betmode criteria.
+
+    Seeds are every candidate in [SEED_BANK_START, next_candidate) whose attempt, after rng.seed(candidate),
+    satisfies the criteria. The bank is tied to the criteria fingerprint it was mined with.
+    """
+
+    def __init__(self, betmode: str, criteria: str, fingerprint: str, seeds: list = None, next_candidate: int = None):
+        self.betmode = betmode
+        self.criteria = criteria
+        self.fingerprint = fingerprint
+        self.seeds = list(seeds or [])
+        self.next_candidate = SEED_BANK_START if next_candidate is None else next_candidate
+
+    def to_json(self) -> dict:
+        return {
+            "betmode": self.betmode,
+            "criteria": self.criteria,
+            "fingerprint": self.fingerprint,
+            "candidates_screened": self.next_candidate - SEED_BANK_START,
+            "next_candidate": self.next_candidate,
+            "seeds": self.seeds,
+        }
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="UTF-8") as f:
+            f.write(json.dumps(self.to_json()))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str, betmode: str, criteria: str, fingerprint: str) -> "SeedBank":
+        """Read a bank, starting an empty one if it is missing or was mined with a different criteria config."""
+        if not os.path.isfile(path):
+            return cls(betmode, criteria, fingerprint)
+        with open(path, "r", encoding="UTF-8") as f:
+            data = json.load(f)
+        if data["fingerprint"] != fingerprint:
+            print(f"Seed bank for {betmode} {criteria} was mined with a different config, discarding it.")
+            os.remove(path)
+            return cls(betmode, criteria, fingerprint)
+        return cls(betmode, criteria, fingerprint, data["seeds"], data["next_candidate"])
+
+
+def load_seed_banks(gamestate: object, config: object, betmodes: list) -> dict:
+    """
+    Valid banked seeds of every criteria in the betmodes, as {betmode: {criteria: seeds}}.
+    Banks whose fingerprint no longer matches the config are deleted.
+    """
+    seed_banks = {}
+    for betmode in betmodes:
+        for distribution in gamestate.get_betmode(betmode).get_distributions():
+            criteria = distribution.get_criteria()
+            path = gamestate.output_files.get_seed_bank_name(betmode, criteria)
+            if not os.path.isfile(path):
+                continue
+            bank = SeedBank.load(path, betmode, criteria, get_criteria_fingerprint(config, betmode, criteria))
+            if bank.seeds:
+                seed_banks.setdefault(betmode, {})[criteria] = bank.seeds
+                print(f"Using {len(bank.seeds)} banked seeds for {betmode} {criteria}.")
+    return seed_banks
@@ -0,0 +1,77 @@
+"""Screen candidate attempt seeds for rare criteria and add the accepted ones to their seed bank."""
+
+import time
+
+from src.config.fingerprint import get_criteria_fingerprint
+from src.state import run_sims
+from src.state.run_sims import create_worker_pool
+from src.state.seed_bank import SeedBank, SEED_BANK_START
+
+MINING_BATCH_SIZE = 1000
+
+
+def _run_mining_batch(task: dict) -> list:
+    """Pool entry point: screen one range of candidate seeds on the worker's gamestate."""
+    return run_sims._worker_gamestate.mine_attempt_seeds(**task)
+
+
+def mine_seed_bank(
+    gamestate: object,
+    config: object,
+    betmode: str,
+    criteria: str,
+    num_seeds: int,
+    threads: int = 1,
+    batch_size: int = MINING_BATCH_SIZE,
+    max_candidates: int = None,
+) -> SeedBank:
+    """
+    Grow the seed bank of a betmode criteria to at least num_seeds accepting seeds.
+    Candidates are screened in consecutive ranges of batch_size, one per thread, with events off and
+    nothing written to the library. An existing bank with a matching fingerprint is continued from
+    its last screened candidate, one mined with a different criteria config is discarded.
+    The bank is saved after every round, so mining can be interrupted and resumed.
+    """
+    path = gamestate.output_files.get_seed_bank_name(betmode, criteria)
+    bank = SeedBank.load(path, betmode, criteria, get_criteria_fingerprint(config, betmode, criteria))
+    first_candidate = bank.next_candidate
+    start_time = time.time()
+    pool = create_worker_pool(gamestate, threads) if threads > 1 else None
+    try:
+        while len(bank.seeds) < num_seeds:
+            if max_candidates is not None and bank.next_candidate - first_candidate >= max_candidates:
+                break
+            tasks = [
+                {
+                    "betmode": betmode,
+                    "criteria": criteria,
+                    "candidate_start": bank.next_candidate + idx * batch_size,
+                    "candidate_end": bank.next_candidate + (idx + 1) * batch_size,
+                }
+                for idx in range(max(threads, 1))
+            ]
+            if pool is not None:
+                results = pool.map(_run_mining_batch, tasks)
+            else:
+                results = [gamestate.mine_attempt_seeds(**task) for task in tasks]
+            for seeds in results:
+                bank.seeds.extend(seeds)
+            bank.next_candidate = tasks[-1]["candidate_end"]
+            bank.save(path)
+            print(
+                f"Seed bank {betmode} {criteria}: {len(bank.seeds)}/{num_seeds} seeds, "
+                f"{bank.next_candidate - first_candidate} candidates screened",
+                flush=True,
+            )
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    screened = bank.next_candidate - first_candidate
+    if screened > 0:
+        print(
+            f"Mined {betmode} {criteria} in {round(time.time() - start_time, 1)}s, "
+            f"acceptance rate {round(len(bank.seeds) / (bank.next_candidate - SEED_BANK_START), 6)}"
+        )
+    return bank
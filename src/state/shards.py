@@ -0,0 +1,216 @@
+"""Split a betmode's simulations across hosts and merge the shard outputs deterministically."""
+
+import os
+import json
+
+from src.config.fingerprint import get_config_fingerprint
+from src.state.sim_plan import build_simulation_plan, get_sim_chunks
+from src.state.run_sims import get_betmode_num_sims, make_batch_tasks, create_worker_pool, _run_sim_batch
+from src.write_data.write_data import get_sha_256, merge_output_files
+
+SHARD_DESCRIPTOR_NAME = "shard.json"
+SHARD_FILE_ROLES = ("books", "force", "lookup", "segmented")
+
+
+def get_shard_dir(shard_root: str, betmode: str, sim_start: int, sim_end: int) -> str:
+    """Directory holding the outputs of a single shard."""
+    return os.path.join(shard_root, f"{betmode}_{sim_start}_{sim_end}")
+
+
+def run_shard(
+    gamestate: object,
+    config: object,
+    betmode: str,
+    num_sims: int,
+    sim_start: int,
+    sim_end: int,
+    shard_root: str,
+    batch_size: int,
+    threads: int = 1,
+    compress: bool = True,
+) -> str:
+    """
+    Simulate ids [sim_start, sim_end) of a betmode with num_sims total simulations.
+    The full betmode simulation plan is rebuilt locally, so every host assigns the same criteria and seeds.
+    Books, lookup rows, segmented rows and force records are written per chunk into the shard directory,
+    followed by a shard.json descriptor with the sim range, config fingerprint and file hashes.
+    Returns the descriptor path.
+    """
+    num_sims, set_sim_amount = get_betmode_num_sims(config, betmode, int(num_sims))
+    if not 0 <= sim_start < sim_end <= num_sims:
+        raise ValueError(f"Shard range [{sim_start}, {sim_end}) is outside [0, {num_sims}) for {betmode}")
+
+    output_files = gamestate.output_files
+    plan = build_simulation_plan(gamestate, betmode, num_sims, set_sim_amount)
+    plan_name = f"{betmode}_{sim_start}_{sim_end}"
+    plan_paths = [output_files.get_temp_plan_name(plan_name, array_name) for array_name in ("criteria", "seeds")]
+    plan.save(*plan_paths)
+
+    sim_chunks = [
+        (sim_start + start, sim_start + end) for start, end in get_sim_chunks(sim_end - sim_start, threads, batch_size)
+    ]
+    tasks = make_batch_tasks(betmode, sim_chunks, plan, compress, config.write_event_list)
+
+    shard_dir = get_shard_dir(shard_root, betmode, sim_start, sim_end)
+    os.makedirs(shard_dir, exist_ok=True)
+    descriptor_path = os.path.join(shard_dir, SHARD_DESCRIPTOR_NAME)
+    if os.path.isfile(descriptor_path):
+        os.remove(descriptor_path)
+
+    print(f"\nCreating shard [{sim_start}, {sim_end}) of {num_sims} books for", config.game_id, "in", betmode)
+    local_temp_path = output_files.temp_path
+    output_files.temp_path = shard_dir
+    results = []
+    try:
+        if threads > 1:
+            pool = create_worker_pool(gamestate, threads)
+            try:
+                results = list(pool.imap_unordered(_run_sim_batch, tasks))
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [gamestate.run_sims(**task) for task in tasks]
+        chunk_files = [get_shard_chunk_files(output_files, betmode, idx, compress) for idx in range(len(tasks))]
+    finally:
+        output_files.temp_path = local_temp_path
+        for path in plan_paths:
+            if os.path.isfile(path):
+                os.remove(path)
+
+    force_keys = sorted({key for result in results for key in result["force_keys"]})
+    descriptor = {
+        "game_id": config.game_id,
+        "betmode": betmode,
+        "fingerprint": get_config_fingerprint(config),
+        "num_sims": num_sims,
+        "sim_start": sim_start,
+        "sim_end": sim_end,
+        "compress": compress,
+        "force_keys": force_keys,
+        "total_wins": sum(result["total_wins"] for result in results),
+        "chunks": [
+            {
+                "sim_start": chunk_start,
+                "sim_end": chunk_end,
+                "files": {
+                    role: {"name": os.path.basename(path), "sha256": get_sha_256(path)}
+                    for role, path in files.items()
+                },
+            }
+            for (chunk_start, chunk_end), files in zip(sim_chunks, chunk_files)
+        ],
+    }
+    with open(descriptor_path, "w", encoding="UTF-8") as f:
+        f.write(json.dumps(descriptor, indent=4))
+    print("Shard written to", shard_dir)
+    return descriptor_path
+
+
+def get_shard_chunk_files(output_files: object, betmode: str, chunk_index: int, compress: bool) -> dict:
+    """Paths of every file written by one chunk, keyed by role."""
+    return dict(zip(SHARD_FILE_ROLES, output_files.get_temp_chunk_files(betmode, chunk_index, compress)))
+
+
+def load_shard_descriptors(shard_root: str) -> list:
+    """Read every shard.json below shard_root, recording the directory each was found in."""
+    descriptors = []
+    for dirpath, _, filenames in os.walk(shard_root):
+        if SHARD_DESCRIPTOR_NAME in filenames:
+            with open(os.path.join(dirpath, SHARD_DESCRIPTOR_NAME), "r", encoding="UTF-8") as f:
+                descriptor = json.load(f)
+            descriptor["shard_dir"] = dirpath
+            descriptors.append(descriptor)
+    return descriptors
+
+
+def order_betmode_shards(descriptors: list) -> list:
+    """
+    Order one betmode's shards by sim id and check they cover every simulation exactly once.
+    Shards re-run over an identical range are deduplicated, any gap, overlap or mismatch
+    in total simulations, compression or fingerprint raises a RuntimeError.
+    """
+    betmode = descriptors[0]["betmode"]
+    for key in ("num_sims", "compress", "fingerprint"):
+        values = {d[key] for d in descriptors}
+        if len(values) > 1:
+            raise RuntimeError(f"Shards for {betmode} disagree on {key}: {sorted(map(str, values))}")
+
+    unique_shards = {}
+    for descriptor in descriptors:
+        unique_shards.setdefault((descriptor["sim_start"], descriptor["sim_end"]), descriptor)
+    ordered = [unique_shards[key] for key in sorted(unique_shards)]
+
+    expected_start = 0
+    for descriptor in ordered:
+        if descriptor["sim_start"] > expected_start:
+            raise RuntimeError(
+                f"Shards for {betmode} have missing simulations at [{expected_start}, {descriptor['sim_start']})"
+            )
+        if descriptor["sim_start"] < expected_start:
+            raise RuntimeError(
+                f"Shards for {betmode} have overlapping simulations at [{descriptor['sim_start']}, {expected_start})"
+            )
+        expected_start = descriptor["sim_end"]
+    num_sims = ordered[0]["num_sims"]
+    if expected_start != num_sims:
+        raise RuntimeError(f"Shards for {betmode} are missing simulations [{expected_start}, {num_sims})")
+    return ordered
+
+
+def check_shard_file(path: str, sha256: str) -> None:
+    """Raise a RuntimeError if a shard file is missing or its sha256 differs from the recorded one."""
+    if not os.path.isfile(path) or get_sha_256(path) != sha256:
+        raise RuntimeError(f"Shard file {path} is missing or does not match its recorded hash")
+
+
+def merge_shards(gamestate: object, config: object, shard_root: str, betmodes: list = None) -> dict:
+    """
+    Combine shard outputs found below shard_root into the final books, lookup tables and force files.
+    Chunks are concatenated in sim-id order, giving the same files as a single-host create_books run.
+    Returns the number of simulations merged per betmode.
+    """
+    fingerprint = get_config_fingerprint(config)
+    shards_by_betmode = {}
+    for descriptor in load_shard_descriptors(shard_root):
+        if descriptor["game_id"] != config.game_id:
+            continue
+        if descriptor["fingerprint"] != fingerprint:
+            raise RuntimeError(f"Shard {descriptor['shard_dir']} was simulated with a different game config")
+        shards_by_betmode.setdefault(descriptor["betmode"], []).append(descriptor)
+
+    merged = {}
+    for bm in config.bet_modes:
+        betmode = bm.get_name()
+        if betmode not in shards_by_betmode or (betmodes is not None and betmode not in betmodes):
+            continue
+        shards = order_betmode_shards(shards_by_betmode[betmode])
+        chunk_files = {role: [] for role in SHARD_FILE_ROLES}
+        force_keys = []
+        for descriptor in shards:
+            force_keys.append(descriptor["force_keys"])
+            for chunk in descriptor["chunks"]:
+                for role in SHARD_FILE_ROLES:
+                    path = os.path.join(descriptor["shard_dir"], chunk["files"][role]["name"])
+                    check_shard_file(path, chunk["files"][role]["sha256"])
+                    chunk_files[role].append(path)
+
+        gamestate.betmode = betmode
+        gamestate.combine(force_keys, betmode)
+        gamestate.get_betmode(betmode).lock_force_keys()
+        merge_output_files(
+            config.game_id,
+            betmode,
+            gamestate,
+            book_files=chunk_files["books"],
+            force_files=chunk_files["force"],
+            lookup_files=chunk_files["lookup"],
+            segmented_files=chunk_files["segmented"],
+            compress=shards[0]["compress"],
+        )
+        merged[betmode] = shards[0]["num_sims"]
+
+    missing = [betmode for betmode in (betmodes or []) if betmode not in merged]
+    if missing:
+        raise RuntimeError(f"No shards found for betmodes: {missing}")
+    return merged
@@ -0,0 +1,200 @@
+"""Compact, memory-mapped simulation plan shared between pool workers."""
+
+import os
+import math
+import hashlib
+from typing import Dict, List
+
+import numpy as np
+
+CRITERIA_CODE_DTYPE = np.int16
+SEED_DTYPE = np.int64
+PLAN_SEED = 0
+CHUNKS_PER_THREAD = 8
+
+
+class SimulationPlan:
+    """
+    Criteria and seed assignment for every simulation number in a betmode.
+
+    Criteria are stored as small integer codes into criteria_table and seeds as int64,
+    so a plan for 100M simulations is a few hundred MB of arrays rather than Python lists.
+    Once saved, the plan pickles to its file paths only: workers re-open the arrays as
+    read-only memory maps and read their own slice without copying.
+    """
+
+    def __init__(self, criteria_table: List[str], criteria_codes: np.ndarray, simulation_seeds: np.ndarray):
+        assert len(criteria_codes) == len(simulation_seeds), "criteria and seed arrays must be the same length"
+        self.criteria_table = list(criteria_table)
+        self.criteria_codes = criteria_codes
+        self.simulation_seeds = simulation_seeds
+        self.codes_path = None
+        self.seeds_path = None
+
+    def __len__(self) -> int:
+        return len(self.criteria_codes)
+
+    def __getstate__(self) -> dict:
+        if self.codes_path is None:
+            return self.__dict__
+        return {"criteria_table": self.criteria_table, "codes_path": self.codes_path, "seeds_path": self.seeds_path}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        if "criteria_codes" not in state:
+            self.open_memmap()
+
+    def save(self, codes_path: str, seeds_path: str) -> None:
+        """Write plan arrays to disk and switch to read-only memory maps of them."""
+        for path in (codes_path, seeds_path):
+            parent_dir = os.path.dirname(path)
+            if parent_dir:
+                os.makedirs(parent_dir, exist_ok=True)
+        np.save(codes_path, np.ascontiguousarray(self.criteria_codes, dtype=CRITERIA_CODE_DTYPE))
+        np.save(seeds_path, np.ascontiguousarray(self.simulation_seeds, dtype=SEED_DTYPE))
+        self.codes_path = codes_path
+        self.seeds_path = seeds_path
+        self.open_memmap()
+
+    def open_memmap(self) -> None:
+        """(Re)open saved plan arrays without reading them into memory."""
+        self.criteria_codes = np.load(self.codes_path, mmap_mode="r")
+        self.simulation_seeds = np.load(self.seeds_path, mmap_mode="r")
+
+    def get_criteria(self, sim: int) -> str:
+        """Criteria name assigned to a simulation number."""
+        return self.criteria_table[int(self.criteria_codes[sim])]
+
+    def get_seed(self, sim: int) -> int:
+        """Seed assigned to a simulation number."""
+        return int(self.simulation_seeds[sim])
+
+    def count_criteria(self, criteria: str, sim_end: int) -> int:
+        """Number of simulations in [0, sim_end) assigned to a criteria."""
+        if criteria not in self.criteria_table:
+            return 0
+        code = self.criteria_table.index(criteria)
+        return int(np.count_nonzero(np.asarray(self.criteria_codes[:sim_end]) == code))
+
+    def iter_sims(self, sim_start: int, sim_end: int):
+        """Yield (sim, criteria, seed) for a contiguous range, reading only that slice."""
+        codes = self.criteria_codes[sim_start:sim_end].tolist()
+        seeds = self.simulation_seeds[sim_start:sim_end].tolist()
+        for idx, (code, seed) in enumerate(zip(codes, seeds)):
+            yield sim_start + idx, self.criteria_table[code], seed
+
+
+def get_sim_chunks(num_sims: int, threads: int, batch_size: int) -> List[tuple]:
+    """
+    Split [0, num_sims) into contiguous (sim_start, sim_end) chunks, in sim-id order.
+    Chunks are capped at batch_size and kept small enough that each thread pulls several,
+    so slow criteria do not leave a single worker running while the others are idle.
+    The final chunk absorbs any remainder.
+    """
+    if num_sims <= 0:
+        return []
+    chunk_size = -(-num_sims // (max(threads, 1) * CHUNKS_PER_THREAD))
+    chunk_size = max(1, min(batch_size, chunk_size))
+    return [(start, min(start + chunk_size, num_sims)) for start in range(0, num_sims, chunk_size)]
+
+
+def string_to_int(s: str) -> int:
+    "Convert criteria name to large integer value"
+    h = hashlib.sha256(s.encode()).hexdigest()
+    return int(h[:12], 16)
+
+
+def get_sim_splits(gamestate: object, num_sims: int, betmode_name: str) -> Dict[str, int]:
+    """Ensure assignment of criteria to all simulations numbers."""
+    betmode_distributions = gamestate.get_betmode(betmode_name).get_distributions()
+    criteria = [d._criteria for d in betmode_distributions]
+    weights = np.array([d._quota for d in betmode_distributions], dtype=np.float64)
+    counts = np.array([max(int(num_sims * d._quota), 1) for d in betmode_distributions], dtype=np.int64)
+    rng = np.random.default_rng(PLAN_SEED)
+    shortfall = num_sims - int(counts.sum())
+    if shortfall > 0:
+        counts += rng.multinomial(shortfall, weights / weights.sum())
+    while shortfall < 0:
+        removable = counts - 1
+        if removable.sum() == 0:
+            break
+        removal_weights = weights * (removable > 0)
+        removal = rng.multinomial(-shortfall, removal_weights / removal_weights.sum())
+        counts -= np.minimum(removal, removable)
+        shortfall = num_sims - int(counts.sum())
+
+    return {c: int(n) for c, n in zip(criteria, counts)}
+
+
+def assign_sim_criteria(num_sims_criteria: Dict[str, int], sims: int) -> np.ndarray:
+    """Assign criteria codes (indexes into num_sims_criteria keys) randomly to simulations."""
+    counts = np.fromiter(num_sims_criteria.values(), dtype=np.int64, count=len(num_sims_criteria))
+    codes = np.repeat(np.arange(len(counts), dtype=CRITERIA_CODE_DTYPE), counts)
+    np.random.default_rng(PLAN_SEED).shuffle(codes)
+    return codes[:sims]
+
+
+def get_quota_counts(quota_weights: np.ndarray, remaining: int) -> np.ndarray:
+    """Simulations per quota distribution, in distribution order, before the leftover is drawn.
+    Each distribution takes floor(max(1, share * unassigned)) of the simulations still unassigned after the
+    distributions before it, capped at what is left."""
+    quota_counts = np.zeros(len(quota_weights), dtype=np.int64)
+    quota_probs = quota_weights / quota_weights.sum()
+    unassigned = remaining
+    for idx in np.flatnonzero(quota_weights > 0):
+        quota_counts[idx] = min(math.floor(max(1, quota_probs[idx] * unassigned)), unassigned)
+        unassigned -= int(quota_counts[idx])
+    return quota_counts
+
+
+def assign_fixed_amount_criteria(distributions: list, num_sims: int) -> np.ndarray:
+    """Assign criteria codes for betmodes where some distributions request a fixed number of simulations.
+    Fixed amounts are populated first, the remainder is split by quota (see get_quota_counts())."""
+    fixed_counts = np.zeros(len(distributions), dtype=np.int64)
+    quota_weights = np.zeros(len(distributions), dtype=np.float64)
+    for idx, d in enumerate(distributions):
+        if d.get_fixed_amt() is not None:
+            fixed_counts[idx] = d.get_fixed_amt()
+        else:
+            quota_weights[idx] = d.get_quota()
+
+    remaining = num_sims - int(fixed_counts.sum())
+    quota_counts = np.zeros(len(distributions), dtype=np.int64)
+    rng = np.random.default_rng(PLAN_SEED)
+    if remaining > 0 and quota_weights.sum() > 0:
+        quota_counts = get_quota_counts(quota_weights, remaining)
+        leftover = remaining - int(quota_counts.sum())
+        if leftover > 0:
+            quota_counts += rng.multinomial(leftover, quota_weights / quota_weights.sum())
+
+    codes = np.repeat(np.arange(len(distributions), dtype=CRITERIA_CODE_DTYPE), fixed_counts + quota_counts)
+    if remaining > 0:
+        rng.shuffle(codes)
+    return codes
+
+
+def get_criteria_seeds(criteria_table: List[str], criteria_codes: np.ndarray) -> np.ndarray:
+    """Seed each simulation with its criteria offset plus a running per-criteria counter."""
+    offsets = np.array([string_to_int(str(c)) for c in criteria_table], dtype=SEED_DTYPE)
+    counts = np.bincount(criteria_codes, minlength=len(criteria_table))
+    order = np.argsort(criteria_codes, kind="stable")
+    group_starts = np.cumsum(counts) - counts
+    ranks = np.empty(len(criteria_codes), dtype=SEED_DTYPE)
+    ranks[order] = np.arange(len(criteria_codes), dtype=SEED_DTYPE) - group_starts[criteria_codes[order]]
+    return offsets[criteria_codes] + ranks
+
+
+def build_simulation_plan(gamestate: object, betmode_name: str, num_sims: int, set_sim_amount: bool) -> SimulationPlan:
+    """Construct the criteria and seed assignment for all simulations in a betmode."""
+    if not set_sim_amount:
+        num_sims_criteria = get_sim_splits(gamestate, num_sims, betmode_name)
+        criteria_table = list(num_sims_criteria.keys())
+        criteria_codes = assign_sim_criteria(num_sims_criteria, num_sims)
+        simulation_seeds = np.arange(len(criteria_codes), dtype=SEED_DTYPE)
+    else:
+        distributions = gamestate.get_betmode(betmode_name).get_distributions()
+        criteria_table = [str(d.get_criteria()) for d in distributions]
+        criteria_codes = assign_fixed_amount_criteria(distributions, num_sims)
+        simulation_seeds = get_criteria_seeds(criteria_table, criteria_codes)
+
+    return SimulationPlan(criteria_table, criteria_codes, simulation_seeds)
@@ -0,0 +1,130 @@
+"""Confidence-interval stopping rules for adaptive simulation counts."""
+
+import math
+
+
+class SimulationPrecision:
+    """
+    Target precision for adaptive simulation runs.
+
+    Simulations are run in rounds, in sim-id order, until every criteria's mean payout
+    confidence interval half-width is within mean_tolerance (relative to the mean) and its
+    hit-rate half-width is within hit_rate_tolerance (absolute), or max_sims is reached.
+    Criteria with a fixed win_criteria (e.g. wincap, "0") always pay that amount, so one simulation
+    of them is enough and min_criteria_sims does not apply.
+    """
+
+    def __init__(
+        self,
+        mean_tolerance: float = 0.02,
+        hit_rate_tolerance: float = 0.005,
+        z_score: float = 1.96,
+        min_sims: int = 10000,
+        max_sims: int = 1000000,
+        min_criteria_sims: int = 30,
+        max_growth: float = 2.0,
+    ):
+        assert 0 < min_sims <= max_sims, "min_sims must be positive and no larger than max_sims"
+        assert max_growth > 1.0, "max_growth must be greater than 1"
+        self.mean_tolerance = mean_tolerance
+        self.hit_rate_tolerance = hit_rate_tolerance
+        self.z_score = z_score
+        self.min_sims = int(min_sims)
+        self.max_sims = int(max_sims)
+        self.min_criteria_sims = min_criteria_sims
+        self.max_growth = max_growth
+
+    def get_required_ratio(self, criteria_precision: dict) -> float:
+        """Factor by which the simulations of a criteria must grow to meet the tolerances (<= 1 when met)."""
+        if criteria_precision.get("fixed"):
+            return 0.0 if criteria_precision["sims"] > 0 else math.inf
+        if criteria_precision["sims"] < self.min_criteria_sims:
+            return math.inf
+        ratios = [(criteria_precision["hit_rate_half_width"] / self.hit_rate_tolerance) ** 2]
+        if criteria_precision["mean_payout"] > 0:
+            relative_width = criteria_precision["mean_half_width"] / criteria_precision["mean_payout"]
+            ratios.append((relative_width / self.mean_tolerance) ** 2)
+        return max(ratios)
+
+    def is_reached(self, precision_report: dict) -> bool:
+        """True if every criteria meets both tolerances."""
+        return all(self.get_required_ratio(p) <= 1.0 for p in precision_report.values())
+
+    def get_next_target(self, sims_done: int, precision_report: dict) -> int:
+        """
+        Total simulations to reach in the next round. The first round runs min_sims, later rounds
+        extrapolate the count needed by the least precise criteria, growing by at most max_growth.
+        """
+        if sims_done < self.min_sims:
+            return self.min_sims
+        ratio = max((self.get_required_ratio(p) for p in precision_report.values()), default=1.0)
+        growth = min(max(ratio, 1.0), self.max_growth)
+        return min(self.max_sims, max(sims_done + 1, math.ceil(sims_done * growth)))
+
+
+def get_library_criteria_stats(library: dict) -> dict:
+    """Per-criteria [sims, payout sum, payout sum of squares, hits] from simulation books (payouts in bet multiples)."""
+    stats = {}
+    for book in library.values():
+        payout = book["payoutMultiplier"] / 100
+        entry = stats.setdefault(book["criteria"], [0, 0.0, 0.0, 0])
+        entry[0] += 1
+        entry[1] += payout
+        entry[2] += payout * payout
+        entry[3] += payout > 0
+    return stats
+
+
+def merge_criteria_stats(total_stats: dict, chunk_stats: dict) -> dict:
+    """Add the per-criteria sums of one chunk to the running totals."""
+    for criteria, values in chunk_stats.items():
+        entry = total_stats.setdefault(criteria, [0, 0.0, 0.0, 0])
+        for idx, value in enumerate(values):
+            entry[idx] += value
+    return total_stats
+
+
+def get_criteria_precision(criteria_stats: dict, z_score: float = 1.96, fixed_criteria: set = frozenset()) -> dict:
+    """
+    Mean payout and hit-rate with normal-approximation confidence interval half-widths for each criteria.
+    Criteria in fixed_criteria (those with a fixed win_criteria) are marked "fixed".
+    """
+    report = {}
+    for criteria, (sims, payout_sum, payout_sq_sum, hits) in criteria_stats.items():
+        if sims == 0:
+            report[criteria] = {
+                "sims": 0,
+                "mean_payout": 0.0,
+                "mean_half_width": math.inf,
+                "hit_rate": 0.0,
+                "hit_rate_half_width": math.inf,
+                "fixed": criteria in fixed_criteria,
+            }
+            continue
+        mean = payout_sum / sims
+        variance = max(payout_sq_sum / sims - mean * mean, 0.0) * sims / max(sims - 1, 1)
+        hit_rate = hits / sims
+        report[criteria] = {
+            "sims": sims,
+            "mean_payout": mean,
+            "mean_half_width": z_score * math.sqrt(variance / sims),
+            "hit_rate": hit_rate,
+            "hit_rate_half_width": z_score * math.sqrt(hit_rate * (1 - hit_rate) / sims),
+            "fixed": criteria in fixed_criteria,
+        }
+    return report
+
+
+def print_precision_report(betmode: str, precision_report: dict, precision: SimulationPrecision) -> None:
+    """Print achieved precision per criteria."""
+    print(f"\nAchieved precision for {betmode}:")
+    for criteria, p in precision_report.items():
+        if precision.get_required_ratio(p) > 1.0:
+            status = "not reached"
+        else:
+            status = "fixed" if p.get("fixed") else "ok"
+        print(
+            f"  {criteria}: {p['sims']} sims, mean payout {round(p['mean_payout'], 4)} "
+            f"+/- {round(p['mean_half_width'], 4)}, hit-rate {round(p['hit_rate'], 4)} "
+            f"+/- {round(p['hit_rate_half_width'], 4)} [{status}]"
+        )
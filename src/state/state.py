@@ -2,13 +2,23 @@ from copy import copy, deepcopy
 from abc import ABC, abstractmethod
 from warnings import warn
 from decimal import Decimal, ROUND_HALF_UP
-import random
+import time
 
 # from src.config.config import BetMode
 from src.wins.win_manager import WinManager
 from src.calculations.symbol import SymbolStorage
+from src.calculations.reel_windows import ReelWindowTables
+from src.calculations.board_arrays import BoardArrays
+from src.calculations.statistics import set_outcome_sampler
 from src.config.output_filenames import OutputFiles
 from src.state.books import Book
+from src.state.sim_precision import get_library_criteria_stats
+from src.state.phase_timers import PhaseTimers, activate, timed_phase, write_phase_timers
+from src.state.repeat_costs import RepeatCostRecorder, write_repeat_costs
+from src.state.seed_bank import AttemptSeedsExhausted
+from src.state.rng import create_rng
+from src.state.criteria_cache import get_cached_records, write_cache_records
+from src.state.rtp_estimate import record_payout
 from src.write_data.write_data import (
     print_recorded_wins,
     make_lookup_tables,
@@ -30,16 +40,40 @@ class GeneralGameState(ABC):
         self.special_symbol_functions = {}
         self.temp_wins = []
         self.create_symbol_map()
+        self.reel_windows = ReelWindowTables(self.config)
+        self.board_arrays = None
+        if self.config.use_board_arrays:
+            self.board_arrays = BoardArrays(self.symbol_storage, self.config.num_rows)
         self.assign_special_sym_function()
         self.sim = 0
         self.criteria = ""
         self.book = Book(self.sim, self.criteria)
         self.repeat = True
         self.repeat_count = 0
+        self.spin_attempts = 0
+        self.telemetry = None
+        self.phase_timers = None
+        self.repeat_costs = None
+        self.emit_events = True
+        self.estimating = False
+        self.two_phase_spins = False
+        self.search_on_repeat = False
+        self.searching = False
+        self.attempt_rng_state = None
+        self.replay_rng_state = None
+        self.replay_seed = None
+        self.attempt_seeds = None
+        self.attempt_seed = None
+        self.seed_banks = {}
+        self.criteria_cache = None
+        self.imprinted_wins = []
         self.win_data = {
             "totalWin": 0,
             "wins": [],
         }
+        set_outcome_sampler(self.config.outcome_sampler)
+        self.rng = create_rng(self.config.rng_mode)
+        self.simulation_seed = None
         self.reset_seed()
         self.reset_book()
         self.reset_fs_spin()
@@ -84,15 +118,52 @@ class GeneralGameState(ABC):
         self.gametype = self.config.basegame_type
         self.repeat = False
         self.anticipation = [0] * self.config.num_reels
-
-    def reset_seed(self, sim: int = 0, seed_override=None) -> None:
-        """Reset rng seed to simulation number for reproducibility."""
+        self.spin_attempts += 1
+        if self.replay_rng_state is not None:
+            self.rng.setstate(self.replay_rng_state)
+            self.replay_rng_state = None
+        elif self.replay_seed is not None:
+            self.rng.seed(self.replay_seed)
+            self.replay_seed = None
+        elif self.attempt_seeds is not None:
+            self.attempt_seed = next(self.attempt_seeds, None)
+            if self.attempt_seed is None:
+                raise AttemptSeedsExhausted()
+            self.rng.seed(self.attempt_seed)
+        else:
+            self.rng.seed_attempt(self.sim, self.simulation_seed, self.spin_attempts)
+            if self.searching or (self.search_on_repeat and self.spin_attempts > 1):
+                self.emit_events, self.searching = False, True
+                self.attempt_rng_state = self.rng.getstate()
+        if self.phase_timers is not None:
+            self.phase_timers.start_attempt()
+
+    def reset_seed(self, sim: int = 0, seed_override=None, simulation_seed=None) -> None:
+        """
+        Reset rng seed to simulation number for reproducibility.
+        simulation_seed (the criteria seed from the simulation plan) keys the per-attempt streams of rng_mode="philox".
+        """
         if seed_override is not None:
-            random.seed(seed_override + 1)
+            self.rng.seed(seed_override + 1)
         else:
-            random.seed(sim + 1)
+            self.rng.seed(sim + 1)
+        self.simulation_seed = simulation_seed
         self.sim = sim
         self.repeat_count = 0
+        self.spin_attempts = 0
+
+    def enable_phase_timers(self) -> None:
+        """Collect per-criteria phase timings and counters in run_sims()."""
+        self.phase_timers = PhaseTimers()
+
+    def enable_repeat_costs(self) -> None:
+        """Record spin attempts and wall time of every accepted simulation in run_sims()."""
+        self.repeat_costs = RepeatCostRecorder()
+
+    def count_phase(self, counter: str, amount: int = 1) -> None:
+        """Increment a named phase counter for the current criteria, does nothing when phase timers are off."""
+        if self.phase_timers is not None:
+            self.phase_timers.count(counter, amount)
 
     def reset_fs_spin(self) -> None:
         """Use if using repeat during freespin games."""
@@ -142,6 +213,8 @@ class GeneralGameState(ABC):
         Freespin triggers are most commonly used, i.e {"kind": X, "symbol": "S", "gametype": "basegame"}
         It is recommended to otherwise record rare events with several keys in order to reduce the overall file-size containing many duplicate ids
         """
+        if self.estimating:
+            return
         dstr = {}
         for k, v in description.items():
             dstr[str(k)] = str(v)
@@ -155,19 +228,24 @@ class GeneralGameState(ABC):
             if keyValue[0] not in current_mode_force_keys:
                 self.get_current_betmode().add_force_key(keyValue[0])  # type:ignore
 
-    def combine(self, modes, betmode_name) -> None:
-        """Retrieve unique force record keys."""
-        for modeConfig in modes:
-            for betmode in modeConfig:
-                if betmode.get_name() == betmode_name:
-                    break
-            force_keys = betmode.get_force_keys()  # type:ignore
+    def combine(self, force_key_lists, betmode_name) -> None:
+        """Merge unique force record keys returned by each worker batch."""
+        for force_keys in force_key_lists:
             for key in force_keys:
                 if key not in self.get_betmode(betmode_name).get_force_keys():  # type:ignore
                     self.get_betmode(betmode_name).add_force_key(key)  # type:ignore
 
+    @timed_phase("imprint_wins")
     def imprint_wins(self) -> None:
         """Record all events to library if criteria conditions are satisfied."""
+        if self.searching or self.estimating:
+            return
+        self.record_force_results()
+        self.library[self.sim + 1] = copy(self.book.to_json())
+        self.win_manager.update_end_round_wins()
+
+    def record_force_results(self) -> None:
+        """Add the force record descriptions of the accepted spin to recorded_events."""
         for temp_win_index in range(int(len(self.temp_wins) / 2)):
             description = tuple(sorted(self.temp_wins[2 * temp_win_index].items()))
             book_id = self.temp_wins[2 * temp_win_index + 1]
@@ -182,8 +260,26 @@ class GeneralGameState(ABC):
                     "timesTriggered": 1,
                     "bookIds": [book_id],
                 }
-        self.temp_wins = []
-        self.library[self.sim + 1] = copy(self.book.to_json())
+        self.imprinted_wins, self.temp_wins = self.temp_wins, []
+
+    def get_cache_record(self, sim: int, criteria: str, simulation_seed) -> dict:
+        """Everything imprint_wins() recorded for the last simulation, for the criteria cache."""
+        return {
+            "sim": sim,
+            "criteria": criteria,
+            "seed": simulation_seed,
+            "book": self.library[sim + 1],
+            "force": self.imprinted_wins,
+            "wins": [self.win_manager.basegame_wins, self.win_manager.freegame_wins],
+        }
+
+    def restore_cached_sim(self, record: dict) -> None:
+        """Record a cached simulation as if run_spin() had produced it."""
+        self.sim = record["sim"]
+        self.temp_wins = record["force"]
+        self.record_force_results()
+        self.library[self.sim + 1] = record["book"]
+        self.win_manager.basegame_wins, self.win_manager.freegame_wins = record["wins"]
         self.win_manager.update_end_round_wins()
 
     def _quantize_tenth(self, value: float) -> float:
@@ -228,6 +324,94 @@ class GeneralGameState(ABC):
         self.repeat_count += 1
         self.check_current_repeat_count()
 
+    def run_two_phase_spin(self, sim: int, simulation_seed=None) -> None:
+        """
+        Run run_spin() with events turned off from the first repeated attempt onwards, then replay only the
+        accepted attempt from the RNG state recorded by its reset_book() with events on, giving the same book
+        as run_spin(). Sims accepted on their first attempt are not replayed.
+        Every attempt must start with reset_book(), and events must not draw random numbers or decide acceptance.
+        """
+        self.search_on_repeat = True
+        try:
+            self.run_spin(sim, simulation_seed)
+        finally:
+            searched = self.searching
+            self.emit_events, self.searching, self.search_on_repeat = True, False, False
+        if not searched:
+            return
+        spin_attempts, repeat_count = self.spin_attempts, self.repeat_count
+        search_payout = self.book.payout_multiplier
+        if self.phase_timers is not None:
+            self.phase_timers.end_attempt("accepted_attempt")
+
+        self.replay_rng_state = self.attempt_rng_state
+        try:
+            self.run_spin(sim, simulation_seed)
+        finally:
+            self.replay_rng_state = None
+        if self.spin_attempts != 1 or self.book.payout_multiplier != search_payout:
+            raise RuntimeError(
+                f"Replay of simulation {sim} ({self.criteria}) did not reproduce the accepted attempt, "
+                "events must not change random draws or criteria checks when using two-phase spins."
+            )
+        if self.phase_timers is not None:
+            self.phase_timers.end_attempt("replayed_attempt")
+        self.spin_attempts, self.repeat_count = spin_attempts, repeat_count
+
+    def mine_attempt_seeds(self, betmode: str, criteria: str, candidate_start: int, candidate_end: int) -> list:
+        """
+        Screen attempt seeds [candidate_start, candidate_end) for a criteria with events off, seeding every
+        attempt of the repeat loop with the next candidate. Returns the candidates whose attempt was accepted.
+        """
+        self.win_manager = WinManager(
+            self.config.basegame_type, self.config.freegame_type, self.get_betmode(betmode).get_wincap()
+        )
+        self.library = {}
+        self.recorded_events = {}
+        self.betmode = betmode
+        self.criteria = criteria
+        accepted = []
+        self.attempt_seeds = iter(range(candidate_start, candidate_end))
+        self.emit_events, self.searching = False, True
+        try:
+            while True:
+                self.run_spin(candidate_start)
+                accepted.append(self.attempt_seed)
+        except AttemptSeedsExhausted:
+            pass
+        finally:
+            self.attempt_seeds, self.attempt_seed = None, None
+            self.emit_events, self.searching = True, False
+        return accepted
+
+    def estimate_sims(self, betmode: str, sims: list) -> dict:
+        """
+        Run run_spin() for a list of (sim, criteria, seed) with events, force records and the library
+        turned off, returning per-criteria payout sums and histograms (see src/state/rtp_estimate.py).
+        """
+        self.win_manager = WinManager(
+            self.config.basegame_type, self.config.freegame_type, self.get_betmode(betmode).get_wincap()
+        )
+        self.library = {}
+        self.recorded_events = {}
+        self.betmode = betmode
+        criteria_stats = {}
+        self.emit_events, self.estimating = False, True
+        try:
+            for sim, criteria, simulation_seed in sims:
+                self.criteria = criteria
+                self.run_spin(sim, simulation_seed)
+                record_payout(
+                    criteria_stats,
+                    criteria,
+                    self.book.payout_multiplier,
+                    self.book.basegame_wins,
+                    self.book.freegame_wins,
+                )
+        finally:
+            self.emit_events, self.estimating = True, False
+        return criteria_stats
+
     @abstractmethod
     def run_spin(self, sim, simulation_seed):
         """run_spin should be defined in gamestate."""
@@ -240,19 +424,17 @@ class GeneralGameState(ABC):
 
     def run_sims(
         self,
-        betmode_copy_list,
         betmode,
-        sim_to_criteria,
-        total_threads,
-        total_repeats,
-        num_sims,
-        thread_index,
-        repeat_count,
+        sim_start,
+        sim_end,
+        plan,
+        chunk_index,
         compress=True,
         write_event_list=True,
-        simulation_seeds=[],
-    ) -> None:
-        """Assigns criteria and runs individual simulations. Results are stored in temporary file to be combined when all threads are finished."""
+    ) -> dict:
+        """Runs simulations [sim_start, sim_end), reading criteria and seeds from the shared simulation plan.
+        Results are stored in temporary files to be combined when all batches are finished,
+        only a small summary of the batch is returned to the caller."""
         mode_max_win = None
         for bm in self.config.bet_modes:
             if bm._name.lower() == betmode.lower():
@@ -263,34 +445,104 @@ class GeneralGameState(ABC):
         self.library = {}
         self.recorded_events = {}
         self.betmode = betmode
+        num_sims = sim_end - sim_start
         self.num_sims = num_sims
-        for sim in range(
-            thread_index * num_sims + (total_threads * num_sims) * repeat_count,
-            (thread_index + 1) * num_sims + (total_threads * num_sims) * repeat_count,
-        ):
-            self.criteria = sim_to_criteria[sim]
-            self.run_spin(sim, simulation_seeds[sim])
+        telemetry = self.telemetry
+        if telemetry is not None:
+            telemetry.start_chunk(betmode, chunk_index)
+        timers = self.phase_timers
+        activate(timers)
+        repeat_costs = self.repeat_costs
+        seed_banks = self.seed_banks.get(betmode, {})
+        bank_ranks = {criteria: plan.count_criteria(criteria, sim_start) for criteria in seed_banks}
+        cache_records, cached_sims = None, {}
+        if self.criteria_cache is not None:
+            cache_records = []
+            if self.criteria_cache.get(betmode):
+                cached_sims = get_cached_records(self.criteria_cache[betmode], sim_start, sim_end)
+        phase_start = time.perf_counter()
+        for sim, criteria, simulation_seed in plan.iter_sims(sim_start, sim_end):
+            self.criteria = criteria
+            cached = cached_sims.get(sim) if cached_sims else None
+            if cached is not None and cached["criteria"] == criteria and cached["seed"] == simulation_seed:
+                self.restore_cached_sim(cached)
+                cache_records.append(cached)
+                if telemetry is not None:
+                    telemetry.record_sim(sim, criteria, 1)
+                continue
+            banked_seeds = seed_banks.get(criteria)
+            if banked_seeds is not None:
+                if bank_ranks[criteria] < len(banked_seeds):
+                    self.replay_seed = banked_seeds[bank_ranks[criteria]]
+                bank_ranks[criteria] += 1
+            if timers is not None:
+                timers.set_criteria(criteria)
+            if repeat_costs is not None:
+                sim_start_time = time.perf_counter()
+            if self.two_phase_spins:
+                self.run_two_phase_spin(sim, simulation_seed)
+            else:
+                self.run_spin(sim, simulation_seed)
+            self.replay_seed = None
+            if repeat_costs is not None:
+                repeat_costs.record(criteria, self.spin_attempts, time.perf_counter() - sim_start_time)
+            if timers is not None:
+                timers.finish_sim()
+            if telemetry is not None:
+                telemetry.record_sim(sim, criteria, self.spin_attempts)
+            if cache_records is not None:
+                cache_records.append(self.get_cache_record(sim, criteria, simulation_seed))
+        phase_times = {"simulate": time.perf_counter() - phase_start}
+        if cache_records is not None:
+            write_cache_records(
+                cache_records, self.output_files.get_temp_criteria_cache_name(betmode, chunk_index, sim_start, sim_end)
+            )
+        activate(None)
+        if timers is not None:
+            write_phase_timers(timers.drain(), self.output_files.get_temp_phase_timer_name(betmode, chunk_index))
+        if repeat_costs is not None:
+            write_repeat_costs(repeat_costs.drain(), self.output_files.get_temp_repeat_cost_name(betmode, chunk_index))
         mode_cost = self.get_current_betmode().get_cost()
 
         print(
-            "Thread " + str(thread_index),
+            "Chunk " + str(chunk_index),
             "finished with",
-            round(self.win_manager.total_cumulative_wins / (num_sims * mode_cost), 3),
+            round(self.win_manager.total_cumulative_wins / (max(num_sims, 1) * mode_cost), 3),
             "RTP.",
-            f"[baseGame: {round(self.win_manager.cumulative_base_wins/(num_sims*mode_cost), 3)}, freeGame: {round(self.win_manager.cumulative_free_wins/(num_sims*mode_cost), 3)}]",
+            f"[baseGame: {round(self.win_manager.cumulative_base_wins/(max(num_sims, 1)*mode_cost), 3)}, freeGame: {round(self.win_manager.cumulative_free_wins/(max(num_sims, 1)*mode_cost), 3)}]",
             flush=True,
         )
 
+        phase_start = time.perf_counter()
         write_json(
             self,
-            self.output_files.get_temp_multi_thread_name(
-                betmode, thread_index, repeat_count, (compress) * True + (not compress) * False
-            ),
+            self.output_files.get_temp_multi_thread_name(betmode, chunk_index, compress),
         )
-        print_recorded_wins(self, self.output_files.get_temp_force_name(betmode, thread_index, repeat_count))
-        make_lookup_tables(self, self.output_files.get_temp_lookup_name(betmode, thread_index, repeat_count))
-        make_lookup_pay_split(self, self.output_files.get_temp_segmented_name(betmode, thread_index, repeat_count))
+        phase_times["write_books"] = time.perf_counter() - phase_start
+        phase_start = time.perf_counter()
+        print_recorded_wins(self, self.output_files.get_temp_force_name(betmode, chunk_index))
+        make_lookup_tables(self, self.output_files.get_temp_lookup_name(betmode, chunk_index))
+        make_lookup_pay_split(self, self.output_files.get_temp_segmented_name(betmode, chunk_index))
+        phase_times["write_lookups"] = time.perf_counter() - phase_start
 
         if write_event_list:
+            phase_start = time.perf_counter()
             write_library_events(self, list(self.library.values()), betmode)
-        betmode_copy_list.append(self.config.bet_modes)
+            phase_times["write_events"] = time.perf_counter() - phase_start
+
+        if telemetry is not None:
+            for phase, seconds in phase_times.items():
+                telemetry.add_phase(phase, seconds)
+            telemetry.send()
+
+        return {
+            "betmode": betmode,
+            "chunk_index": chunk_index,
+            "compress": compress,
+            "num_sims": num_sims,
+            "force_keys": list(self.get_current_betmode().get_force_keys()),
+            "total_wins": self.win_manager.total_cumulative_wins,
+            "base_wins": self.win_manager.cumulative_base_wins,
+            "free_wins": self.win_manager.cumulative_free_wins,
+            "criteria_stats": get_library_criteria_stats(self.library),
+        }
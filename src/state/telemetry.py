@@ -0,0 +1,269 @@
+"""Structured progress metrics published by simulation workers and aggregated by the coordinator."""
+
+import os
+import json
+import time
+import threading
+from queue import Empty
+from collections import deque
+
+PUBLISH_INTERVAL = 1.0
+WRITE_INTERVAL = 5.0
+RATE_WINDOW = 12
+
+
+class WorkerTelemetry:
+    """
+    Per-worker counters for the run_sims loop.
+
+    record_sim() is called once per accepted simulation and only updates a couple of counters;
+    a cumulative snapshot is handed to publish() at most once per interval.
+    """
+
+    def __init__(self, publish, interval: float = PUBLISH_INTERVAL):
+        self.publish = publish
+        self.interval = interval
+        self.worker = str(os.getpid())
+        self.counts = {}
+        self.phases = {}
+        self.current_counts = {}
+        self.betmode = None
+        self.chunk_index = None
+        self.current_sim = None
+        self.sims_done = 0
+        self.last_sims_done = 0
+        self.last_publish = time.perf_counter()
+        self.next_publish = self.last_publish + interval
+        self.sims_per_sec = 0.0
+
+    def start_chunk(self, betmode: str, chunk_index: int) -> None:
+        """Switch counters to a new (betmode, chunk) work item."""
+        self.betmode = betmode
+        self.chunk_index = chunk_index
+        self.current_counts = self.counts.setdefault(betmode, {})
+
+    def record_sim(self, sim: int, criteria: str, attempts: int) -> None:
+        """Count one accepted simulation and the rejected attempts before it."""
+        entry = self.current_counts.get(criteria)
+        if entry is None:
+            entry = self.current_counts[criteria] = [0, 0]
+        entry[0] += 1
+        entry[1] += max(attempts - 1, 0)
+        self.sims_done += 1
+        self.current_sim = sim
+        now = time.perf_counter()
+        if now >= self.next_publish:
+            self.send(now)
+
+    def add_phase(self, phase: str, seconds: float) -> None:
+        """Accumulate time spent in a named phase of the chunk."""
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def send(self, now: float = None) -> None:
+        """Publish a cumulative snapshot of this worker's counters."""
+        now = time.perf_counter() if now is None else now
+        elapsed = now - self.last_publish
+        if elapsed > 0:
+            self.sims_per_sec = (self.sims_done - self.last_sims_done) / elapsed
+        self.last_publish, self.last_sims_done = now, self.sims_done
+        self.next_publish = now + self.interval
+        self.publish(
+            {
+                "worker": self.worker,
+                "betmode": self.betmode,
+                "chunk_index": self.chunk_index,
+                "current_sim": self.current_sim,
+                "sims_done": self.sims_done,
+                "sims_per_sec": self.sims_per_sec,
+                "attempts": {mode: {c: list(n) for c, n in counts.items()} for mode, counts in self.counts.items()},
+                "phases": dict(self.phases),
+            }
+        )
+
+
+class TelemetryCollector:
+    """
+    Aggregate worker snapshots into run-level progress and an ETA.
+
+    Snapshots arrive on a multiprocessing queue (pool workers) or through update() (in-process runs).
+    A background thread appends the aggregate to a JSONL file and rewrites a Prometheus textfile.
+    """
+
+    def __init__(self, game_id: str, jsonl_path: str, prom_path: str, queue=None, interval: float = WRITE_INTERVAL):
+        self.game_id = game_id
+        self.jsonl_path = jsonl_path
+        self.prom_path = prom_path
+        self.queue = queue
+        self.interval = interval
+        self.workers = {}
+        self.planned = {}
+        self.start_time = time.time()
+        self.rate_samples = deque(maxlen=RATE_WINDOW)
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+        for path in (jsonl_path, prom_path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(jsonl_path, "w", encoding="UTF-8").close()
+
+    def start(self) -> "TelemetryCollector":
+        """Start the background aggregation thread."""
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        return self
+
+    def run(self) -> None:
+        next_write = time.time() + self.interval
+        while not self.stopped.is_set():
+            self.drain(timeout=min(0.5, self.interval))
+            if time.time() >= next_write:
+                self.write(print_progress=True)
+                next_write = time.time() + self.interval
+
+    def drain(self, timeout: float = 0.0) -> None:
+        """Read all pending worker snapshots from the queue."""
+        if self.queue is None:
+            self.stopped.wait(timeout)
+            return
+        try:
+            snapshot = self.queue.get(timeout=timeout) if timeout > 0 else self.queue.get_nowait()
+            while True:
+                self.update(snapshot)
+                snapshot = self.queue.get_nowait()
+        except Empty:
+            pass
+
+    def stop(self) -> None:
+        """Stop the thread, read any remaining snapshots and write the final metrics."""
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+        self.drain()
+        self.write()
+
+    def add_planned(self, betmode: str, num_sims: int) -> None:
+        """Register simulations queued for a betmode, used for the ETA."""
+        with self.lock:
+            self.planned[betmode] = self.planned.get(betmode, 0) + num_sims
+
+    def update(self, snapshot: dict) -> None:
+        """Keep the latest cumulative snapshot from each worker."""
+        with self.lock:
+            self.workers[snapshot["worker"]] = snapshot
+
+    def aggregate(self) -> dict:
+        """Combine worker snapshots into run totals, throughput and ETA."""
+        with self.lock:
+            workers = dict(self.workers)
+            planned = dict(self.planned)
+        now = time.time()
+        attempts, phases, completed = {}, {}, {}
+        for snapshot in workers.values():
+            for betmode, criteria_counts in snapshot["attempts"].items():
+                for criteria, (accepted, rejected) in criteria_counts.items():
+                    entry = attempts.setdefault(betmode, {}).setdefault(criteria, [0, 0])
+                    entry[0] += accepted
+                    entry[1] += rejected
+                    completed[betmode] = completed.get(betmode, 0) + accepted
+            for phase, seconds in snapshot["phases"].items():
+                phases[phase] = phases.get(phase, 0.0) + seconds
+
+        sims_done = sum(completed.values())
+        self.rate_samples.append((now, sims_done))
+        first_time, first_done = self.rate_samples[0]
+        if now > first_time and sims_done > first_done:
+            sims_per_sec = (sims_done - first_done) / (now - first_time)
+        else:
+            sims_per_sec = sims_done / max(now - self.start_time, 1e-9)
+        remaining = max(sum(planned.values()) - sims_done, 0)
+        return {
+            "time": now,
+            "elapsed": now - self.start_time,
+            "sims_done": sims_done,
+            "sims_planned": sum(planned.values()),
+            "sims_per_sec": sims_per_sec,
+            "eta_seconds": remaining / sims_per_sec if sims_per_sec > 0 else None,
+            "betmodes": {
+                betmode: {"planned": planned.get(betmode, 0), "done": completed.get(betmode, 0)}
+                for betmode in sorted(set(planned) | set(completed))
+            },
+            "attempts": {
+                betmode: {criteria: {"accepted": a, "rejected": r} for criteria, (a, r) in counts.items()}
+                for betmode, counts in attempts.items()
+            },
+            "phases": phases,
+            "workers": {
+                worker: {
+                    "betmode": snapshot["betmode"],
+                    "chunk_index": snapshot["chunk_index"],
+                    "current_sim": snapshot["current_sim"],
+                    "sims_per_sec": snapshot["sims_per_sec"],
+                }
+                for worker, snapshot in workers.items()
+            },
+        }
+
+    def write(self, print_progress: bool = False) -> dict:
+        """Append the aggregate to the JSONL file and replace the Prometheus textfile."""
+        metrics = self.aggregate()
+        with open(self.jsonl_path, "a", encoding="UTF-8") as f:
+            f.write(json.dumps(metrics) + "\n")
+        temp_prom_path = self.prom_path + ".tmp"
+        with open(temp_prom_path, "w", encoding="UTF-8") as f:
+            f.write(format_prometheus(self.game_id, metrics))
+        os.replace(temp_prom_path, self.prom_path)
+        if print_progress and metrics["sims_planned"] > 0:
+            eta = metrics["eta_seconds"]
+            print(
+                f"Progress: {metrics['sims_done']}/{metrics['sims_planned']} sims, "
+                f"{round(metrics['sims_per_sec'], 1)} sims/s, ETA {'?' if eta is None else round(eta)}s",
+                flush=True,
+            )
+        return metrics
+
+
+def format_prometheus(game_id: str, metrics: dict) -> str:
+    """Render aggregated metrics in the Prometheus text exposition format."""
+    game = f'game="{game_id}"'
+    lines = []
+
+    def add(name, metric_type, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in samples:
+            lines.append(f"{name}{{{','.join([game] + labels)}}} {value}")
+
+    add("sim_sims_done_total", "counter", "Accepted simulations.", [([], metrics["sims_done"])])
+    add("sim_sims_planned", "gauge", "Simulations queued in this run.", [([], metrics["sims_planned"])])
+    add("sim_sims_per_second", "gauge", "Recent simulation throughput.", [([], metrics["sims_per_sec"])])
+    if metrics["eta_seconds"] is not None:
+        eta_help = "Estimated seconds until all queued simulations finish."
+        add("sim_eta_seconds", "gauge", eta_help, [([], metrics["eta_seconds"])])
+    add(
+        "sim_attempts_total",
+        "counter",
+        "Spin attempts by criteria and outcome.",
+        [
+            ([f'betmode="{betmode}"', f'criteria="{criteria}"', f'result="{result}"'], counts[result])
+            for betmode, criteria_counts in metrics["attempts"].items()
+            for criteria, counts in criteria_counts.items()
+            for result in ("accepted", "rejected")
+        ],
+    )
+    add(
+        "sim_phase_seconds_total",
+        "counter",
+        "Worker time spent per phase.",
+        [([f'phase="{phase}"'], seconds) for phase, seconds in metrics["phases"].items()],
+    )
+    add(
+        "sim_worker_current_sim",
+        "gauge",
+        "Simulation id currently running on each worker.",
+        [
+            ([f'worker="{worker}"'], state["current_sim"])
+            for worker, state in metrics["workers"].items()
+            if state["current_sim"] is not None
+        ],
+    )
+    return "\n".join(lines) + "\n"
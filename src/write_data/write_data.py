@@ -9,6 +9,8 @@ import json
 import ast
 import zstandard as zstd
 
+from src.state.sim_plan import get_sim_chunks
+
 
 def get_sha_256(file_to_hash: str):
     """Get human readable hash of file."""
@@ -132,17 +134,38 @@ def output_lookup_and_force_files(
     gamestate: object,
     num_sims: int = 1000000,
     compress: bool = True,
+    num_chunks: int = None,
 ):
-    """Combine temporary lookup tables and force files into a single output."""
+    """Combine temporary lookup tables and force files into a single output.
+    num_chunks is derived from the sim count unless the chunk layout was not fixed upfront (adaptive runs)."""
+    if num_chunks is None:
+        num_chunks = len(get_sim_chunks(num_sims, threads, batching_size))
+    output_files = gamestate.output_files
+    merge_output_files(
+        game_id,
+        betmode,
+        gamestate,
+        book_files=[output_files.get_temp_multi_thread_name(betmode, idx, compress) for idx in range(num_chunks)],
+        force_files=[output_files.get_temp_force_name(betmode, idx) for idx in range(num_chunks)],
+        lookup_files=[output_files.get_temp_lookup_name(betmode, idx) for idx in range(num_chunks)],
+        segmented_files=[output_files.get_temp_segmented_name(betmode, idx) for idx in range(num_chunks)],
+        compress=compress,
+    )
+
+
+def merge_output_files(
+    game_id: str,
+    betmode: str,
+    gamestate: object,
+    book_files: list,
+    force_files: list,
+    lookup_files: list,
+    segmented_files: list,
+    compress: bool = True,
+):
+    """Concatenate per-chunk books, force records and lookup tables (given in sim-id order) into the final outputs."""
     print("Saving books for ", game_id, "in", betmode)
-    num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
-    file_list = []
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            file_list.append(
-                gamestate.output_files.get_temp_multi_thread_name(betmode, thread, repeat_index, compress)
-            )
-
+    file_list = book_files
     if compress:
         temp_book_output_path = os.path.join(gamestate.output_files.book_path, "temp_book_output.json")
         with open(temp_book_output_path, "w", encoding="UTF-8") as outfile:
@@ -179,14 +202,7 @@ def output_lookup_and_force_files(
 
     print("Saving force files for", game_id, "in", betmode)
     force_results_dict = {}
-    file_list = []
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            file_list.append(
-                gamestate.output_files.get_temp_force_name(betmode, thread, repeat_index),
-            )
-
-    for filename in file_list:
+    for filename in force_files:
         force_chunk = ast.literal_eval(json.load(open(filename, "r", encoding="UTF-8")))
         for key in force_chunk:
             if force_results_dict.get(key) is not None:
@@ -224,24 +240,14 @@ def output_lookup_and_force_files(
     with open(json_file_path, "w", encoding="UTF-8") as file:
         file.write(json_object)
 
-    weights_plus_wins_file_list = []
-    segmented_lut_file_list = []
     print("Saving LUTs for", game_id, "in", betmode)
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            weights_plus_wins_file_list += [
-                gamestate.output_files.get_temp_lookup_name(betmode, thread, repeat_index)
-            ]
-            segmented_lut_file_list += [
-                gamestate.output_files.get_temp_segmented_name(betmode, thread, repeat_index)
-            ]
 
     with open(
         gamestate.output_files.get_final_lookup_name(betmode),
         "w",
         encoding="UTF-8",
     ) as outfile:
-        for filename in weights_plus_wins_file_list:
+        for filename in lookup_files:
             with open(filename, "r", encoding="UTF-8") as infile:
                 outfile.write(infile.read())
 
@@ -256,7 +262,7 @@ def output_lookup_and_force_files(
         "w",
         encoding="UTF-8",
     ) as outfile:
-        for filename in segmented_lut_file_list:
+        for filename in segmented_files:
             with open(filename, "r", encoding="UTF-8") as infile:
                 outfile.write(infile.read())
 
@@ -0,0 +1,61 @@
+"""Test betmode cost estimates used to order concurrent simulation."""
+
+from src.config.betmode import BetMode
+from src.config.distributions import Distribution
+from src.state.run_sims import estimate_betmode_cost
+
+
+def make_betmode(cost, distributions):
+    return BetMode(
+        name="mode",
+        cost=cost,
+        rtp=0.97,
+        max_win=5000,
+        auto_close_disabled=False,
+        is_feature=True,
+        is_buybonus=cost > 1,
+        distributions=distributions,
+    )
+
+
+def test_forced_criteria_cost_more():
+    """Forced freegame and wincap criteria increase the per-simulation estimate."""
+    basegame = make_betmode(1.0, [Distribution(criteria="basegame", quota=1, conditions={"reel_weights": {}})])
+    freegame = make_betmode(
+        1.0,
+        [Distribution(criteria="freegame", quota=1, conditions={"reel_weights": {}, "force_freegame": True})],
+    )
+    wincap = make_betmode(
+        1.0,
+        [
+            Distribution(
+                criteria="wincap",
+                quota=1,
+                win_criteria=5000,
+                conditions={"reel_weights": {}, "force_freegame": True, "force_wincap": True},
+            )
+        ],
+    )
+    costs = [estimate_betmode_cost(bm, 1000) for bm in (basegame, freegame, wincap)]
+    assert costs == sorted(costs)
+    assert costs[0] == 1000
+
+
+def test_buy_modes_cost_more():
+    """Higher bet cost modes are scheduled ahead of the base mode with the same criteria mix."""
+    conditions = {"reel_weights": {}, "force_freegame": True}
+    base = make_betmode(1.0, [Distribution(criteria="freegame", quota=1, conditions=dict(conditions))])
+    buy = make_betmode(100.0, [Distribution(criteria="freegame", quota=1, conditions=dict(conditions))])
+    assert estimate_betmode_cost(buy, 100) > estimate_betmode_cost(base, 100)
+
+
+def test_fixed_amount_distributions():
+    """Fixed simulation amounts contribute their exact count to the estimate."""
+    betmode = make_betmode(
+        1.0,
+        [
+            Distribution(criteria="fixed", fixed_amt=10, conditions={"reel_weights": {}}),
+            Distribution(criteria="basegame", quota=0.5, conditions={"reel_weights": {}}),
+        ],
+    )
+    assert estimate_betmode_cost(betmode, 100) == 100
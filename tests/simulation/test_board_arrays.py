@@ -0,0 +1,37 @@
+"""Test the integer board arrays and the array-based scatter evaluation."""
+
+from types import SimpleNamespace
+
+from src.calculations.symbol import SymbolStorage, attribute_flag
+from src.calculations.board_arrays import BoardArrays
+from src.calculations.scatter import Scatter
+
+
+def make_board(storage, names):
+    board = [[storage.create_symbol_state(name) for name in reel] for reel in names]
+    board[0][1].assign_attribute({"multiplier": 3})
+    board[2][0].assign_attribute({"multiplier": 2})
+    return board
+
+
+def test_scatter_wins_match_symbol_evaluation():
+    """Counting on the arrays gives the same wins, positions and explode flags as scanning the Symbol board."""
+    config = SimpleNamespace(
+        special_symbols={"wild": ["W"], "multiplier": ["W"]},
+        paytable={(4, "H1"): 2.0, (5, "H1"): 5.0, (6, "L1"): 1.0},
+    )
+    storage = SymbolStorage(config, ["H1", "L1", "W"])
+    names = [["L1", "W", "H1"], ["H1", "L1", "L1"], ["W", "H1", "L1"]]
+
+    expected = Scatter.get_scatterpay_wins(config, make_board(storage, names), global_multiplier=2)
+    board = make_board(storage, names)
+    arrays = BoardArrays(storage, [3, 3, 3])
+    arrays.set_board(board)
+    arrays.update()
+    assert arrays.count_symbols().tolist() == [3, 4, 2]
+
+    wins = Scatter.get_scatterpay_wins(config, board, global_multiplier=2, board_arrays=arrays)
+    assert wins == expected
+    assert [win["symbol"] for win in wins["wins"]] == ["L1", "H1"]
+    assert all(symbol.check_attribute("explode") for reel in board for symbol in reel)
+    assert (arrays.flags & attribute_flag("explode") > 0).all()
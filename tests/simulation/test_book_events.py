@@ -0,0 +1,21 @@
+"""Test that event functions are skipped while event emission is off."""
+
+from types import SimpleNamespace
+
+from src.events.events import set_total_event
+
+
+def test_book_event_skipped_without_emission():
+    added = []
+    gamestate = SimpleNamespace(
+        emit_events=False,
+        book=SimpleNamespace(events=[], add_event=added.append),
+        win_manager=SimpleNamespace(running_bet_win=1.5),
+        config=SimpleNamespace(wincap=100),
+    )
+    set_total_event(gamestate)
+    assert added == []
+
+    gamestate.emit_events = True
+    set_total_event(gamestate)
+    assert added == [{"index": 0, "type": "setTotalWin", "amount": 150}]
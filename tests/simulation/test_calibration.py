@@ -0,0 +1,28 @@
+"""Test threads and batch size selection from calibration measurements."""
+
+from src.state.calibration import choose_threads_and_batch, LIBRARY_MEMORY_FACTOR
+
+MiB = 2**20
+
+
+def test_batch_size_from_chunk_time_when_memory_allows():
+    """With ample memory every core is used and chunks of the cheapest betmode last the target time."""
+    measurements = {
+        "base": {"seconds_per_sim": 0.001, "book_bytes": 10 * 1024},
+        "bonus": {"seconds_per_sim": 0.02, "book_bytes": 100 * 1024},
+    }
+    decision = choose_threads_and_batch(measurements, 64 * 1024 * MiB, 8, 100 * MiB, target_chunk_seconds=5.0)
+    assert decision["threads"] == 8
+    assert decision["batch_size"] == 5000
+    assert decision["batch_limited_by"] == "chunk_time"
+
+
+def test_ram_budget_limits_threads_and_batch_size():
+    """Workers that would not fit the budget are dropped and the batch is capped by the memory left per worker."""
+    measurements = {"base": {"seconds_per_sim": 0.0001, "book_bytes": MiB / LIBRARY_MEMORY_FACTOR}}
+    decision = choose_threads_and_batch(measurements, 1000 * MiB, 16, 100 * MiB, min_batch_size=100)
+    assert decision["threads"] == 5
+    assert decision["threads_limited_by"] == "memory"
+    assert decision["batch_size"] == 100
+    assert decision["batch_limited_by"] == "memory"
+    assert decision["peak_bytes"] <= 1000 * MiB
@@ -0,0 +1,23 @@
+"""Test criteria cache records are read back only for reusable criteria in the requested range."""
+
+from src.state.criteria_cache import write_cache_records, get_cached_records
+
+
+def test_cached_records_filtered_by_range_and_criteria(tmp_path):
+    records = [
+        {"sim": sim, "criteria": "freegame" if sim % 3 == 0 else "0", "seed": sim, "book": {"id": sim + 1}}
+        for sim in range(10)
+    ]
+    write_cache_records(records[:5], str(tmp_path / "0_0_5.jsonl.zst"))
+    write_cache_records(records[5:], str(tmp_path / "1_5_10.jsonl.zst"))
+    betmode_cache = {
+        "dir": str(tmp_path),
+        "criteria": ["0"],
+        "segments": [
+            {"file": "0_0_5.jsonl.zst", "sim_start": 0, "sim_end": 5},
+            {"file": "1_5_10.jsonl.zst", "sim_start": 5, "sim_end": 10},
+        ],
+    }
+    cached = get_cached_records(betmode_cache, 4, 8)
+    assert sorted(cached) == [4, 5, 7]
+    assert cached[7] == records[7]
@@ -0,0 +1,45 @@
+"""Test worker budget scheduling of multi-game batch runs."""
+
+from src.state.game_batch import GameStage, apply_batch_stage, pick_stages
+
+
+def test_pool_stages_share_free_workers():
+    """Simulation stages split the free workers evenly, post-processing stages take one worker."""
+    pending = [GameStage("a", "sims"), GameStage("b", "sims"), GameStage("c", "sims")]
+    starts = pick_stages(pending, 8, 0, 2, 8)
+    assert [(stage.game_id, workers) for stage, workers in starts] == [("a", 3), ("b", 3), ("c", 2)]
+
+    pending = [GameStage("a", "post"), GameStage("b", "sims")]
+    starts = pick_stages(pending, 4, 1, 2, 3)
+    assert [(stage.kind, workers) for stage, workers in starts] == [("post", 1), ("sims", 3)]
+
+
+def test_pool_stage_waits_for_minimum_share():
+    """A simulation stage waits for min_workers while other stages run, but never idles the whole budget."""
+    pending = [GameStage("b", "sims")]
+    assert pick_stages(pending, 1, 1, 2, 8) == []
+    assert [workers for _, workers in pick_stages(pending, 1, 0, 2, 8)] == [1]
+
+
+def test_batch_stage_keeps_only_its_steps(monkeypatch):
+    """run.py settings keep only the stage's steps, honour skipped steps and zero unselected modes."""
+    num_sim_args = {"base": 100, "bonus": 50}
+    run_conditions = {"run_sims": True, "run_optimization": True, "run_analysis": False, "run_format_checks": True}
+    monkeypatch.delenv("BATCH_STAGE", raising=False)
+    assert apply_batch_stage(num_sim_args, run_conditions, ["base", "bonus"]) == (
+        num_sim_args,
+        run_conditions,
+        ["base", "bonus"],
+    )
+
+    monkeypatch.setenv("BATCH_STAGE", "sims")
+    monkeypatch.setenv("BATCH_MODES", "bonus")
+    monkeypatch.setenv("BATCH_SKIP", "")
+    sims, conditions, modes = apply_batch_stage(num_sim_args, run_conditions, ["base", "bonus"])
+    assert sims == {"base": 0, "bonus": 50} and modes == ["bonus"]
+    assert [c for c, enabled in conditions.items() if enabled] == ["run_sims"]
+
+    monkeypatch.setenv("BATCH_STAGE", "post")
+    monkeypatch.setenv("BATCH_SKIP", "run_format_checks")
+    _, conditions, _ = apply_batch_stage(num_sim_args, run_conditions, ["base", "bonus"])
+    assert [c for c, enabled in conditions.items() if enabled] == ["run_optimization"]
@@ -0,0 +1,41 @@
+"""Test cached get_random_outcome samplers."""
+
+import random
+
+from src.calculations.statistics import get_random_outcome, set_outcome_sampler, get_sampler, AliasSampler
+
+
+def linear_scan_outcome(distribution: dict):
+    roll = random.uniform(0, sum(distribution.values()))
+    cumulative = 0.0
+    for value, weight in distribution.items():
+        cumulative += weight
+        if cumulative >= roll:
+            return value
+
+
+def test_exact_sampler_reproduces_linear_scan():
+    """The default sampler gives the same draws and leaves the same random state as a linear scan."""
+    distribution = {2: 0.5, 3: 0, 5: 1.25, 10: 3, 50: 0.01}
+    random.seed(7)
+    expected = [linear_scan_outcome(distribution) for _ in range(2000)]
+    expected_state = random.getstate()
+    random.seed(7)
+    assert [get_random_outcome(distribution) for _ in range(2000)] == expected
+    assert random.getstate() == expected_state
+    assert get_sampler(distribution) is get_sampler(distribution)
+
+
+def test_alias_sampler_matches_weights():
+    """Alias tables draw each value with probability proportional to its weight."""
+    distribution = {"a": 1, "b": 3, "c": 6}
+    set_outcome_sampler("alias")
+    try:
+        assert isinstance(get_sampler(distribution), AliasSampler)
+        random.seed(1)
+        draws = [get_random_outcome(distribution) for _ in range(20000)]
+    finally:
+        set_outcome_sampler("exact")
+    for value, weight in distribution.items():
+        assert abs(draws.count(value) / len(draws) - weight / 10) < 0.02
+    assert not isinstance(get_sampler(distribution), AliasSampler)
@@ -0,0 +1,46 @@
+"""Test phase timer collection and per-criteria breakdowns."""
+
+from src.state import phase_timers
+from src.state.phase_timers import PhaseTimers, activate, timed_phase, merge_phase_timers, format_phase_breakdown
+
+
+@timed_phase("custom")
+def custom_phase(value):
+    return value * 2
+
+
+def test_timed_phase_only_records_while_active():
+    """Decorated calls are charged to the current criteria only while timers are active."""
+    timers = PhaseTimers()
+    timers.set_criteria("basegame")
+    assert custom_phase(2) == 4
+    assert timers.criteria["basegame"]["phases"] == {}
+
+    activate(timers)
+    try:
+        custom_phase(1)
+        custom_phase(1)
+        timers.count("bombs", 3)
+    finally:
+        activate(None)
+    assert phase_timers._active_timers is None
+    assert timers.criteria["basegame"]["phases"]["custom"][0] == 2
+    assert timers.criteria["basegame"]["counters"] == {"bombs": 3}
+
+
+def test_rejected_attempts_and_breakdown():
+    """Attempts before the accepted one are reported as rejected repeats, chunks merge per criteria."""
+    timers = PhaseTimers()
+    timers.set_criteria("freegame")
+    for _ in range(3):
+        timers.start_attempt()
+    timers.finish_sim()
+    chunk = timers.drain()
+    assert chunk["freegame"]["phases"]["rejected_repeats"][0] == 2
+    assert chunk["freegame"]["phases"]["accepted_attempt"][0] == 1
+    assert timers.criteria == {}
+
+    total = merge_phase_timers(merge_phase_timers({}, chunk), chunk)
+    breakdown = format_phase_breakdown("bonus", total)
+    assert breakdown["total"]["sims"] == 2
+    assert breakdown["criteria"]["freegame"]["phases"]["rejected_repeats"]["calls"] == 4
@@ -0,0 +1,46 @@
+"""Test merging of per-chunk simulation profiles."""
+
+import pstats
+from collections import Counter
+
+from src.state.profiling import (
+    read_collapsed_stacks,
+    write_collapsed_stacks,
+    get_sampled_function_counts,
+    merge_betmode_profiles,
+    run_profiled,
+)
+
+
+def busy_loop(n):
+    return sum(i * i for i in range(n))
+
+
+def test_collapsed_stack_round_trip(tmp_path):
+    """Collapsed stacks survive a write/read cycle and sum self and inclusive counts per function."""
+    stacks = Counter({"run_sims;run_spin;draw_board": 3, "run_sims;run_spin;evaluate": 2, "run_sims;write": 1})
+    path = str(tmp_path / "chunk.stacks")
+    write_collapsed_stacks(stacks, path)
+    assert read_collapsed_stacks(path) == stacks
+
+    self_counts, inclusive_counts = get_sampled_function_counts(stacks)
+    assert self_counts["draw_board"] == 3
+    assert inclusive_counts["run_spin"] == 5
+    assert inclusive_counts["run_sims"] == 6
+
+
+def test_merge_chunk_profiles(tmp_path):
+    """Chunk profiles merge into one pstats file with summed call counts and a text report."""
+    for chunk in range(2):
+        assert run_profiled(busy_loop, {"n": 1000}, str(tmp_path / f"{chunk}.prof"), str(tmp_path / f"{chunk}.stacks"))
+    merge_betmode_profiles(
+        [str(tmp_path / f"{chunk}.prof") for chunk in range(2)],
+        [str(tmp_path / f"{chunk}.stacks") for chunk in range(2)],
+        str(tmp_path / "out" / "merged.prof"),
+        str(tmp_path / "out" / "merged.collapsed"),
+        str(tmp_path / "out" / "merged.txt"),
+    )
+    stats = pstats.Stats(str(tmp_path / "out" / "merged.prof"))
+    calls = [v[1] for k, v in stats.stats.items() if k[2] == "busy_loop"]
+    assert calls == [2]
+    assert "busy_loop" in (tmp_path / "out" / "merged.txt").read_text()
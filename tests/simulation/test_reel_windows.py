@@ -0,0 +1,135 @@
+"""Test precomputed reel windows."""
+
+import itertools
+import random
+from types import SimpleNamespace
+
+from src.calculations.board import Board
+from src.calculations.reel_windows import build_reel_windows, ReelWindowTables
+
+
+def test_windows_wrap_with_padding_and_specials():
+    """Windows wrap around the strip, padding is the symbol either side, specials record rows and scatter reach."""
+    reel = ["H1", "S", "L1", "W", "S"]
+    windows = build_reel_windows(reel, 3, {"wild": {"W"}, "scatter": {"S"}}, {"S"})
+
+    assert len(windows) == len(reel)
+    window = windows[3]
+    assert window.symbols == ("W", "S", "H1")
+    assert (window.top, window.bottom) == ("L1", "S")
+    assert window.specials == (("wild", (0,), 0), ("scatter", (1,), 1))
+    assert windows[2].specials == (("wild", (1,), 0), ("scatter", (2,), 1))
+    assert windows[0].specials == (("scatter", (1,), 1),)
+
+
+def test_target_index_counts_and_samples_exact_boards():
+    """Board counts match enumeration with stacked scatters, and sampled boards always show the requested count."""
+    config = SimpleNamespace(
+        special_symbols={"scatter": ["S"]},
+        reels={"BR0": [["S", "S", "L1", "H1"], ["L1", "S", "H1"], ["S", "S", "S"]]},
+        num_rows=[2, 2, 2],
+        num_reels=3,
+    )
+    tables = ReelWindowTables(config)
+    index = tables.get_target_index("BR0", "scatter")
+    windows = tables.get_windows("BR0")
+    enumerated = {}
+    for stops in itertools.product(*(range(len(reel)) for reel in config.reels["BR0"])):
+        count = sum(windows[reel][stop].symbols.count("S") for reel, stop in enumerate(stops))
+        enumerated[count] = enumerated.get(count, 0) + 1
+
+    assert {k: index.count_boards(k) for k in range(7) if index.count_boards(k)} == enumerated
+    assert index.target_stops == [[0, 1], [1], [0, 1, 2]]
+    assert not index.can_retry(3)
+    rng = random.Random(7)
+    for _ in range(50):
+        stops = index.sample_stops(3, rng)
+        assert sum(windows[reel][stop].symbols.count("S") for reel, stop in enumerate(stops)) == 3
+    assert tables.get_conditional_weights({"BR0": 1}, "scatter", 1) == {}
+
+
+def test_constrained_index_matches_enumeration():
+    """Valid-only counts match enumerating boards checked by BoardConstraints, and samples are always valid."""
+    config = SimpleNamespace(
+        special_symbols={"scatter": ["S"], "super_scatter": ["BS"]},
+        reels={"BR0": [["S", "S", "L1", "BS"], ["L1", "S", "BS", "H1"], ["BS", "S", "L1"]]},
+        num_rows=[2, 2, 2],
+        num_reels=3,
+        board_constraints={
+            "max_per_reel": {"scatter": 1},
+            "max_per_board": {"super_scatter": 1},
+            "exclusive_reels": [["scatter", "super_scatter"]],
+        },
+    )
+    tables = ReelWindowTables(config)
+    constraints = tables.get_constraints()
+    index = tables.get_target_index("BR0", "scatter", valid_only=True)
+    windows = tables.get_windows("BR0")
+    enumerated = {}
+    for stops in itertools.product(*(range(len(reel)) for reel in config.reels["BR0"])):
+        board = [list(windows[reel][stop].symbols) for reel, stop in enumerate(stops)]
+        if constraints.is_valid_board(board):
+            count = sum(reel.count("S") for reel in board)
+            enumerated[count] = enumerated.get(count, 0) + 1
+
+    assert {k: index.count_boards(k) for k in range(4) if index.count_boards(k)} == enumerated
+    assert tables.get_target_index("BR0", None, valid_only=True).count_boards(0) == sum(enumerated.values())
+    rng = random.Random(3)
+    for _ in range(50):
+        stops = index.sample_stops(1, rng)
+        board = [list(windows[reel][stop].symbols) for reel, stop in enumerate(stops)]
+        assert constraints.is_valid_board(board)
+        assert sum(reel.count("S") for reel in board) == 1
+
+
+class RetryBoard(Board):
+    """Board whose force_board_from_reelstrips() only records the scatter rows of the drawn windows."""
+
+    def __init__(self, config):
+        self.config = config
+        self.gametype = "basegame"
+        self.rng = random.Random(11)
+        self.reel_windows = ReelWindowTables(config)
+        self.drawn_strips = []
+
+    def get_current_distribution_conditions(self):
+        return {"reel_weights": {"basegame": {"BR0": 1, "NOSCAT": 1}}}
+
+    def force_board_from_reelstrips(self, reelstrip_id, force_stop_positions):
+        self.drawn_strips.append(reelstrip_id)
+        windows = self.reel_windows.get_windows(reelstrip_id)
+        stops = [force_stop_positions.get(reel, 0) for reel in range(self.config.num_reels)]
+        self.special_syms_on_board = {
+            "scatter": [
+                name for reel, stop in enumerate(stops) for name in windows[reel][stop].symbols if name == "S"
+            ]
+        }
+
+    def assign_special_sym_function(self):
+        pass
+
+    def run_spin(self, sim, simulation_seed=None):
+        pass
+
+    def run_freespin(self):
+        pass
+
+
+def test_retry_draws_only_strips_that_can_land_the_count():
+    """A weighted reelstrip without enough scatter reels is left out of the retry draw instead of crashing it."""
+    config = SimpleNamespace(
+        special_symbols={"scatter": ["S"]},
+        reels={
+            "BR0": [["S", "L1", "H1"], ["L1", "S", "H1"], ["H1", "L1", "S"]],
+            "NOSCAT": [["L1", "L1", "H1"], ["L1", "H1", "H1"], ["H1", "L1", "L1"]],
+        },
+        num_rows=[1, 1, 1],
+        num_reels=3,
+        force_board_sampler="retry",
+    )
+    board = RetryBoard(config)
+    for _ in range(20):
+        board.force_special_board("scatter", 3)
+        assert board.count_special_symbols("scatter") == 3
+    assert set(board.drawn_strips) == {"BR0"}
+    assert board.reel_windows.get_retry_weights({"BR0": 1, "NOSCAT": 1}, "scatter", 3) == {"BR0": 1}
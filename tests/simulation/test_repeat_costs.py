@@ -0,0 +1,40 @@
+"""Test repeat cost recording, percentiles and dominant criteria flags."""
+
+from src.state.repeat_costs import (
+    RepeatCostRecorder,
+    merge_repeat_costs,
+    get_histogram_percentile,
+    get_attempt_buckets,
+    get_repeat_cost_report,
+)
+
+
+def test_histogram_percentiles_and_buckets():
+    histogram = {"1": 90, "3": 9, "40": 1}
+    assert get_histogram_percentile(histogram, 50) == 1
+    assert get_histogram_percentile(histogram, 95) == 3
+    assert get_histogram_percentile(histogram, 100) == 40
+    assert get_attempt_buckets(histogram) == {"1": 90, "3-4": 9, "33-64": 1}
+
+
+def test_report_flags_criteria_dominated_by_rejections():
+    """Chunks merge by addition and the criteria burning most time on rejected attempts is flagged."""
+    chunks = []
+    for _ in range(2):
+        recorder = RepeatCostRecorder()
+        for _ in range(10):
+            recorder.record("basegame", 1, 0.001)
+        recorder.record("wincap", 50, 0.05)
+        chunks.append(recorder.drain())
+
+    total = {}
+    for chunk in chunks:
+        merge_repeat_costs(total, chunk)
+    report = get_repeat_cost_report("base", total)
+    assert report["sims"] == 22
+    assert report["dominant_criteria"] == ["wincap"]
+    wincap = report["criteria"]["wincap"]
+    assert wincap["attempts"] == 100
+    assert wincap["attempt_percentiles"]["p50"] == 50
+    assert abs(wincap["seconds_per_attempt"] - 0.001) < 1e-12
+    assert report["criteria"]["basegame"]["rejected_seconds"] == 0.0
@@ -0,0 +1,56 @@
+"""Test gamestate-owned random number generators."""
+
+import pickle
+import random
+
+from src.state.rng import create_rng, MersenneTwisterRNG, PhiloxRNG
+
+
+def test_mersenne_mode_reproduces_random_module():
+    """Compatibility mode draws from the random module's sequence, including after a pickle round trip."""
+    rng = pickle.loads(pickle.dumps(create_rng("mersenne")))
+    assert isinstance(rng, MersenneTwisterRNG)
+    rng.seed(11)
+    rng.seed_attempt(10, 1234, 2)
+    draws = [rng.randrange(50), rng.choice("abcdef"), rng.uniform(0, 3), rng.choices([1, 2, 3], [1, 1, 5])[0]]
+    random.seed(11)
+    assert draws == [random.randrange(50), random.choice("abcdef"), random.uniform(0, 3), random.choices([1, 2, 3], [1, 1, 5])[0]]
+
+
+def test_philox_streams_per_attempt():
+    """Each (sim, seed, attempt) has its own reproducible stream, and saved states replay exactly."""
+    rng = create_rng("philox")
+    assert isinstance(rng, PhiloxRNG)
+    rng.seed_attempt(4, 99, 1)
+    first = [rng.randrange(1000) for _ in range(5)]
+    rng.seed_attempt(4, 99, 2)
+    second = [rng.randrange(1000) for _ in range(5)]
+    rng.seed_attempt(4, 99, 1)
+    assert [rng.randrange(1000) for _ in range(5)] == first
+    assert first != second
+
+    state = rng.getstate()
+    expected = [rng.random() for _ in range(600)]
+    copy = pickle.loads(pickle.dumps(rng))
+    rng.setstate(state)
+    assert [rng.random() for _ in range(600)] == expected
+    assert [copy.random() for _ in range(10)] == [rng.random() for _ in range(10)]
+
+
+def test_reel_stops_from_buffered_blocks():
+    """Mersenne reel stops keep the per-reel randrange sequence, Philox stops are bounded, uniform and reproducible."""
+    lengths = [30, 1, 7, 1200]
+    rng = create_rng("mersenne")
+    rng.seed(3)
+    stops = rng.reel_stops(lengths)
+    random.seed(3)
+    assert stops == [random.randrange(0, length) for length in lengths]
+
+    rng = create_rng("philox")
+    rng.seed_attempt(1, 2, 1)
+    draws = [rng.reel_stops(lengths) for _ in range(3000)]
+    rng.seed_attempt(1, 2, 1)
+    assert rng.reel_stops(lengths) == draws[0]
+    assert all(0 <= stop < length for stops in draws for stop, length in zip(stops, lengths))
+    counts = [sum(stops[2] == value for stops in draws) for value in range(7)]
+    assert min(counts) > 3000 / 7 * 0.8
@@ -0,0 +1,28 @@
+"""Test RTP estimate aggregation and reports."""
+
+from src.state.rtp_estimate import get_payout_bucket, get_payout_bucket_label, record_payout, merge_rtp_stats, get_rtp_report
+
+
+def test_payout_buckets():
+    """Zero payouts have their own bucket, wins fall in [edge, next edge) ranges."""
+    assert get_payout_bucket_label(get_payout_bucket(0.0)) == "0"
+    assert get_payout_bucket_label(get_payout_bucket(0.5)) == "0-1"
+    assert get_payout_bucket_label(get_payout_bucket(2.0)) == "2-5"
+    assert get_payout_bucket_label(get_payout_bucket(25000.0)) == "10000+"
+
+
+def test_rtp_report_per_criteria_and_betmode():
+    """Chunks merge by addition, RTP is divided by the betmode cost."""
+    chunk = {}
+    record_payout(chunk, "freegame", 20.0, 1.0, 19.0)
+    record_payout(chunk, "basegame", 0.0, 0.0, 0.0)
+    total = merge_rtp_stats(merge_rtp_stats({}, chunk), chunk)
+
+    report = get_rtp_report("bonus", 10.0, total)
+    assert report["sims"] == 4
+    assert report["rtp"] == 1.0
+    assert report["free_rtp"] == 0.95
+    assert report["hit_rate"] == 0.5
+    assert report["histogram"] == {"0": 2, "20-50": 2}
+    assert report["criteria"]["freegame"]["rtp"] == 2.0
+    assert report["criteria"]["basegame"]["hit_rate"] == 0.0
@@ -0,0 +1,54 @@
+"""Test run manifest checkpointing and config fingerprints."""
+
+import os
+
+from src.config.fingerprint import stable_hash
+from src.state.run_manifest import RunManifest
+
+
+def write_chunk(tmp_path, name, content):
+    path = os.path.join(tmp_path, name)
+    with open(path, "w", encoding="UTF-8") as f:
+        f.write(content)
+    return path
+
+
+def start_run(tmp_path, fingerprint="abc", resume=False):
+    manifest = RunManifest.load_or_create(os.path.join(tmp_path, "run_manifest.json"), fingerprint, resume)
+    manifest.start_betmode("base", 20, [(0, 10), (10, 20)])
+    return manifest
+
+
+def test_stable_hash_ignores_dict_order():
+    """Fingerprints do not depend on dict insertion order."""
+    assert stable_hash({"a": 1, "b": (1, 2)}) == stable_hash({"b": (1, 2), "a": 1})
+    assert stable_hash({"a": 1.0}) != stable_hash({"a": 1.5})
+
+
+def test_resume_skips_recorded_chunks(tmp_path):
+    """Recorded chunks with unchanged files are reported as completed when resuming."""
+    manifest = start_run(tmp_path)
+    path = write_chunk(tmp_path, "books_0.json", "chunk 0")
+    manifest.record_chunk("base", 0, {"force_keys": ["key"]}, [path])
+
+    resumed = start_run(tmp_path, resume=True)
+    assert resumed.get_completed_chunks("base") == {0: {"force_keys": ["key"]}}
+
+    write_chunk(tmp_path, "books_0.json", "modified")
+    assert resumed.get_completed_chunks("base") == {}
+
+
+def test_changes_discard_progress(tmp_path):
+    """A new fingerprint, a new chunk layout or resume=False starts from scratch."""
+    manifest = start_run(tmp_path)
+    path = write_chunk(tmp_path, "books_0.json", "chunk 0")
+    manifest.record_chunk("base", 0, {"force_keys": []}, [path])
+    manifest.mark_merged("base", [path])
+    assert start_run(tmp_path, resume=True).is_merged("base")
+
+    assert start_run(tmp_path, fingerprint="changed", resume=True).get_completed_chunks("base") == {}
+    manifest = start_run(tmp_path, fingerprint="changed")
+    manifest.record_chunk("base", 0, {"force_keys": []}, [path])
+    resumed = RunManifest.load_or_create(os.path.join(tmp_path, "run_manifest.json"), "changed", True)
+    resumed.start_betmode("base", 30, [(0, 15), (15, 30)])
+    assert resumed.get_completed_chunks("base") == {}
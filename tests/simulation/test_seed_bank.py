@@ -0,0 +1,49 @@
+"""Test seed bank fingerprints and invalidation."""
+
+from types import SimpleNamespace
+
+from src.config.betmode import BetMode
+from src.config.distributions import Distribution
+from src.config.fingerprint import GAME_TOOLING_SCRIPTS, get_criteria_fingerprint, get_source_hash
+from src.state.seed_bank import SeedBank
+
+
+def make_config(wincap_quota: float, wincap_mult: float):
+    distributions = [
+        Distribution(criteria="wincap", quota=wincap_quota, win_criteria=5000.0, conditions={"reel_weights": {}}),
+        Distribution(criteria="0", quota=0.5, win_criteria=0.0, conditions={"reel_weights": {"BR0": wincap_mult}}),
+    ]
+    betmode = BetMode("base", 1.0, 0.97, 5000.0, False, False, False, distributions)
+    return SimpleNamespace(game_id="no_such_game", wincap=5000.0, bet_modes=[betmode])
+
+
+def test_criteria_fingerprint_ignores_quotas_and_other_criteria():
+    fingerprint = get_criteria_fingerprint(make_config(0.001, 1), "base", "wincap")
+    assert get_criteria_fingerprint(make_config(0.01, 2), "base", "wincap") == fingerprint
+    assert get_criteria_fingerprint(make_config(0.001, 2), "base", "0") != get_criteria_fingerprint(
+        make_config(0.001, 1), "base", "0"
+    )
+
+
+def test_bank_is_discarded_on_fingerprint_mismatch(tmp_path):
+    path = str(tmp_path / "seed_bank" / "base_wincap.json")
+    SeedBank("base", "wincap", "abc", [11, 42], 100).save(path)
+
+    bank = SeedBank.load(path, "base", "wincap", "abc")
+    assert bank.seeds == [11, 42] and bank.next_candidate == 100
+
+    stale = SeedBank.load(path, "base", "wincap", "def")
+    assert stale.seeds == [] and not (tmp_path / "seed_bank" / "base_wincap.json").exists()
+
+
+def test_source_hash_covers_subpackages_but_not_tooling(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "gamestate.py").write_text("a = 1\n")
+    (tmp_path / "pkg" / "wins.py").write_text("b = 1\n")
+    (tmp_path / "run.py").write_text("threads = 4\n")
+    source_hash = get_source_hash(str(tmp_path), GAME_TOOLING_SCRIPTS)
+
+    (tmp_path / "run.py").write_text("threads = 8\n")
+    assert get_source_hash(str(tmp_path), GAME_TOOLING_SCRIPTS) == source_hash
+    (tmp_path / "pkg" / "wins.py").write_text("b = 2\n")
+    assert get_source_hash(str(tmp_path), GAME_TOOLING_SCRIPTS) != source_hash
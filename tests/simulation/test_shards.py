@@ -0,0 +1,67 @@
+"""Test shard ordering and coverage checks used when merging multi-host runs."""
+
+import pytest
+
+from src.state.shards import check_shard_file, order_betmode_shards
+from src.write_data.write_data import get_sha_256
+
+
+def make_shard(sim_start, sim_end, num_sims=100, fingerprint="abc"):
+    return {
+        "betmode": "base",
+        "sim_start": sim_start,
+        "sim_end": sim_end,
+        "num_sims": num_sims,
+        "compress": True,
+        "fingerprint": fingerprint,
+    }
+
+
+def test_shards_ordered_by_sim_id():
+    """Shards are merged in sim-id order regardless of discovery order, duplicates are dropped."""
+    shards = [make_shard(60, 100), make_shard(0, 30), make_shard(30, 60), make_shard(0, 30)]
+    ordered = order_betmode_shards(shards)
+    assert [(s["sim_start"], s["sim_end"]) for s in ordered] == [(0, 30), (30, 60), (60, 100)]
+
+
+@pytest.mark.parametrize(
+    "shards",
+    [
+        [make_shard(0, 30), make_shard(40, 100)],
+        [make_shard(0, 50), make_shard(40, 100)],
+        [make_shard(0, 30), make_shard(30, 90)],
+        [make_shard(0, 50), make_shard(50, 100, fingerprint="other")],
+    ],
+)
+def test_invalid_shard_sets(shards):
+    """Gaps, overlaps, missing tail simulations and mixed configs are rejected."""
+    with pytest.raises(RuntimeError):
+        order_betmode_shards(shards)
+
+
+@pytest.mark.parametrize(
+    "shards, message",
+    [
+        ([make_shard(0, 30), make_shard(40, 100)], r"missing simulations at \[30, 40\)"),
+        ([make_shard(0, 100), make_shard(50, 100)], r"overlapping simulations at \[50, 100\)"),
+        ([make_shard(0, 30), make_shard(30, 90)], r"missing simulations \[90, 100\)"),
+    ],
+)
+def test_coverage_errors_report_the_interval(shards, message):
+    """Gap and overlap errors name the affected sim-id range, lowest id first."""
+    with pytest.raises(RuntimeError, match=message):
+        order_betmode_shards(shards)
+
+
+def test_missing_or_changed_shard_file(tmp_path):
+    """Missing and modified shard files raise the same RuntimeError."""
+    path = tmp_path / "books_0.jsonl"
+    path.write_text("{}\n")
+    sha256 = get_sha_256(str(path))
+    check_shard_file(str(path), sha256)
+
+    path.write_text("{} \n")
+    with pytest.raises(RuntimeError, match="does not match its recorded hash"):
+        check_shard_file(str(path), sha256)
+    with pytest.raises(RuntimeError, match="is missing"):
+        check_shard_file(str(tmp_path / "books_1.jsonl"), sha256)
@@ -0,0 +1,111 @@
+"""Test simulation plan generation and memory-mapped storage."""
+
+import pickle
+import numpy as np
+import pytest
+
+from src.config.betmode import BetMode
+from src.config.distributions import Distribution
+from src.state.sim_plan import (
+    SimulationPlan,
+    build_simulation_plan,
+    get_sim_chunks,
+    get_sim_splits,
+    get_quota_counts,
+    assign_sim_criteria,
+    string_to_int,
+)
+
+
+class PlanGamestate:
+    """Minimal gamestate exposing betmode lookup."""
+
+    def __init__(self, distributions):
+        self.bet_mode = BetMode(
+            name="base",
+            cost=1.0,
+            rtp=0.97,
+            max_win=5000,
+            auto_close_disabled=False,
+            is_feature=True,
+            is_buybonus=False,
+            distributions=distributions,
+        )
+
+    def get_betmode(self, mode_name):
+        return self.bet_mode
+
+
+def quota_distributions():
+    return [
+        Distribution(criteria="wincap", quota=0.001, conditions={"reel_weights": {}}),
+        Distribution(criteria="freegame", quota=0.1, conditions={"reel_weights": {}}),
+        Distribution(criteria="0", quota=0.4, conditions={"reel_weights": {}}),
+        Distribution(criteria="basegame", quota=0.5, conditions={"reel_weights": {}}),
+    ]
+
+
+def test_sim_splits_sum_to_num_sims():
+    """Criteria counts always cover every simulation, with at least one of each criteria."""
+    gamestate = PlanGamestate(quota_distributions())
+    for num_sims in [10, 999, 12345]:
+        splits = get_sim_splits(gamestate, num_sims, "base")
+        assert sum(splits.values()) == num_sims
+        assert min(splits.values()) >= 1
+
+
+def test_assigned_criteria_match_splits():
+    """Shuffled codes keep the requested number of simulations per criteria."""
+    splits = {"a": 3, "b": 5, "c": 2}
+    codes = assign_sim_criteria(splits, 10)
+    assert np.bincount(codes).tolist() == [3, 5, 2]
+    assert np.array_equal(codes, assign_sim_criteria(splits, 10))
+
+
+def test_fixed_amount_plan_seeds():
+    """Fixed amounts are honoured and seeds count up from each criteria offset."""
+    distributions = [
+        Distribution(criteria="wincap", fixed_amt=7, conditions={"reel_weights": {}}),
+        Distribution(criteria="basegame", quota=0.5, conditions={"reel_weights": {}}),
+        Distribution(criteria="0", quota=0.5, conditions={"reel_weights": {}}),
+    ]
+    plan = build_simulation_plan(PlanGamestate(distributions), "base", 100, set_sim_amount=True)
+    assert len(plan) == 100
+    criteria = [plan.get_criteria(sim) for sim in range(len(plan))]
+    assert criteria.count("wincap") == 7
+    for name in ["wincap", "basegame", "0"]:
+        seeds = [plan.get_seed(sim) for sim in range(len(plan)) if criteria[sim] == name]
+        assert seeds == [string_to_int(name) + i for i in range(len(seeds))]
+
+
+def test_quota_counts_shrink_the_remainder():
+    """Each quota distribution takes its share of what the distributions before it left unassigned."""
+    assert get_quota_counts(np.array([0.0, 0.5, 0.5]), 93).tolist() == [0, 46, 23]
+    assert get_quota_counts(np.array([0.2, 0.8]), 1).tolist() == [1, 0]
+
+
+def test_saved_plan_pickles_as_paths(tmp_path):
+    """Saved plans are re-opened as memory maps rather than copied through pickle."""
+    plan = build_simulation_plan(PlanGamestate(quota_distributions()), "base", 5000, set_sim_amount=False)
+    expected = list(plan.iter_sims(100, 200))
+    plan.save(str(tmp_path / "codes.npy"), str(tmp_path / "seeds.npy"))
+    payload = pickle.dumps(plan)
+    assert len(payload) < 1000
+    restored = pickle.loads(payload)
+    assert isinstance(restored.criteria_codes, np.memmap)
+    assert list(restored.iter_sims(100, 200)) == expected
+
+
+def test_plan_rejects_mismatched_arrays():
+    with pytest.raises(AssertionError):
+        SimulationPlan(["a"], np.zeros(3, dtype=np.int16), np.zeros(2, dtype=np.int64))
+
+
+def test_sim_chunks_cover_remainders():
+    """Chunks are contiguous, capped at batch size and include any remainder."""
+    for num_sims, threads, batch_size in [(203, 3, 50), (10, 4, 2500), (100000, 8, 2500), (1, 1, 1)]:
+        chunks = get_sim_chunks(num_sims, threads, batch_size)
+        assert chunks[0][0] == 0 and chunks[-1][1] == num_sims
+        assert all(prev[1] == nxt[0] for prev, nxt in zip(chunks, chunks[1:]))
+        assert max(end - start for start, end in chunks) <= batch_size
+    assert get_sim_chunks(0, 4, 100) == []
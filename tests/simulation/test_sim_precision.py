@@ -0,0 +1,64 @@
+"""Test confidence-interval stopping rules for adaptive simulation counts."""
+
+import math
+
+from src.state.sim_precision import (
+    SimulationPrecision,
+    get_library_criteria_stats,
+    merge_criteria_stats,
+    get_criteria_precision,
+)
+
+
+def make_library(payouts, criteria="basegame"):
+    return {idx: {"payoutMultiplier": int(p * 100), "criteria": criteria} for idx, p in enumerate(payouts)}
+
+
+def test_chunk_stats_merge_to_full_stats():
+    """Summing per-chunk statistics matches statistics over all books."""
+    payouts = [0, 1.5, 0, 2.0, 10.0, 0, 0.2]
+    total = {}
+    merge_criteria_stats(total, get_library_criteria_stats(make_library(payouts[:3])))
+    merge_criteria_stats(total, get_library_criteria_stats(make_library(payouts[3:])))
+    assert total == get_library_criteria_stats(make_library(payouts))
+
+    report = get_criteria_precision(total)["basegame"]
+    assert report["sims"] == 7
+    assert math.isclose(report["mean_payout"], sum(payouts) / 7)
+    assert math.isclose(report["hit_rate"], 4 / 7)
+
+
+def test_precision_stopping():
+    """Constant payouts are precise once enough criteria sims exist, unsampled criteria never are."""
+    precision = SimulationPrecision(min_sims=10, max_sims=1000, min_criteria_sims=5)
+    constant = get_criteria_precision({"wincap": [20, 20 * 5000.0, 20 * 5000.0**2, 20]})
+    assert precision.is_reached(constant)
+
+    unsampled = get_criteria_precision({"wincap": [0, 0.0, 0.0, 0]})
+    assert not precision.is_reached(unsampled)
+    assert precision.get_next_target(100, unsampled) == 200
+
+
+def test_next_target_extrapolates_and_caps():
+    """Rounds start at min_sims, grow towards the estimated requirement and stop at max_sims."""
+    precision = SimulationPrecision(
+        mean_tolerance=0.25, hit_rate_tolerance=0.08, min_sims=100, max_sims=1000, min_criteria_sims=1
+    )
+    assert precision.get_next_target(0, {}) == 100
+
+    report = get_criteria_precision({"basegame": [100, 50.0, 50.0, 50]})
+    ratio = (report["basegame"]["hit_rate_half_width"] / 0.08) ** 2
+    assert 1 < ratio < 2
+    assert precision.get_next_target(100, report) == math.ceil(100 * ratio)
+    assert precision.get_next_target(900, get_criteria_precision({"basegame": [0, 0.0, 0.0, 0]})) == 1000
+
+
+def test_fixed_win_criteria_skip_the_minimum():
+    """A sampled criteria with a fixed win_criteria is met from one simulation, an unsampled one is not."""
+    precision = SimulationPrecision(min_sims=10, max_sims=1000, min_criteria_sims=30)
+    stats = {"wincap": [1, 5000.0, 5000.0**2, 1], "0": [3, 0.0, 0.0, 0]}
+    assert not precision.is_reached(get_criteria_precision(stats))
+    report = get_criteria_precision(stats, fixed_criteria={"wincap", "0"})
+    assert report["wincap"]["fixed"] and precision.is_reached(report)
+    unsampled = get_criteria_precision({"wincap": [0, 0.0, 0.0, 0]}, fixed_criteria={"wincap"})
+    assert not precision.is_reached(unsampled)
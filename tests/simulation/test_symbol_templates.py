@@ -0,0 +1,41 @@
+"""Test symbol prototypes and attribute flags."""
+
+import pickle
+from types import SimpleNamespace
+
+from src.calculations.symbol import SymbolStorage, attribute_flag
+
+
+def make_storage():
+    config = SimpleNamespace(
+        special_symbols={"wild": ["W"], "multiplier": ["W"], "scatter": ["S"]},
+        paytable={(3, "H1"): 1.0, (4, "H1"): 2.0},
+    )
+    return SymbolStorage(config, ["W", "S", "H1"])
+
+
+def test_instances_copy_prototype_attributes():
+    """Assigned attributes stay on the instance, checks follow the hasattr/bool rules of check_attribute."""
+    storage = make_storage()
+    wild = storage.create_symbol_state("W")
+    wild.assign_attribute({"multiplier": 3})
+    wild.explode = True
+
+    assert wild.check_attribute("wild") and wild.special and wild.multiplier == 3
+    assert wild.check_flags(attribute_flag("scatter", "explode"))
+    assert list(wild.attributes) == ["wild", "multiplier", "explode"]
+    assert storage.symbols["W"].multiplier is True
+    assert not storage.create_symbol_state("W").check_attribute("explode")
+
+    wild.explode = False
+    assert not wild.check_attribute("explode", "scatter")
+    assert storage.create_symbol_state("H1").paytable == [{"3": 1.0}, {"4": 2.0}]
+    assert not hasattr(storage.create_symbol_state("H1"), "multiplier")
+
+
+def test_instances_pickle():
+    storage = make_storage()
+    scatter = storage.create_symbol_state("S")
+    scatter.assign_attribute({"prize": 0})
+    restored = pickle.loads(pickle.dumps(scatter))
+    assert restored == "S" and restored.check_attribute("scatter", "prize") and restored.prize == 0
@@ -0,0 +1,42 @@
+"""Test worker telemetry aggregation and metric output."""
+
+from src.state.telemetry import WorkerTelemetry, TelemetryCollector, format_prometheus
+
+
+def test_collector_aggregates_workers(tmp_path):
+    """Latest snapshots from each worker are summed into run totals and an ETA."""
+    collector = TelemetryCollector("game", str(tmp_path / "m.jsonl"), str(tmp_path / "m.prom"))
+    collector.add_planned("base", 10)
+    workers = [WorkerTelemetry(collector.update, interval=3600) for _ in range(2)]
+    for idx, worker in enumerate(workers):
+        worker.worker = str(idx)
+        worker.start_chunk("base", idx)
+        worker.record_sim(idx, "basegame", 1)
+        worker.record_sim(idx + 2, "freegame", 4)
+        worker.add_phase("simulate", 1.5)
+        worker.send()
+
+    metrics = collector.write()
+    assert metrics["sims_done"] == 4
+    assert metrics["betmodes"]["base"] == {"planned": 10, "done": 4}
+    assert metrics["attempts"]["base"]["freegame"] == {"accepted": 2, "rejected": 6}
+    assert metrics["phases"]["simulate"] == 3.0
+    assert metrics["eta_seconds"] is not None
+
+    prom = (tmp_path / "m.prom").read_text()
+    assert 'sim_attempts_total{game="game",betmode="base",criteria="freegame",result="rejected"} 6' in prom
+    assert len((tmp_path / "m.jsonl").read_text().splitlines()) == 1
+
+
+def test_prometheus_omits_unknown_eta():
+    """No ETA sample is written before any throughput is measured."""
+    metrics = {
+        "sims_done": 0,
+        "sims_planned": 5,
+        "sims_per_sec": 0.0,
+        "eta_seconds": None,
+        "attempts": {},
+        "phases": {},
+        "workers": {},
+    }
+    assert "sim_eta_seconds" not in format_prometheus("game", metrics)
@@ -0,0 +1,59 @@
+"""Simulate and post-process several games at once on a shared worker budget.
+
+python utils/run_games.py -w 16 candy_carnage_1000 0_0_scatter:base
+
+Each game runs its own games/<id>/run.py, once for simulations and once for post-processing.
+"""
+
+from pathlib import Path
+import argparse
+import json
+import sys
+import os
+
+ABS_PATH = Path(__file__).parent.parent
+sys.path.insert(0, str(ABS_PATH))
+os.chdir(ABS_PATH)
+
+from src.state.game_batch import run_game_batch
+
+
+def parse_games(game_args: list) -> dict:
+    """Read 'game_id' or 'game_id:mode1,mode2' arguments into {game_id: modes or None}."""
+    games = {}
+    for game_arg in game_args:
+        game_id, _, modes = game_arg.partition(":")
+        games[game_id] = [mode for mode in modes.split(",") if mode] or None
+    return games
+
+
+def main():
+    """parse commandline arguments"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("games", nargs="+", help="game ids, optionally with modes: 'game_id:base,bonus'")
+    parser.add_argument("-w", dest="workers", type=int, default=None, help="worker budget (default: all cores)")
+    parser.add_argument("--max-game-workers", dest="max_game_workers", type=int, default=None)
+    parser.add_argument("--skip-optimization", dest="optimization", action="store_false")
+    parser.add_argument("--skip-analysis", dest="analysis", action="store_false")
+    parser.add_argument("--skip-format-checks", dest="format_checks", action="store_false")
+    parser.add_argument("--report", dest="report", type=str, default=None, help="write the batch report as JSON")
+    arguments = parser.parse_args()
+
+    report = run_game_batch(
+        parse_games(arguments.games),
+        arguments.workers,
+        arguments.max_game_workers,
+        optimization=arguments.optimization,
+        analysis=arguments.analysis,
+        format_checks=arguments.format_checks,
+    )
+    if arguments.report is not None:
+        with open(arguments.report, "w", encoding="UTF-8") as f:
+            f.write(json.dumps(report, indent=4))
+    if not all(game["ok"] for game in report["games"].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+
+    main()